@@ -38,5 +38,11 @@ Modules include in the current package:
 5. opcuaComm.py
 - provide the IEC62541 OPC-UA TCP client and server communication API. 
 
+6. armKinematics.py
+- provide the vectorized (batch) forward kinematics API of the robot arm.
+
+7. armWorkspace.py
+- provide the precomputed and memory-mapped workspace reachability map of the robot arm.
+
 """
 pass 
\ No newline at end of file
@@ -1,61 +1,154 @@
+import threading
+from collections import OrderedDict
+
 import numpy as np
-from scipy.optimize import fsolve
 
-def solve_robot_arm(x, y, initial_guess=None):
+LINK_LENGTHS = (1.5, 1.0, 0.5)  # shoulder, elbow and wrist link lengths
+Z_TARGET = 2.0                  # default z-axis constraint
+DEFAULT_GUESS = (np.pi/4, -np.pi/4, 0.0)
+REACH_TOL = 1e-9                # numeric tolerance of the reachability check
+SOLVE_TOL = 1e-6                # max residual error of a converged solution
+CACHE_SIZE = 1024               # default max entries of the IK cache
+CACHE_STEP = 0.1                # default quantization step of the IK cache key
+
+
+def _wrap_angle(angle):
+    """ Wrap angle(s) in radians to the range (-pi, pi]. """
+    return np.pi - np.mod(np.pi - angle, 2*np.pi)
+
+
+def solve_planar_ik(distance, z_target, link_lengths=LINK_LENGTHS, wrist_angle=0.0):
     """
-    Solve inverse kinematics for a 3-DOF robot arm.
-    
+    Closed-form inverse kinematics of the 3-link planar chain with a fixed wrist
+    angle (theta1 + theta2 + theta3 = wrist_angle, 0 keeps the wrist level).
+
+    The wrist link direction is known, so the wrist joint position is fixed and
+    the remaining shoulder/elbow 2-link problem is solved with the law of cosines.
+    Both branches are returned, "elbow up" has theta2 <= 0 and "elbow down" has
+    theta2 >= 0. Scalars and numpy arrays (broadcast) are both accepted.
+
     Args:
-        x: Target x-coordinate of the cube
-        y: Target y-coordinate of the cube
-        initial_guess: Optional initial guess for [theta1, theta2, theta3] in radians
-    
+        distance: Target horizontal distance in the arm plane
+        z_target: Target height relative to the shoulder joint
+        link_lengths: (L1, L2, L3) link lengths
+        wrist_angle: Absolute angle of the last link in radians
+
     Returns:
-        dict with theta1, theta2, theta3 in both radians and degrees,
-        plus verification metrics
+        dict with "reachable" flag(s) and the "elbow_up" / "elbow_down" angles
+        (theta1, theta2, theta3) in radians (nan where the target is unreachable)
     """
-    
-    # Calculate target distance and z-height
-    distance = np.sqrt(x**2 + y**2)
-    z_target = 2.0  # Fixed z-axis constraint
+    L1, L2, L3 = link_lengths
+    # Wrist joint position in the arm plane.
+    wx = np.asarray(distance, dtype=np.float64) - L3*np.cos(wrist_angle)
+    wz = np.asarray(z_target, dtype=np.float64) - L3*np.sin(wrist_angle)
+    cos_t2 = (wx**2 + wz**2 - L1**2 - L2**2) / (2*L1*L2)
+    reachable = np.abs(cos_t2) <= 1.0 + REACH_TOL
+    cos_t2 = np.where(reachable, np.clip(cos_t2, -1.0, 1.0), np.nan)
+    sin_t2 = np.sqrt(1.0 - cos_t2**2)
+    base = np.arctan2(wz, wx)
+    branches = {}
+    for name, sign in (("elbow_up", -1.0), ("elbow_down", 1.0)):
+        t2 = np.arctan2(sign*sin_t2, cos_t2)
+        t1 = _wrap_angle(base - np.arctan2(L2*np.sin(t2), L1 + L2*np.cos(t2)))
+        t3 = _wrap_angle(wrist_angle - t1 - t2)
+        branches[name] = (t1, t2, t3)
+    branches["reachable"] = reachable if reachable.ndim else bool(reachable)
+    return branches
+
 
-    # Link lengths
-    L1, L2, L3 = 1.5, 1.0, 0.5
+def _in_limits(angles, joint_limits):
+    """ Check the (theta1, theta2, theta3) radians (last axis) are inside the
+        ((min, max), ...) degrees joint limits, always True if no limits.
+    """
+    if joint_limits is None:
+        return np.ones(np.shape(angles)[:-1], dtype=bool)
+    limits = np.radians(np.asarray(joint_limits, dtype=np.float64)[:3])
+    angles = np.asarray(angles, dtype=np.float64)
+    return np.all((angles >= limits[:, 0] - REACH_TOL) & (angles <= limits[:, 1] + REACH_TOL), axis=-1)
 
-    def equations(angles):
-        t1, t2, t3 = angles
 
-        # Cumulative angles
-        a12  = t1 + t2
-        a123 = t1 + t2 + t3
+def _select_branch(solution, initial_guess, joint_limits=None):
+    """ Select the closed-form branch inside the joint limits closest to the
+        initial guess, None if neither branch is inside the limits.
+    """
+    guess = np.asarray(initial_guess, dtype=np.float64)
+    def gap(angles):
+        return np.sum(np.abs(_wrap_angle(np.asarray(angles) - guess)))
+    branches = [angles for angles in (solution["elbow_up"], solution["elbow_down"])
+                if _in_limits(angles, joint_limits)]
+    return min(branches, key=gap) if branches else None
 
-        # Ground projections (x-axis)
-        a = np.cos(t1)  * L1
-        b = np.cos(a12) * L2
-        c = np.cos(a123)* L3
 
-        # Z-axis projections
-        d = np.sin(t1)  * L1
-        e = np.sin(a12) * L2
-        f = np.sin(a123)* L3
+def nearest_planar_target(distance, z_target, link_lengths=LINK_LENGTHS, wrist_angle=0.0):
+    """
+    Get the reachable tool position nearest to the target with the fixed wrist
+    angle: the wrist joint target is moved along the shoulder ray into the
+    shoulder/elbow reachable annulus, which is the least-squares solution of the
+    tool position error under the wrist constraint.
 
-        eq1 = (a + b + c) - distance   # X-axis constraint
-        eq2 = (d + e + f) - z_target   # Z-axis constraint
-        eq3 = a123                     # Wrist flat constraint (sum = 0 keeps wrist level)
+    Returns:
+        tuple of the nearest (distance, z_target) and the position error
+    """
+    L1, L2, L3 = link_lengths
+    wx = distance - L3*np.cos(wrist_angle)
+    wz = z_target - L3*np.sin(wrist_angle)
+    radius = np.hypot(wx, wz)
+    clipped = np.clip(radius, abs(L1 - L2), L1 + L2)
+    if radius > 0:
+        scale = clipped / radius
+        wx, wz = wx*scale, wz*scale
+    else:
+        wx, wz = clipped, 0.0
+    return (wx + L3*np.cos(wrist_angle), wz + L3*np.sin(wrist_angle), abs(radius - clipped))
 
-        return [eq1, eq2, eq3]
 
-    # Default initial guess if none provided
-    if initial_guess is None:
-        initial_guess = [np.pi/4, -np.pi/4, 0.0]
+def solve_robot_arm(x, y, initial_guess=None, z_target=Z_TARGET, link_lengths=LINK_LENGTHS,
+                    joint_limits=None):
+    """
+    Solve inverse kinematics for a 3-DOF robot arm with the level wrist.
 
-    # Solve the system
-    solution, info, ier, msg = fsolve(equations, initial_guess, full_output=True)
+    A target out of the level wrist reach gets the nearest (best-effort) pose,
+    "reachable" is False and "position_error" is the gripper miss distance.
+    
+    Args:
+        x: Target x-coordinate of the cube
+        y: Target y-coordinate of the cube
+        initial_guess: Optional initial guess for [theta1, theta2, theta3] in radians,
+            the closed-form branch closest to it is selected
+        z_target: Target z-axis height relative to the shoulder joint
+        link_lengths: (L1, L2, L3) link lengths
+        joint_limits: Optional ((min, max), ...) degrees limits of the 3 joints,
+            the branch inside the limits is selected
+    
+    Returns:
+        dict with theta1, theta2, theta3 in both radians and degrees (nan if no
+        branch is inside the joint limits), both closed-form branches, the
+        reachable flag plus verification metrics
+    """
     
-    if ier != 1:
-        print(f"Warning: Solver did not fully converge — {msg}")
+    # Calculate target distance
+    distance = np.sqrt(x**2 + y**2)
+    L1, L2, L3 = link_lengths
+
+    # Default initial guess if none provided
+    if initial_guess is None:
+        initial_guess = DEFAULT_GUESS
 
-    t1, t2, t3 = solution
+    # Closed-form solution, the target out of reach is moved to the nearest reachable one.
+    analytic = solve_planar_ik(distance, z_target, link_lengths)
+    reachable = analytic["reachable"]
+    method = "analytic"
+    solution = analytic
+    if not reachable:
+        method = "nearest"
+        near_dist, near_z, _ = nearest_planar_target(distance, z_target, link_lengths)
+        solution = solve_planar_ik(near_dist, near_z, link_lengths)
+    angles = _select_branch(solution, initial_guess, joint_limits=joint_limits)
+    if angles is None:
+        method = "limits"
+        reachable = False
+        angles = (np.nan, np.nan, np.nan)
+    t1, t2, t3 = angles
 
     # Verify solution
     a12  = t1 + t2
@@ -73,9 +166,147 @@ def solve_robot_arm(x, y, initial_guess=None):
         "computed_z": computed_z,
         "distance_error": abs(computed_distance - distance),
         "z_error": abs(computed_z - z_target),
+        "elbow_up_deg": np.degrees(analytic["elbow_up"]),
+        "elbow_down_deg": np.degrees(analytic["elbow_down"]),
+        "position_error": np.hypot(computed_distance - distance, computed_z - z_target),
+        "reachable": bool(reachable),
+        "method": method,
+    }
+
+
+def solve_robot_arm_batch(x, y, initial_guess=None, z_target=Z_TARGET, link_lengths=LINK_LENGTHS,
+                          joint_limits=None):
+    """
+    Solve inverse kinematics for many targets in a single vectorized pass.
+
+    Args:
+        x: Array of target x-coordinates
+        y: Array of target y-coordinates (same shape as x)
+        initial_guess: Optional (3,) or (N, 3) guess in radians, for every target
+            the closed-form branch closest to its guess is selected
+        z_target: Scalar or array of target heights relative to the shoulder joint
+        link_lengths: (L1, L2, L3) link lengths
+        joint_limits: Optional ((min, max), ...) degrees limits of the 3 joints,
+            the branch inside the limits is selected
+
+    Returns:
+        dict of (N,) arrays: theta1/2/3 in radians and degrees (nan if the
+        target is unreachable), per-target "converged" flags, the distance/z
+        residual errors and "reach_error" (how far the wrist target lies outside
+        the reachable annulus, 0 for reachable targets)
+    """
+    x = np.ravel(np.asarray(x, dtype=np.float64))
+    y = np.ravel(np.asarray(y, dtype=np.float64))
+    z = np.broadcast_to(np.asarray(z_target, dtype=np.float64), x.shape)
+    L1, L2, L3 = link_lengths
+    distance = np.hypot(x, y)
+    analytic = solve_planar_ik(distance, z, link_lengths)
+    up = np.stack(analytic["elbow_up"], axis=-1)
+    down = np.stack(analytic["elbow_down"], axis=-1)
+    guess = np.broadcast_to(np.asarray(DEFAULT_GUESS if initial_guess is None else initial_guess,
+                                       dtype=np.float64), up.shape)
+    # Branch out of the joint limits never wins.
+    ok_up, ok_down = _in_limits(up, joint_limits), _in_limits(down, joint_limits)
+    gap_up = np.where(ok_up, np.sum(np.abs(_wrap_angle(up - guess)), axis=-1), np.inf)
+    gap_down = np.where(ok_down, np.sum(np.abs(_wrap_angle(down - guess)), axis=-1), np.inf)
+    angles = np.where((gap_down < gap_up)[:, None], down, up)
+    angles[~(ok_up | ok_down)] = np.nan
+    t1, t2, t3 = angles[:, 0], angles[:, 1], angles[:, 2]
+    # Verify solution
+    a12 = t1 + t2
+    a123 = a12 + t3
+    distance_error = np.abs(np.cos(t1)*L1 + np.cos(a12)*L2 + np.cos(a123)*L3 - distance)
+    z_error = np.abs(np.sin(t1)*L1 + np.sin(a12)*L2 + np.sin(a123)*L3 - z)
+    converged = analytic["reachable"] & (np.maximum(distance_error, z_error) < SOLVE_TOL)
+    # Gap between the wrist target and the shoulder/elbow reachable annulus.
+    wrist_dist = np.hypot(distance - L3, z)
+    reach_error = np.maximum(wrist_dist - (L1 + L2), 0.0) + np.maximum(abs(L1 - L2) - wrist_dist, 0.0)
+    return {
+        "theta1_rad": t1,          "theta1_deg": np.degrees(t1),
+        "theta2_rad": t2,          "theta2_deg": np.degrees(t2),
+        "theta3_rad": t3,          "theta3_deg": np.degrees(t3),
+        "target_distance": distance,
+        "target_z": z,
+        "distance_error": distance_error,
+        "z_error": z_error,
+        "reach_error": reach_error,
+        "converged": converged,
     }
 
 
+class IKCache:
+    """
+    LRU-bounded memoization of solve_robot_arm() results.
+
+    The key is the target (x, y, z_target) quantized by the cache step plus the
+    link lengths and the rounded initial guess, the solver always runs on the
+    quantized target and the rounded guess so a cached result does not depend
+    on which nearby input filled the entry.
+    """
+
+    def __init__(self, link_lengths=LINK_LENGTHS, maxsize=CACHE_SIZE, step=CACHE_STEP,
+                 joint_limits=None):
+        """
+        Args:
+            link_lengths: (L1, L2, L3) link lengths of the arm
+            joint_limits: Optional ((min, max), ...) degrees limits of the 3 joints
+            maxsize: Max number of cached solutions
+            step: Quantization step of the target position
+        """
+        self.link_lengths = tuple(link_lengths)
+        self.joint_limits = joint_limits
+        self.maxsize = int(maxsize)
+        self.step = float(step)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _quantize(self, val):
+        return int(round(val / self.step))
+
+    def solve(self, x, y, initial_guess=None, z_target=Z_TARGET):
+        """ Return the cached solve_robot_arm() result dict of the target, the
+            returned dict is shared by all the callers and must not be modified.
+        """
+        guess = None if initial_guess is None else tuple(np.round(initial_guess, 3))
+        key = (self._quantize(x), self._quantize(y), self._quantize(z_target),
+               self.link_lengths, guess)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = solve_robot_arm(key[0]*self.step, key[1]*self.step, initial_guess=guess,
+                                 z_target=key[2]*self.step, link_lengths=self.link_lengths,
+                                 joint_limits=self.joint_limits)
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def set_link_lengths(self, link_lengths):
+        """ Update the arm geometry, all the cached solutions are dropped if it changed. """
+        link_lengths = tuple(link_lengths)
+        if link_lengths != self.link_lengths:
+            self.link_lengths = link_lengths
+            self.invalidate()
+
+    def invalidate(self):
+        """ Remove all the cached solutions. """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """ Return the cache counters dict. """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries),
+                    "maxsize": self.maxsize}
+
+
 # ── Example usage ──────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     test_cases = [(2.0, 1.0), (1.5, 0.5), (2.5, 1.5)]
@@ -87,4 +318,5 @@ if __name__ == "__main__":
         print(f"  θ₂ = {result['theta2_deg']:+.2f}°")
         print(f"  θ₃ = {result['theta3_deg']:+.2f}°")
         print(f"  Distance  : target={result['target_distance']:.4f}  computed={result['computed_distance']:.4f}  err={result['distance_error']:.2e}")
-        print(f"  Z-height  : target={result['target_z']:.4f}        computed={result['computed_z']:.4f}        err={result['z_error']:.2e}")
\ No newline at end of file
+        print(f"  Z-height  : target={result['target_z']:.4f}        computed={result['computed_z']:.4f}        err={result['z_error']:.2e}")
+        print(f"  Reachable : {result['reachable']} ({result['method']}, error {result['position_error']:.3f})")
\ No newline at end of file
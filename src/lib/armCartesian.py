@@ -0,0 +1,129 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        armCartesian.py
+#
+# Purpose:     This module provide the Cartesian straight line move planner of
+#              the robot arm. The tool (gripper) path is sampled evenly, all the
+#              waypoints are solved with one batched closed-form IK call and the
+#              unreachable, out of joint limit or discontinuous segments are
+#              rejected before the move is executed.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/02
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    The tool position (x, y, z) relative to the arm base is solved with a fixed
+    absolute wrist link angle (theta2 + theta3 + theta4, -90 points the gripper
+    down to the ground):
+        theta1         : atan2(y, x), unwrapped from the seed joints along the
+                         path so the base does not jump between -180 and 180.
+        theta2 - theta4: angleCalculation.solve_planar_ik() of the horizontal
+                         distance and the height above the shoulder (both the
+                         elbow branches are solved for all the waypoints).
+    Warm start: the elbow branch closest to the seed (current) joints is selected
+    at the first waypoint and kept along the path, so every waypoint continues
+    from its neighbor, a joint jump bigger than MAX_JOINT_JUMP between the
+    neighbor waypoints (singularity or branch flip) rejects the path.
+
+    Usage:
+        jointPath, failIdx, msg = planLinearPath(startPos, goalPos, linkLens, seedJoints)
+"""
+
+import math
+import numpy as np
+
+import angleCalculation
+
+PATH_STEP = 0.02        # max tool path distance between the waypoints.
+MAX_JOINT_JUMP = 5.0    # max joint change (degrees) between the neighbor waypoints.
+WRIST_DOWN = -90.0      # wrist link angle of the gripper pointing to the ground.
+DEF_LIMITS = ((-180, 180), (-90, 90), (-180, 180), (-90, 90))
+
+#-----------------------------------------------------------------------------
+def getWristAngle(jointAngles):
+    """ Get the absolute wrist link angle (degrees) of the joints [theta1-theta4, ...]."""
+    return float(jointAngles[1] + jointAngles[2] + jointAngles[3])
+
+def sampleLinePath(startPos, goalPos, pathStep=PATH_STEP):
+    """ Sample the straight line from the start to the goal position.
+        Returns:
+            np.ndarray: (k, 3) waypoints with the spacing <= pathStep, k >= 2.
+    """
+    startPos = np.asarray(startPos, dtype=np.float64)
+    goalPos = np.asarray(goalPos, dtype=np.float64)
+    segNum = max(int(math.ceil(np.linalg.norm(goalPos - startPos) / pathStep)), 1)
+    ratio = np.linspace(0.0, 1.0, segNum + 1)[:, None]
+    return startPos + (goalPos - startPos) * ratio
+
+#-----------------------------------------------------------------------------
+def solveIKBatch(points, linkLens, seedJoints, wristAngle=WRIST_DOWN):
+    """ Solve the [theta1-theta4] joint angles of the tool path waypoints.
+        Args:
+            points (array-like): (k, 3) tool positions relative to the arm base.
+            linkLens (tuple): link lengths (l1, l2, l3, l4).
+            seedJoints (array-like): (>=4,) joint angles (degrees) the path starts
+                from, used to select the elbow branch and unwrap the base angle.
+            wristAngle (float, optional): absolute wrist link angle in degrees.
+        Returns:
+            tuple: ((k, 4) joint angles in degrees, nan for the unreachable
+                waypoints, (k,) bool reachable flags).
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    seed = np.asarray(seedJoints, dtype=np.float64)[:4]
+    l1, l2, l3, l4 = linkLens
+    # Base rotation, unwrapped from the seed base angle.
+    baseRad = np.arctan2(points[:, 1], points[:, 0])
+    baseRad = np.unwrap(np.concatenate(([math.radians(seed[0])], baseRad)))[1:]
+    distance = np.hypot(points[:, 0], points[:, 1])
+    solution = angleCalculation.solve_planar_ik(distance, points[:, 2] - l1, (l2, l3, l4),
+                                                wrist_angle=math.radians(wristAngle))
+    up = np.degrees(np.stack(solution['elbow_up'], axis=-1))
+    down = np.degrees(np.stack(solution['elbow_down'], axis=-1))
+    reachable = np.asarray(solution['reachable']).reshape(-1)
+    # Select the branch at the 1st reachable waypoint and keep it along the path.
+    branch = up
+    firstIdx = np.flatnonzero(reachable)
+    if firstIdx.size:
+        i = firstIdx[0]
+        if np.abs(down[i] - seed[1:]).sum() < np.abs(up[i] - seed[1:]).sum(): branch = down
+    joints = np.column_stack((np.degrees(baseRad), branch))
+    joints[~reachable] = np.nan
+    return (joints, reachable)
+
+#-----------------------------------------------------------------------------
+def planLinearPath(startPos, goalPos, linkLens, seedJoints, wristAngle=WRIST_DOWN,
+                   jointLimits=DEF_LIMITS, pathStep=PATH_STEP):
+    """ Plan the tool straight line move and check all the waypoints.
+        Args:
+            startPos (array-like): tool start (x, y, z) relative to the arm base.
+            goalPos (array-like): tool goal (x, y, z) relative to the arm base.
+            linkLens (tuple): link lengths (l1, l2, l3, l4).
+            seedJoints (array-like): current joint angles [theta1-theta4, ...].
+            wristAngle (float, optional): absolute wrist link angle in degrees.
+            jointLimits (tuple, optional): (>=4, 2) joint (min, max) limits.
+            pathStep (float, optional): max waypoint spacing. Defaults to PATH_STEP.
+        Returns:
+            tuple: ((k, 4) joint path in degrees or None if rejected, index of the
+                1st failed waypoint (-1 if OK), result message).
+    """
+    points = sampleLinePath(startPos, goalPos, pathStep=pathStep)
+    joints, reachable = solveIKBatch(points, linkLens, seedJoints, wristAngle=wristAngle)
+    if not reachable.all():
+        failIdx = int(np.argmin(reachable))
+        return (None, failIdx, "Waypoint %s (%d%% of the path) is out of reach"
+                % (failIdx, 100 * failIdx // (len(points) - 1)))
+    limits = np.asarray(jointLimits, dtype=np.float64)[:4]
+    outLimit = np.any((joints < limits[:, 0]) | (joints > limits[:, 1]), axis=1)
+    if outLimit.any():
+        failIdx = int(np.argmax(outLimit))
+        return (None, failIdx, "Waypoint %s is out of the joint limits" % failIdx)
+    jumps = np.abs(np.diff(joints, axis=0)).max(axis=1)
+    if np.any(jumps > MAX_JOINT_JUMP):
+        failIdx = int(np.argmax(jumps > MAX_JOINT_JUMP)) + 1
+        return (None, failIdx, "Joint jump at waypoint %s (singularity)" % failIdx)
+    return (joints, -1, "Path planned with %s waypoints" % len(joints))
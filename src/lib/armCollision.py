@@ -0,0 +1,209 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        armCollision.py
+#
+# Purpose:     This module provide the vectorized collision check of the robot
+#              arm. Each arm link from the forward kinematics is modeled as a
+#              capsule (a segment with a radius) and a batch of arm poses is
+#              checked against the self-collision, the ground and the obstacle
+#              boxes in one numpy pass, so the trajectory validation and the
+#              motion planner can check a large number of poses quickly.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    Link capsules (from the armKinematics joint positions p0-p4):
+        link0: p0-p1 base column, link1: p1-p2 shoulder, link2: p2-p3 elbow,
+        link3: p3-p4 wrist.
+    Checks (result is a uint8 bit flag per pose):
+        COLL_SELF     : the distance of the non adjacent link capsules (SELF_PAIRS)
+                        is smaller than the sum of their radius.
+        COLL_GROUND   : a moving link (link1 - link3) goes below the ground plane.
+        COLL_OBSTACLE : a link hits an axis aligned obstacle box (xmin, ymin, zmin,
+                        xmax, ymax, zmax). The box is inflated by the link radius
+                        and tested with the link segment (slab test), this is a
+                        slightly conservative test at the box edges and corners.
+    With the clearance flag the check also returns a lower bound of the distance
+    to the nearest collision, together with getMotionBound() (max link point
+    displacement between two poses) the caller can skip the checks of the small
+    moves which can not use up the clearance.
+
+    Usage:
+        flags = checkCollisionBatch(jointAngles, (2.0, 1.5, 1.0, 0.5), boxes=[(1, 1, 0, 2, 2, 1)])
+        validPoses = jointAngles[flags == COLL_NONE]
+"""
+
+import numpy as np
+
+import armKinematics as kinematics
+
+COLL_NONE = 0
+COLL_SELF = 1
+COLL_GROUND = 2
+COLL_OBSTACLE = 4
+
+LINK_NUM = kinematics.JOINT_NUM - 1
+LINK_RADII = (0.15, 0.15, 0.15, 0.15)   # link capsule radius (same as the drawn joint sphere).
+SELF_PAIRS = ((0, 2), (0, 3), (1, 3))   # non adjacent link pairs.
+CHUNK_SZ = 1 << 16                      # number of poses checked per numpy pass.
+EPS = 1e-12
+COLL_NAMES = ((COLL_SELF, 'self'), (COLL_GROUND, 'ground'), (COLL_OBSTACLE, 'obstacle'))
+
+#-----------------------------------------------------------------------------
+def getCollisionName(flag):
+    """ Get the readable collision type string of the flag, e.g. 'self, ground'."""
+    names = [name for bit, name in COLL_NAMES if int(flag) & bit]
+    return ', '.join(names) if names else 'none'
+
+#-----------------------------------------------------------------------------
+def segmentDistance(p1, q1, p2, q2):
+    """ Get the min distance between the segments p1-q1 and p2-q2.
+        Args:
+            p1, q1, p2, q2 (np.ndarray): (..., 3) segment end points (broadcastable).
+        Returns:
+            np.ndarray: (...) min distance.
+    """
+    d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+    a = np.maximum((d1 * d1).sum(-1), EPS)
+    e = np.maximum((d2 * d2).sum(-1), EPS)
+    b = (d1 * d2).sum(-1)
+    c = (d1 * r).sum(-1)
+    f = (d2 * r).sum(-1)
+    denom = a * e - b * b
+    # Closest point of the infinite lines (s = 0 for the parallel segments),
+    # then clamp to the segments.
+    s = np.where(denom > EPS, np.clip((b * f - c * e) / np.maximum(denom, EPS), 0.0, 1.0), 0.0)
+    t = (b * s + f) / e
+    s = np.where(t < 0.0, np.clip(-c / a, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / a, 0.0, 1.0), s))
+    t = np.clip(t, 0.0, 1.0)
+    diff = (p1 + d1 * s[..., None]) - (p2 + d2 * t[..., None])
+    return np.sqrt((diff * diff).sum(-1))
+
+#-----------------------------------------------------------------------------
+def segmentHitBox(p, q, boxMin, boxMax):
+    """ Check whether the segments p-q intersect the axis aligned boxes (slab test).
+        Args:
+            p, q (np.ndarray): (..., 3) segment end points.
+            boxMin, boxMax (np.ndarray): (..., 3) box corners (broadcastable).
+        Returns:
+            np.ndarray: (...) bool hit flags.
+    """
+    d = q - p
+    parallel = np.abs(d) < EPS
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (boxMin - p) / d
+        t2 = (boxMax - p) / d
+    # The segment parallel to a slab is inside it for all t or never.
+    inside = (p >= boxMin) & (p <= boxMax)
+    tNear = np.where(parallel, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+    tFar = np.where(parallel, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+    tEnter = np.max(tNear, axis=-1)
+    tExit = np.min(tFar, axis=-1)
+    return (tEnter <= tExit) & (tExit >= 0.0) & (tEnter <= 1.0)
+
+#-----------------------------------------------------------------------------
+def pointSegmentDistance(p, q, c):
+    """ Get the distance between the segments p-q and the points c (broadcastable)."""
+    d = q - p
+    t = np.clip(((c - p) * d).sum(-1) / np.maximum((d * d).sum(-1), EPS), 0.0, 1.0)
+    diff = p + d * t[..., None] - c
+    return np.sqrt((diff * diff).sum(-1))
+
+#-----------------------------------------------------------------------------
+def checkPoints(points, radii=LINK_RADII, boxes=None, groundZ=0.0, clearance=False):
+    """ Check the collision of a batch of arm joint positions.
+        Args:
+            points (np.ndarray): (N, 5, 3) joint positions p0-p4.
+            radii (tuple, optional): (4,) link capsule radius.
+            boxes (np.ndarray, optional): (K, 6) obstacle boxes.
+            groundZ (float, optional): ground plane height. Defaults to 0.0.
+            clearance (bool, optional): also return the clearance. Defaults to False.
+        Returns:
+            np.ndarray: (N,) uint8 collision flags.
+            np.ndarray: (N,) clearance if the clearance flag is set, it is a lower
+                bound of the distance the links can move before a collision.
+    """
+    radii = np.asarray(radii, dtype=np.float64)
+    starts, ends = points[:, :-1], points[:, 1:]
+    flags = np.zeros(points.shape[0], dtype=np.uint8)
+    # Self collision of the non adjacent links.
+    idxA, idxB = np.array(SELF_PAIRS).T
+    gaps = segmentDistance(starts[:, idxA], ends[:, idxA], starts[:, idxB], ends[:, idxB]) \
+        - (radii[idxA] + radii[idxB])
+    flags[np.any(gaps < 0.0, axis=1)] |= COLL_SELF
+    # Ground, the segment lowest point is one of its end points.
+    lowest = np.minimum(starts[:, 1:, 2], ends[:, 1:, 2]) - radii[1:] - groundZ
+    flags[np.any(lowest < 0.0, axis=1)] |= COLL_GROUND
+    margin = np.minimum(gaps.min(axis=1), lowest.min(axis=1)) if clearance else None
+    # Obstacles, (N, LINK_NUM, K) segment vs inflated box tests.
+    if boxes is not None and len(boxes):
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+        inflate = radii[:, None, None]
+        boxMin = boxes[None, :, :3] - inflate
+        boxMax = boxes[None, :, 3:] + inflate
+        hit = segmentHitBox(starts[:, :, None], ends[:, :, None], boxMin, boxMax)
+        flags[np.any(hit, axis=(1, 2))] |= COLL_OBSTACLE
+        if clearance:
+            # Lower bound: distance to the box center minus the half diagonal of
+            # the inflated box (the same box the hit test uses).
+            center = (boxes[:, :3] + boxes[:, 3:]) / 2
+            halfDiag = np.linalg.norm((boxes[:, 3:] - boxes[:, :3])[None] + 2 * inflate, axis=-1) / 2
+            boxGaps = pointSegmentDistance(starts[:, :, None], ends[:, :, None], center) - halfDiag
+            margin = np.minimum(margin, boxGaps.min(axis=(1, 2)))
+    return (flags, margin) if clearance else flags
+
+#-----------------------------------------------------------------------------
+def getMotionBound(fromAngles, toAngles, linkLens):
+    """ Get the upper bound of the distance any point of the arm links moves
+        between the two batches of poses (the joint rotation moves a point by at
+        most the rotate angle (radian) x its distance to the axis).
+        Args:
+            fromAngles, toAngles (np.ndarray): (N, >=4) joint angles in degrees.
+            linkLens (tuple): link lengths (l1, l2, l3, l4), float or (N,) array.
+        Returns:
+            np.ndarray: (N,) max point displacement.
+    """
+    reach = np.asarray(linkLens[1]) + np.asarray(linkLens[2]) + np.asarray(linkLens[3])
+    return np.radians(np.abs(toAngles[:, :4] - fromAngles[:, :4]).sum(axis=1)) * reach
+
+#-----------------------------------------------------------------------------
+def checkCollisionBatch(jointAngles, linkLens, basePos=(0.0, 0.0, 0.0), boxes=None,
+                        radii=LINK_RADII, groundZ=0.0, clearance=False):
+    """ Check the collision of a batch of arm poses.
+        Example: flags = checkCollisionBatch([[45, -15, 30, 0, 0]], (2.0, 1.5, 1.0, 0.5))
+        Args:
+            jointAngles (array-like): (N, >=4) joint angles in degrees.
+            linkLens (tuple): link lengths (l1, l2, l3, l4), each of them can be
+                a float or a (N,) array.
+            basePos (array-like, optional): arm base position (3,) or (N, 3).
+            boxes (array-like, optional): (K, 6) obstacle boxes (xmin, ymin, zmin,
+                xmax, ymax, zmax) in the world. Defaults to None.
+            radii (tuple, optional): (4,) link capsule radius.
+            groundZ (float, optional): ground plane height. Defaults to 0.0.
+            clearance (bool, optional): also return the (N,) clearance lower bound.
+        Returns:
+            np.ndarray: (N,) uint8 collision flags, COLL_NONE if no collision.
+    """
+    jointAngles = np.atleast_2d(np.asarray(jointAngles, dtype=np.float64))
+    count = jointAngles.shape[0]
+    linkLens = [np.asarray(l, dtype=np.float64) for l in linkLens]
+    basePos = np.asarray(basePos, dtype=np.float64)
+    flags = np.empty(count, dtype=np.uint8)
+    margin = np.empty(count) if clearance else None
+    for start in range(0, count, CHUNK_SZ):
+        end = min(start + CHUNK_SZ, count)
+        lens = tuple(l[start:end] if l.ndim else l for l in linkLens)
+        points = kinematics.forwardKinematicsBatch(jointAngles[start:end], lens)
+        points += (basePos[start:end] if basePos.ndim == 2 else basePos)[..., None, :]
+        result = checkPoints(points, radii=radii, boxes=boxes, groundZ=groundZ, clearance=clearance)
+        if clearance:
+            flags[start:end], margin[start:end] = result
+        else:
+            flags[start:end] = result
+    return (flags, margin) if clearance else flags
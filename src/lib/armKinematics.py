@@ -0,0 +1,72 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        armKinematics.py
+#
+# Purpose:     This module provide the vectorized forward kinematics API of the
+#              5 joints robot arm (base, shoulder, elbow, wrist, gripper) so the
+#              simulator, controller and the offline tools can calculate a batch
+#              of arm poses in one numpy pass.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/20
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    The robot arm joint chain used in the simulator:
+        p0: base position on the ground (0, 0, 0)
+        p1: shoulder joint on top of the base (0, 0, l1)
+        p2: elbow joint, p3: wrist joint, p4: gripper (end effector).
+    theta1 rotate the whole arm around the Z axis, theta2/theta3/theta4 are the
+    pitch angles of the shoulder, elbow and wrist in the arm vertical plane and
+    theta5 (gripper roll) does not change the joint positions.
+
+    All the angles are in degrees, the result array shape is (N, 5, 3) which
+    contents the N poses' 5 joints (x, y, z) position.
+"""
+
+import numpy as np
+
+JOINT_NUM = 5   # number of joint positions returned for each pose.
+
+#-----------------------------------------------------------------------------
+def forwardKinematicsBatch(jointAngles, linkLens, out=None):
+    """ Calculate the joints position of a batch of robot arm poses.
+        Example: posArr = forwardKinematicsBatch([[45, -15, 30, 0, 0]], (2.0, 1.5, 1.0, 0.5))
+        Args:
+            jointAngles (array-like): (N, >=4) joint angles [theta1, theta2, theta3,
+                theta4, ...] in degrees, a single pose (>=4,) is also accepted.
+            linkLens (tuple): link lengths (l1, l2, l3, l4).
+            out (np.ndarray, optional): preallocated float64 (N, 5, 3) result
+                buffer to avoid allocation. Defaults to None.
+        Returns:
+            np.ndarray: (N, 5, 3) joint positions array.
+    """
+    angles = np.radians(np.atleast_2d(np.asarray(jointAngles, dtype=np.float64))[:, :4])
+    l1, l2, l3, l4 = linkLens
+    count = angles.shape[0]
+    if out is None: out = np.empty((count, JOINT_NUM, 3), dtype=np.float64)
+    t1, t2 = angles[:, 0], angles[:, 1]
+    a23 = t2 + angles[:, 2]
+    a234 = a23 + angles[:, 3]
+    c1, s1 = np.cos(t1), np.sin(t1)
+    # Horizontal distance (in the arm plane) and height of each joint.
+    r2 = l2 * np.cos(t2)
+    r3 = r2 + l3 * np.cos(a23)
+    r4 = r3 + l4 * np.cos(a234)
+    z2 = l1 + l2 * np.sin(t2)
+    z3 = z2 + l3 * np.sin(a23)
+    z4 = z3 + l4 * np.sin(a234)
+    # Base and shoulder are fixed.
+    out[:, 0, :] = 0.0
+    out[:, 1, :2] = 0.0
+    out[:, 1, 2] = l1
+    # Project the arm plane to the world X-Y by the base rotation.
+    for idx, (r, z) in enumerate(((r2, z2), (r3, z3), (r4, z4)), start=2):
+        out[:, idx, 0] = c1 * r
+        out[:, idx, 1] = s1 * r
+        out[:, idx, 2] = z
+    return out
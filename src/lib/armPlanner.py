@@ -0,0 +1,404 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        armPlanner.py
+#
+# Purpose:     This module provide the sampling based joint space motion planner
+#              (RRT-Connect) of the robot arm. The tree edges are checked with
+#              the batched forward kinematics and capsule collision model (all
+#              the interpolated poses of an edge in one numpy pass), the found
+#              path is shortcut and smoothed. The planning runs in a worker
+#              process (PlannerWorker) so it does not block the UI or the PLC
+#              request handler.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/03
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    Planning space: the 5 joints [theta1-theta5] in degrees, the gripper opening
+    is interpolated along the path (it does not change the link capsules).
+    Edge check: the poses on the straight joint space edge are sampled so the
+    max link point displacement (armCollision.getMotionBound) between the
+    neighbor samples is smaller than the resolution, all the samples of one or
+    many edges are checked with one armCollision.checkCollisionBatch() call.
+    The link capsules are inflated by half the resolution in the planning, so
+    the poses between the samples are collision free as well. A start or goal
+    pose closer than this clearance to a collision (e.g. the arm stopped by the
+    simulator's collision check) is connected by an escape edge: the straight
+    move of one step in the ESCAPE_NUM random directions which is collision free
+    with the real link radii (checked with a 10x finer resolution) and ends at
+    the pose with the largest clearance.
+    RRT-Connect: two trees grow from the start and the goal, every iteration
+    extends one tree one step toward BATCH_SZ random samples, then the other
+    tree connects (repeatedly extends) toward the new nodes and the trees swap.
+    All the edges of an extend or connect step are checked in one batch (the
+    per call numpy overhead is shared by the edges). A direct start-goal edge
+    is tried first.
+    Post process:
+        shortcut : from each path node jump to the farthest visible node (the
+                   edges to all the later nodes are checked in one batch).
+        smooth   : the path is densified and the interior nodes are moved to
+                   the middle of their neighbors (the iterations with a new edge
+                   in collision are rolled back), then densified to the uniform
+                   spacing used by armTrajectory.PathTrajectory.
+
+    Usage:
+        planner = MotionPlanner((2.0, 1.5, 1.0, 0.5), boxes=[(1, 1, 0, 2, 2, 1)], seed=0)
+        path, msg = planner.plan(startJoints, goalJoints)
+        worker = PlannerWorker()
+        worker.submit({'start': startJoints, 'goal': goalJoints, 'linkLens': linkLens}, callback)
+"""
+
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+import armCollision as collision
+
+PLAN_DIM = 5            # planning joints [theta1-theta5].
+DEF_LIMITS = ((-180, 180), (-90, 90), (-180, 180), (-90, 90), (-180, 180))
+DEF_STEP = 10.0         # max joint distance (degrees) of a tree extension step.
+EDGE_RES = 0.05         # max link point displacement between the checked edge poses.
+BATCH_SZ = 8            # random samples extended per RRT-Connect iteration.
+MAX_ITER = 1000         # max RRT-Connect iterations.
+PLAN_TIMEOUT = 5.0      # max planning wall time (sec).
+SMOOTH_ITER = 30        # smoothing iterations.
+TREE_SZ = 1024          # init tree node buffer size (doubled when full).
+ESCAPE_NUM = 32         # escape directions tried from a pose near a collision.
+
+TRAPPED = 0
+ADVANCED = 1
+REACHED = 2
+
+#-----------------------------------------------------------------------------
+def densifyPath(path, step):
+    """ Split every path segment into equal parts not longer than step (the
+        original nodes are kept, so the path does not cut the corners).
+        Args:
+            path (np.ndarray): (k, n) joint path.
+            step (float): max joint distance between the new nodes.
+        Returns:
+            np.ndarray: (m, n) densified path.
+    """
+    segLens = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    counts = np.maximum(np.ceil(segLens / step).astype(np.int64), 1)
+    segIdx = np.repeat(np.arange(len(segLens)), counts)
+    ratio = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)) / counts[segIdx]
+    dense = path[segIdx] + (path[segIdx + 1] - path[segIdx]) * ratio[:, None]
+    return np.vstack((dense, path[-1]))
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class _Tree(object):
+    """ RRT node tree with the growable numpy node buffer."""
+    def __init__(self, root):
+        self.nodes = np.empty((TREE_SZ, len(root)))
+        self.parents = np.empty(TREE_SZ, dtype=np.int64)
+        self.nodes[0] = root
+        self.parents[0] = -1
+        self.count = 1
+
+    def add(self, poses, parent):
+        """ Add the chain of poses after the parent node, return the last node index."""
+        num = len(poses)
+        if self.count + num > len(self.nodes):
+            size = max(2 * len(self.nodes), self.count + num)
+            self.nodes = np.resize(self.nodes, (size, self.nodes.shape[1]))
+            self.parents = np.resize(self.parents, size)
+        idx = np.arange(self.count, self.count + num)
+        self.nodes[idx] = poses
+        self.parents[idx] = np.concatenate(([parent], idx[:-1]))
+        self.count += num
+        return int(idx[-1])
+
+    def nearest(self, pose):
+        return int(np.argmin(((self.nodes[:self.count] - pose) ** 2).sum(axis=1)))
+
+    def getBranch(self, idx):
+        """ Return the (k, n) nodes from the root to the node idx."""
+        branch = []
+        while idx >= 0:
+            branch.append(idx)
+            idx = self.parents[idx]
+        return self.nodes[branch[::-1]]
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class MotionPlanner(object):
+    """ RRT-Connect joint space planner of one robot arm."""
+    def __init__(self, linkLens, basePos=(0.0, 0.0, 0.0), boxes=None, jointLimits=DEF_LIMITS,
+                 radii=collision.LINK_RADII, stepSize=DEF_STEP, resolution=EDGE_RES,
+                 batchSize=BATCH_SZ, seed=None):
+        """ Init example: planner = MotionPlanner((2.0, 1.5, 1.0, 0.5), boxes=gv.gObstacleList)
+            Args:
+                linkLens (tuple): link lengths (l1, l2, l3, l4).
+                basePos (array-like, optional): arm base position in the world.
+                boxes (array-like, optional): (K, 6) obstacle boxes.
+                jointLimits (tuple, optional): (>=5, 2) joint (min, max) limits.
+                radii (tuple, optional): (4,) link capsule radius.
+                stepSize (float, optional): tree extension step (degrees).
+                resolution (float, optional): edge check resolution.
+                batchSize (int, optional): random samples per iteration.
+                seed (int, optional): random sampler seed. Defaults to None.
+        """
+        self.linkLens = tuple(float(l) for l in linkLens)
+        self.basePos = np.asarray(basePos, dtype=np.float64)
+        self.boxes = None if boxes is None else np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+        limits = np.asarray(jointLimits, dtype=np.float64)[:PLAN_DIM]
+        self.posMin, self.posMax = limits[:, 0], limits[:, 1]
+        self.stepSize = float(stepSize)
+        self.resolution = float(resolution)
+        self.linkRadii = np.asarray(radii, dtype=np.float64)
+        self.planRadii = self.linkRadii + self.resolution / 2
+        self.batchSize = int(batchSize)
+        self.rng = np.random.default_rng(seed)
+        self.checkCount = 0     # number of the collision checked poses.
+
+    #-----------------------------------------------------------------------------
+    def checkPoses(self, poses, inflate=True):
+        """ Return the (k,) valid (collision free and in the limits) flags of the
+            poses, checked with the inflated planning link radii if inflate is set.
+        """
+        poses = np.atleast_2d(poses)
+        self.checkCount += len(poses)
+        flags = collision.checkCollisionBatch(poses, self.linkLens, basePos=self.basePos, boxes=self.boxes,
+                                              radii=self.planRadii if inflate else self.linkRadii)
+        inLimit = np.all((poses >= self.posMin) & (poses <= self.posMax), axis=1)
+        return (flags == collision.COLL_NONE) & inLimit
+
+    def _sampleEdges(self, fromPoses, toPoses, resolution=None):
+        """ Sample the poses on the edges (the from poses are not included).
+            Returns:
+                tuple: ((s, n) sample poses, (s,) edge index, (s,) ratio on the edge).
+        """
+        counts = np.ceil(collision.getMotionBound(fromPoses, toPoses, self.linkLens)
+                         / (resolution or self.resolution)).astype(np.int64)
+        counts = np.maximum(counts, 1)
+        edgeIdx = np.repeat(np.arange(len(counts)), counts)
+        ratio = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1.0) \
+            / counts[edgeIdx]
+        poses = fromPoses[edgeIdx] + (toPoses[edgeIdx] - fromPoses[edgeIdx]) * ratio[:, None]
+        return (poses, edgeIdx, ratio)
+
+    def checkEdges(self, fromPoses, toPoses, inflate=True, resolution=None):
+        """ Check a batch of the straight joint space edges.
+            Args:
+                fromPoses, toPoses (np.ndarray): (E, n) edge end poses.
+                inflate (bool, optional): use the inflated planning link radii.
+                resolution (float, optional): check resolution. Defaults to None
+                    (the planner resolution).
+            Returns:
+                np.ndarray: (E,) bool collision free flags.
+        """
+        fromPoses, toPoses = np.atleast_2d(fromPoses), np.atleast_2d(toPoses)
+        poses, edgeIdx, _ = self._sampleEdges(fromPoses, toPoses, resolution=resolution)
+        invalid = np.bincount(edgeIdx[~self.checkPoses(poses, inflate=inflate)], minlength=len(fromPoses))
+        return invalid == 0
+
+    def findEscape(self, pose):
+        """ Find the pose one step away from the pose (near a collision) which
+            has the planning clearance and can be reached by a straight move.
+            Returns:
+                np.ndarray: (n,) escape pose or None if not found.
+        """
+        dirs = self.rng.normal(size=(ESCAPE_NUM, len(pose)))
+        ends = np.clip(pose + dirs * (self.stepSize / np.linalg.norm(dirs, axis=1))[:, None],
+                       self.posMin, self.posMax)
+        ends = ends[self.checkPoses(ends)]
+        if not len(ends): return None
+        ends = ends[self.checkEdges(np.repeat(pose[None], len(ends), axis=0), ends, inflate=False,
+                                    resolution=self.resolution / 10)]
+        if not len(ends): return None
+        _, margin = collision.checkCollisionBatch(ends, self.linkLens, basePos=self.basePos,
+                                                  boxes=self.boxes, radii=self.linkRadii, clearance=True)
+        return ends[int(np.argmax(margin))]
+
+    #-----------------------------------------------------------------------------
+    def _extend(self, tree, targets, maxSteps=None):
+        """ Extend the tree from its nearest nodes toward a batch of target poses
+            by at most maxSteps steps (None to connect), all the edges are checked
+            in one batch and the valid steps of each edge are added to the tree.
+            Returns:
+                list: (TRAPPED/ADVANCED/REACHED, last added node index) of the targets.
+        """
+        nodes = tree.nodes[:tree.count]
+        nearIdx = np.argmin(((targets[:, None] - nodes[None]) ** 2).sum(axis=2), axis=1)
+        nearPoses = nodes[nearIdx]
+        dist = np.maximum(np.linalg.norm(targets - nearPoses, axis=1), 1e-9)
+        stepNum = np.ceil(dist / self.stepSize).astype(np.int64)
+        reached = np.ones(len(targets), dtype=bool) if maxSteps is None else stepNum <= maxSteps
+        endRatio = np.where(reached, 1.0, self.stepSize * (maxSteps or 0) / dist)
+        samples, edgeIdx, ratio = self._sampleEdges(nearPoses, nearPoses + (targets - nearPoses)
+                                                    * endRatio[:, None])
+        hit = ~self.checkPoses(samples)
+        # The free part of the edge ends at the sample before its 1st collision.
+        hitRatio = np.full(len(targets), np.inf)
+        np.minimum.at(hitRatio, edgeIdx[hit], ratio[hit])
+        sampleStep = np.bincount(edgeIdx, minlength=len(targets))
+        freeRatio = np.where(np.isinf(hitRatio), 1.0, hitRatio - 1.0 / sampleStep)
+        result = []
+        for i, target in enumerate(targets):
+            if freeRatio[i] == 1.0:
+                nodeRatio = np.arange(1, stepNum[i] + 1) * self.stepSize / dist[i]
+                nodeRatio = np.append(nodeRatio[nodeRatio < endRatio[i]], endRatio[i])
+            else:
+                # Add the nodes at the step distance along the free part.
+                reached[i] = False
+                nodeRatio = np.arange(1, stepNum[i] + 1) * self.stepSize / dist[i]
+                nodeRatio = nodeRatio[nodeRatio < endRatio[i] * freeRatio[i]]
+            if not nodeRatio.size:
+                result.append((TRAPPED, int(nearIdx[i])))
+                continue
+            lastIdx = tree.add(nearPoses[i] + (target - nearPoses[i]) * nodeRatio[:, None], nearIdx[i])
+            result.append((REACHED if reached[i] else ADVANCED, lastIdx))
+        return result
+
+    def planRRTConnect(self, start, goal, maxIter=MAX_ITER, timeout=PLAN_TIMEOUT):
+        """ Search a collision free path from the start to the goal joints.
+            Returns:
+                tuple: ((k, 5) joint path or None, result message).
+        """
+        start = np.asarray(start, dtype=np.float64)[:PLAN_DIM]
+        goal = np.asarray(goal, dtype=np.float64)[:PLAN_DIM]
+        for name, pose in (('start', start), ('goal', goal)):
+            if not self.checkPoses(pose)[0]:
+                return (None, "The %s pose is in collision or closer than %s to a collision"
+                        % (name, self.resolution / 2))
+        if self.checkEdges(start, goal)[0]: return (np.vstack((start, goal)), "Direct path")
+        treeA, treeB = _Tree(start), _Tree(goal)
+        endT = time.time() + timeout
+        for i in range(maxIter):
+            if time.time() > endT: return (None, "Planning timeout after %s iterations" % i)
+            samples = self.rng.uniform(self.posMin, self.posMax, size=(self.batchSize, PLAN_DIM))
+            newIdx = [idx for state, idx in self._extend(treeA, samples, maxSteps=1) if state != TRAPPED]
+            if newIdx:
+                for k, (state, connIdx) in enumerate(self._extend(treeB, treeA.nodes[newIdx])):
+                    if state != REACHED: continue
+                    path = np.vstack((treeA.getBranch(newIdx[k]), treeB.getBranch(connIdx)[::-1][1:]))
+                    if not np.array_equal(treeA.nodes[0], start): path = path[::-1]
+                    return (path, "Path found in %s iterations, %s nodes"
+                            % (i + 1, treeA.count + treeB.count))
+            treeA, treeB = treeB, treeA
+        return (None, "No path found in %s iterations" % maxIter)
+
+    #-----------------------------------------------------------------------------
+    def shortcutPath(self, path):
+        """ Remove the path nodes which can be skipped by a collision free edge."""
+        result, i = [path[0]], 0
+        while i < len(path) - 1:
+            later = np.arange(i + 1, len(path))
+            valid = self.checkEdges(np.repeat(path[i:i + 1], len(later), axis=0), path[later])
+            # path[i] - path[i + 1] is always valid, jump to the farthest visible node.
+            i = int(later[np.flatnonzero(valid)[-1]]) if valid.any() else i + 1
+            result.append(path[i])
+        return np.array(result)
+
+    def smoothPath(self, path, iterations=SMOOTH_ITER):
+        """ Smooth the path corners by moving the interior nodes to the middle of
+            their neighbors while all the path edges stay collision free.
+        """
+        path = densifyPath(path, self.stepSize / 2)
+        if len(path) < 3: return path
+        for _ in range(iterations):
+            newPath = path.copy()
+            newPath[1:-1] = 0.5 * path[1:-1] + 0.25 * (path[:-2] + path[2:])
+            valid = self.checkEdges(newPath[:-1], newPath[1:])
+            if not valid.all():
+                # Roll back the nodes of the edges in collision and check again.
+                badEdges = np.flatnonzero(~valid)
+                newPath[badEdges] = path[badEdges]
+                newPath[badEdges + 1] = path[badEdges + 1]
+                if not self.checkEdges(newPath[:-1], newPath[1:]).all(): break
+            if np.abs(newPath - path).max() < 1e-3:
+                path = newPath
+                break
+            path = newPath
+        return path
+
+    def plan(self, start, goal, maxIter=MAX_ITER, timeout=PLAN_TIMEOUT):
+        """ Plan, shortcut and smooth the path from the start to the goal joints.
+            Returns:
+                tuple: ((k, 5) joint path (node spacing <= stepSize / 2) or None,
+                    result message).
+        """
+        start = np.asarray(start, dtype=np.float64)[:PLAN_DIM]
+        goal = np.asarray(goal, dtype=np.float64)[:PLAN_DIM]
+        ends = []
+        for name, pose in (('start', start), ('goal', goal)):
+            if not self.checkPoses(pose, inflate=False)[0]:
+                return (None, "The %s pose is in collision or out of the limits" % name)
+            escape = pose if self.checkPoses(pose)[0] else self.findEscape(pose)
+            if escape is None: return (None, "No escape from the collision near the %s pose" % name)
+            ends.append(escape)
+        path, msg = self.planRRTConnect(ends[0], ends[1], maxIter=maxIter, timeout=timeout)
+        if path is None: return (None, msg)
+        # The escape edges are kept out of the shortcut and smoothing.
+        path = self.smoothPath(self.shortcutPath(path))
+        if ends[0] is not start: path = np.vstack((start, path))
+        if ends[1] is not goal: path = np.vstack((path, goal))
+        return (densifyPath(path, self.stepSize / 2), msg)
+
+#-----------------------------------------------------------------------------
+def planMotion(request):
+    """ Worker process entry of the planning request.
+        Args:
+            request (dict): 'start', 'goal': (6,) joints [theta1-theta5, gripper],
+                'linkLens', optional 'basePos', 'boxes', 'jointLimits', 'seed',
+                'timeout', 'maxIter', 'stepSize'.
+        Returns:
+            tuple: ((k, 6) joint path or None, result message, plan time in sec).
+    """
+    startT = time.time()
+    planner = MotionPlanner(request['linkLens'], basePos=request.get('basePos', (0.0, 0.0, 0.0)),
+                            boxes=request.get('boxes'), jointLimits=request.get('jointLimits', DEF_LIMITS),
+                            stepSize=request.get('stepSize', DEF_STEP), seed=request.get('seed'))
+    start = np.asarray(request['start'], dtype=np.float64)
+    goal = np.asarray(request['goal'], dtype=np.float64)
+    path, msg = planner.plan(start, goal, maxIter=request.get('maxIter', MAX_ITER),
+                             timeout=request.get('timeout', PLAN_TIMEOUT))
+    if path is not None and len(start) > PLAN_DIM:
+        # The extra joints (gripper) move linearly along the path.
+        ratio = np.linspace(0.0, 1.0, len(path))[:, None]
+        path = np.column_stack((path, start[PLAN_DIM:] + (goal[PLAN_DIM:] - start[PLAN_DIM:]) * ratio))
+    return (path, "%s, %s poses checked" % (msg, planner.checkCount), time.time() - startT)
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class PlannerWorker(object):
+    """ Run the planMotion() requests in a worker process."""
+    def __init__(self, workers=1):
+        self.workers = workers
+        self.executor = None
+
+    def start(self):
+        """ Start the worker process (the spawn start method is used so the worker
+            does not inherit the simulator threads and locks).
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+
+    def submit(self, request, callback):
+        """ Submit the planning request, the callback(path, msg, planTime) is called
+            in a worker result thread when the planning finishes.
+        """
+        self.start()
+        future = self.executor.submit(planMotion, request)
+        def onDone(fut):
+            try:
+                result = fut.result()
+            except Exception as err:
+                result = (None, "Planner worker error: %s" % str(err), 0.0)
+            callback(*result)
+        future.add_done_callback(onDone)
+        return future
+
+    def stop(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
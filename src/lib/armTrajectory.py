@@ -0,0 +1,184 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        armTrajectory.py
+#
+# Purpose:     This module provide the joint space trajectory generator of the
+#              robot arm. A move of the 6 joints [theta1-theta5, gripper] is
+#              time scaled so all the joints start and finish at the same time,
+#              the whole time-parameterized profile is precomputed as an array
+#              when the move is planned and the simulation loop only indexes it
+#              with the elapsed time, the move duration is known up front.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/01
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    All the joints follow the same normalized profile s(u) (u = t / T, s from 0
+    to 1): q(t) = start + (goal - start) * s(t / T).
+        trapezoid : constant acceleration in [0, f], constant velocity in
+                    [f, 1 - f], constant deceleration in [1 - f, 1].
+        quintic   : s(u) = 10u^3 - 15u^4 + 6u^5, zero velocity and acceleration
+                    at both ends (smooth, about 15% slower than the trapezoid).
+    The duration T is the shortest time all the joints can follow the profile
+    without exceeding their max velocity and acceleration: the trapezoid blend
+    fraction f is taken from the slowest joint's time-optimal profile, then T is
+    raised if another joint needs more time with this f.
+    PathTrajectory applies the same time scaling to a path of joint waypoints
+    (e.g. a Cartesian straight line move solved by the batched IK).
+
+    Usage:
+        traj = JointTrajectory(start, goal, maxVel, maxAcc, profile=PROFILE_TRAPEZOID, dt=0.001)
+        print(traj.duration)
+        joints = traj.sample(elapsedTime)
+"""
+
+import math
+import numpy as np
+
+PROFILE_TRAPEZOID = 'trapezoid'
+PROFILE_QUINTIC = 'quintic'
+PROFILES = (PROFILE_TRAPEZOID, PROFILE_QUINTIC)
+DEF_DT = 0.001
+QUINTIC_VEL = 1.875             # quintic profile peak velocity (normalized).
+QUINTIC_ACC = 10 / math.sqrt(3) # quintic profile peak acceleration (normalized).
+
+#-----------------------------------------------------------------------------
+def getTrapezoidTiming(dist, maxVel, maxAcc):
+    """ Get the synchronized trapezoid profile timing of the joints.
+        Args:
+            dist (np.ndarray): (n,) absolute joint move distances.
+            maxVel, maxAcc (np.ndarray): (n,) joint max velocity and acceleration.
+        Returns:
+            tuple: (duration, blend fraction f).
+    """
+    if not np.any(dist > 0): return (0.0, 0.5)
+    # Time-optimal profile of each joint (triangular if it can't reach maxVel).
+    cruise = dist >= maxVel ** 2 / maxAcc
+    jointT = np.where(cruise, dist / maxVel + maxVel / maxAcc, 2 * np.sqrt(dist / maxAcc))
+    slowest = int(np.argmax(jointT))
+    blend = float(maxVel[slowest] / maxAcc[slowest] / jointT[slowest]) if cruise[slowest] else 0.5
+    duration = max(float(jointT[slowest]),
+                   float(np.max(dist / (maxVel * (1 - blend)))),
+                   float(np.sqrt(np.max(dist / (blend * (1 - blend) * maxAcc)))))
+    return (duration, blend)
+
+def getQuinticDuration(dist, maxVel, maxAcc):
+    """ Get the synchronized quintic profile duration of the joints."""
+    if not np.any(dist > 0): return 0.0
+    return max(float(np.max(QUINTIC_VEL * dist / maxVel)),
+               float(np.sqrt(np.max(QUINTIC_ACC * dist / maxAcc))))
+
+def getMoveDuration(start, goal, maxVel, maxAcc, profile=PROFILE_TRAPEZOID):
+    """ Get the synchronized move duration (sec) without sampling the profile."""
+    dist = np.abs(np.asarray(goal, dtype=np.float64) - np.asarray(start, dtype=np.float64))
+    maxVel = np.asarray(maxVel, dtype=np.float64)
+    maxAcc = np.asarray(maxAcc, dtype=np.float64)
+    if profile == PROFILE_QUINTIC: return getQuinticDuration(dist, maxVel, maxAcc)
+    return getTrapezoidTiming(dist, maxVel, maxAcc)[0]
+
+#-----------------------------------------------------------------------------
+def trapezoidProfile(u, blend):
+    """ Normalized trapezoid position s(u) for the (k,) time ratios u in [0, 1]."""
+    vel = 1.0 / (1.0 - blend)
+    acc = vel / blend
+    return np.where(u < blend, 0.5 * acc * u * u,
+                    np.where(u <= 1.0 - blend, vel * (u - 0.5 * blend),
+                             1.0 - 0.5 * acc * (1.0 - u) ** 2))
+
+def quinticProfile(u):
+    """ Normalized quintic position s(u) for the (k,) time ratios u in [0, 1]."""
+    return u ** 3 * (10.0 + u * (-15.0 + 6.0 * u))
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class JointTrajectory(object):
+    """ Precomputed synchronized joint space move from the start to the goal."""
+    def __init__(self, start, goal, maxVel, maxAcc, profile=PROFILE_TRAPEZOID, dt=DEF_DT):
+        """ Init example: traj = JointTrajectory(joints, target, gv.gJointMaxVel, gv.gJointMaxAcc)
+            Args:
+                start (array-like): (n,) start joint positions.
+                goal (array-like): (n,) goal joint positions.
+                maxVel (array-like): (n,) joint max velocity (unit per second).
+                maxAcc (array-like): (n,) joint max acceleration (unit per second^2).
+                profile (str, optional): PROFILE_TRAPEZOID or PROFILE_QUINTIC.
+                dt (float, optional): profile sample time step. Defaults to DEF_DT.
+        """
+        if profile not in PROFILES: raise ValueError("Unknown trajectory profile: %s" % str(profile))
+        self.start = np.asarray(start, dtype=np.float64).copy()
+        self.goal = np.asarray(goal, dtype=np.float64).copy()
+        self.profile = profile
+        self.dt = float(dt)
+        span = self._getJointSpan()
+        maxVel = np.asarray(maxVel, dtype=np.float64)
+        maxAcc = np.asarray(maxAcc, dtype=np.float64)
+        if profile == PROFILE_TRAPEZOID:
+            self.duration, self.blend = getTrapezoidTiming(span, maxVel, maxAcc)
+        else:
+            self.duration, self.blend = getQuinticDuration(span, maxVel, maxAcc), 0.0
+        # Precompute the samples at every dt, the last sample is the goal.
+        sampleNum = int(math.ceil(self.duration / self.dt)) + 1
+        u = np.minimum(np.arange(sampleNum) * self.dt / self.duration, 1.0) if self.duration > 0 \
+            else np.ones(sampleNum)
+        ratio = trapezoidProfile(u, self.blend) if profile == PROFILE_TRAPEZOID else quinticProfile(u)
+        self.positions = self._interpolate(ratio)
+        self.positions[-1] = self.goal
+
+    def _getJointSpan(self):
+        """ Return the (n,) joints move distance for the profile s from 0 to 1."""
+        return np.abs(self.goal - self.start)
+
+    def _interpolate(self, ratio):
+        """ Return the (k, n) joint positions at the (k,) profile positions s."""
+        return self.start + (self.goal - self.start) * ratio[:, None]
+
+    #-----------------------------------------------------------------------------
+    def isFinished(self, t):
+        return t >= self.duration
+
+    def sample(self, t):
+        """ Get the (n,) joint positions at the time t (seconds from the move start)."""
+        if t >= self.duration: return self.goal.copy()
+        if t <= 0: return self.start.copy()
+        pos = t / self.dt
+        idx = int(pos)
+        frac = pos - idx
+        if frac < 1e-9: return self.positions[idx].copy()
+        return self.positions[idx] + (self.positions[idx + 1] - self.positions[idx]) * frac
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class PathTrajectory(JointTrajectory):
+    """ Precomputed move through the joint waypoints (such as the IK solutions of
+        a Cartesian path), the profile position s is mapped to the waypoints with
+        the uniform spacing, so the waypoints evenly sampled along a tool path 
+        keep the tool speed following the profile.
+    """
+    def __init__(self, waypoints, maxVel, maxAcc, profile=PROFILE_TRAPEZOID, dt=DEF_DT):
+        """ Init example: traj = PathTrajectory(jointPath, gv.gJointMaxVel, gv.gJointMaxAcc)
+            Args:
+                waypoints (array-like): (k, n) joint positions, k >= 2.
+                maxVel, maxAcc, profile, dt: same as JointTrajectory.
+        """
+        self.waypoints = np.asarray(waypoints, dtype=np.float64).reshape(len(waypoints), -1)
+        if len(self.waypoints) < 2: raise ValueError("A path needs at least 2 waypoints.")
+        JointTrajectory.__init__(self, self.waypoints[0], self.waypoints[-1], maxVel, maxAcc,
+                                 profile=profile, dt=dt)
+
+    def _getJointSpan(self):
+        # The max joint rate over the path segments (per unit s), the velocity
+        # limit is exact for the piecewise linear path, the acceleration limit
+        # is ignored at the waypoint corners.
+        segNum = len(self.waypoints) - 1
+        return np.abs(np.diff(self.waypoints, axis=0)).max(axis=0) * segNum
+
+    def _interpolate(self, ratio):
+        pos = ratio * (len(self.waypoints) - 1)
+        idx = np.minimum(pos.astype(np.int64), len(self.waypoints) - 2)
+        frac = (pos - idx)[:, None]
+        return self.waypoints[idx] + (self.waypoints[idx + 1] - self.waypoints[idx]) * frac
+
@@ -0,0 +1,250 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        armWorkspace.py
+#
+# Purpose:     This module provide the precomputed workspace reachability map
+#              of the robot arm. The map samples the arm joint space, builds a
+#              voxel reachability/dexterity grid and persists it as a numpy .npy
+#              file which is memory-mapped lazily when the first query comes,
+#              so the reachability check becomes an O(1) look up.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/21
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    The base rotation (theta1) only revolves the arm plane around the Z axis, so
+    the builder samples the shoulder, elbow and wrist angles (theta2, theta3,
+    theta4), counts the end effector hits in a 2D (radius, z) grid, then revolves
+    it to the 3D voxel grid (the theta1 joint limits are applied per voxel). The
+    voxel value is the number of joint samples reaching it (dexterity), a voxel
+    is reachable if the value is bigger than 0.
+
+    Wrist constraint: the auto grab IK keeps the absolute wrist link angle fixed
+    (theta2 + theta3 + theta4 = LEVEL_WRIST), a map built with the wristAngle
+    only samples the shoulder and elbow and solves theta4 from the constraint
+    (dropped if out of its limits), so the map matches what the IK can reach.
+    The query tolerance accepts the points within that distance of a reachable
+    voxel (such as the cube inside the gripper grab range).
+
+    Files:
+        <name>.npy  : uint16 (nx, ny, nz) voxel dexterity grid.
+        <name>.json : grid meta data (origin, resolution, link lengths, limits).
+
+    Usage:
+        wsMap = WorkspaceMap.loadOrBuild(wsDir, (2.0, 1.5, 1.0, 0.5), jointLimits)
+        wsMap.isReachable(2.0, 1.0, 0.3)
+        grabMap = WorkspaceMap.loadOrBuild(wsDir, linkLens, jointLimits, wristAngle=LEVEL_WRIST)
+        grabMap.isReachable(2.0, 1.0, 0.0, tolerance=0.5)
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+
+import armKinematics as kinematics
+
+WS_DIR = 'Workspace'    # default workspace map storage folder name.
+DEF_RES = 0.1           # default voxel resolution.
+DEF_STEP = 2.0          # default joint space sampling step in degrees.
+DEF_LIMITS = ((-180, 180), (-90, 90), (-180, 180), (-90, 90))
+LEVEL_WRIST = 0.0       # absolute wrist link angle of the level gripper auto grab.
+WRIST_STEP_DIV = 4      # the wrist constrained map samples 2 joints, sample them finer.
+CHUNK_SZ = 1 << 18      # number of poses calculated per FK batch.
+MAX_CNT = np.iinfo(np.uint16).max
+
+#-----------------------------------------------------------------------------
+def getMapName(linkLens, jointLimits, resolution, wristAngle=None, stepDeg=DEF_STEP):
+    """ Get the map file name (without extension) of an arm configuration and
+        the build parameters.
+    """
+    cfg = [list(map(float, linkLens)), [list(map(float, l)) for l in jointLimits[:4]], float(resolution),
+           float(stepDeg)]
+    if wristAngle is not None: cfg.append(float(wristAngle))
+    cfgStr = json.dumps(cfg)
+    return 'ws_%s' % hashlib.md5(cfgStr.encode('utf-8')).hexdigest()[:12]
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class WorkspaceMap(object):
+    """ Voxel reachability/dexterity map of the robot arm end effector."""
+    def __init__(self, filePath, metaDict, grid=None):
+        """ Init example: wsMap = WorkspaceMap.load('Workspace/ws_xxx.npy')
+            Args:
+                filePath (str): .npy grid file path.
+                metaDict (dict): grid meta data dict.
+                grid (np.ndarray, optional): in memory grid, if None the grid
+                    will be memory mapped from the file at the 1st query.
+        """
+        self.filePath = filePath
+        self.metaDict = metaDict
+        self.origin = np.asarray(metaDict['origin'], dtype=np.float64)
+        self.resolution = float(metaDict['resolution'])
+        self.shape = tuple(metaDict['shape'])
+        self.linkLens = tuple(metaDict['linkLens'])
+        self._grid = grid
+
+    #-----------------------------------------------------------------------------
+    @classmethod
+    def build(cls, linkLens, jointLimits=DEF_LIMITS, resolution=DEF_RES, stepDeg=DEF_STEP,
+              wristAngle=None):
+        """ Sample the joint space and build the (not saved) workspace map.
+            Args:
+                linkLens (tuple): link lengths (l1, l2, l3, l4).
+                jointLimits (tuple): ((min, max), ...) limits of theta1 - theta4 in degrees.
+                resolution (float, optional): voxel size. Defaults to DEF_RES.
+                stepDeg (float, optional): joint sampling step. Defaults to DEF_STEP.
+                wristAngle (float, optional): fixed absolute wrist link angle in
+                    degrees, None to sample the wrist joint freely.
+        """
+        l1, l2, l3, l4 = linkLens
+        reach = l2 + l3 + l4
+        # 2D (radius, z) grid of the arm plane, the radius can be negative when
+        # the arm reaches over the top of the base.
+        nr = int(np.ceil(reach / resolution)) + 1
+        zMin, zMax = l1 - reach, l1 + reach
+        nz = int(np.ceil((zMax - zMin) / resolution)) + 1
+        planeHits = np.zeros((2, nr, nz), dtype=np.int64)
+        if wristAngle is not None: stepDeg = stepDeg / WRIST_STEP_DIV
+        axes = [np.arange(lo, hi + stepDeg/2, stepDeg) for (lo, hi) in jointLimits[1:4]]
+        t2, t3 = np.meshgrid(axes[0], axes[1], indexing='ij')
+        t2, t3 = t2.ravel(), t3.ravel()
+        wristLo, wristHi = jointLimits[3]
+        for t4 in (axes[2] if wristAngle is None else (None,)):
+            for start in range(0, t2.size, CHUNK_SZ):
+                count = min(CHUNK_SZ, t2.size - start)
+                angles = np.zeros((count, 4))
+                angles[:, 1] = t2[start:start+count]
+                angles[:, 2] = t3[start:start+count]
+                if t4 is None:
+                    angles[:, 3] = wristAngle - angles[:, 1] - angles[:, 2]
+                    angles = angles[(angles[:, 3] >= wristLo) & (angles[:, 3] <= wristHi)]
+                else:
+                    angles[:, 3] = t4
+                endPos = kinematics.forwardKinematicsBatch(angles, linkLens)[:, -1]
+                r, z = endPos[:, 0], endPos[:, 2]
+                ri = np.minimum(np.rint(np.abs(r) / resolution).astype(np.int64), nr - 1)
+                zi = np.clip(np.rint((z - zMin) / resolution).astype(np.int64), 0, nz - 1)
+                side = (r < 0).astype(np.int64)
+                flatIdx = (side * nr + ri) * nz + zi
+                planeHits += np.bincount(flatIdx, minlength=planeHits.size).reshape(planeHits.shape)
+        # Revolve the arm plane to the 3D voxel grid.
+        axis = np.arange(-nr + 1, nr) * resolution
+        xs, ys = np.meshgrid(axis, axis, indexing='ij')
+        ri = np.minimum(np.rint(np.hypot(xs, ys) / resolution).astype(np.int64), nr - 1)
+        phi = np.degrees(np.arctan2(ys, xs))
+        lo, hi = jointLimits[0]
+        def inRange(angle):
+            if hi - lo >= 360: return np.ones(angle.shape, dtype=bool)
+            return np.mod(angle - lo, 360.0) <= (hi - lo)
+        # Voxel is reached by the forward side with theta1 = phi or by the
+        # backward side (negative radius) with theta1 = phi + 180.
+        grid = (planeHits[0][ri] * inRange(phi)[..., None] +
+                planeHits[1][ri] * inRange(phi + 180.0)[..., None])
+        grid = np.minimum(grid, MAX_CNT).astype(np.uint16)
+        metaDict = {
+            'origin': [float(axis[0]), float(axis[0]), float(zMin)],
+            'resolution': float(resolution),
+            'shape': list(grid.shape),
+            'linkLens': [float(l) for l in linkLens],
+            'jointLimits': [[float(v) for v in l] for l in jointLimits[:4]],
+            'stepDeg': float(stepDeg),
+            'wristAngle': None if wristAngle is None else float(wristAngle)
+        }
+        return cls(None, metaDict, grid=grid)
+
+    #-----------------------------------------------------------------------------
+    def save(self, filePath):
+        """ Save the grid to the .npy file and the meta data to the .json file."""
+        folder = os.path.dirname(filePath)
+        if folder and not os.path.exists(folder): os.makedirs(folder)
+        np.save(filePath, np.ascontiguousarray(self.grid))
+        with open(os.path.splitext(filePath)[0] + '.json', 'w') as fh:
+            json.dump(self.metaDict, fh)
+        self.filePath = filePath
+
+    #-----------------------------------------------------------------------------
+    @classmethod
+    def load(cls, filePath):
+        """ Load the map meta data, the grid is memory mapped at the 1st query."""
+        with open(os.path.splitext(filePath)[0] + '.json', 'r') as fh:
+            metaDict = json.load(fh)
+        return cls(filePath, metaDict)
+
+    #-----------------------------------------------------------------------------
+    @classmethod
+    def loadOrBuild(cls, folder, linkLens, jointLimits=DEF_LIMITS, resolution=DEF_RES,
+                    stepDeg=DEF_STEP, wristAngle=None):
+        """ Load the map of the arm configuration from the folder, build and save
+            it if the map file is not exist.
+        """
+        filePath = os.path.join(folder, getMapName(linkLens, jointLimits, resolution,
+                                                   wristAngle=wristAngle, stepDeg=stepDeg) + '.npy')
+        if os.path.exists(filePath): return cls.load(filePath)
+        wsMap = cls.build(linkLens, jointLimits=jointLimits, resolution=resolution, stepDeg=stepDeg,
+                          wristAngle=wristAngle)
+        wsMap.save(filePath)
+        return wsMap
+
+    #-----------------------------------------------------------------------------
+    @property
+    def grid(self):
+        if self._grid is None:
+            self._grid = np.load(self.filePath, mmap_mode='r')
+        return self._grid
+
+    #-----------------------------------------------------------------------------
+    def getDexterity(self, x, y, z, tolerance=0.0):
+        """ Get the dexterity (joint samples count) of the voxel containing the
+            point, 0 if the point is out of the map. With the tolerance, the max
+            dexterity of the voxels within the tolerance distance is returned.
+        """
+        center = (np.array((x, y, z)) - self.origin) / self.resolution
+        idx = np.rint(center).astype(int)
+        span = int(np.ceil(tolerance / self.resolution))
+        if span == 0:
+            if np.any(idx < 0) or np.any(idx >= self.shape): return 0
+            return int(self.grid[idx[0], idx[1], idx[2]])
+        lo = np.maximum(idx - span, 0)
+        hi = np.minimum(idx + span + 1, self.shape)
+        if np.any(lo >= hi): return 0
+        block = np.asarray(self.grid[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]])
+        axes = np.ogrid[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]]
+        dist2 = sum((axis - c)**2 for axis, c in zip(axes, center)) * self.resolution**2
+        block = block[dist2 <= tolerance**2]
+        return int(block.max()) if block.size else 0
+
+    def isReachable(self, x, y, z, tolerance=0.0):
+        return self.getDexterity(x, y, z, tolerance=tolerance) > 0
+
+    #-----------------------------------------------------------------------------
+    def query(self, points):
+        """ Get the dexterity of a batch of points.
+            Args:
+                points (array-like): (N, 3) points.
+            Returns:
+                np.ndarray: (N,) uint16 dexterity array, 0 for the unreachable points.
+        """
+        idx = np.rint((np.atleast_2d(points) - self.origin) / self.resolution).astype(np.int64)
+        valid = np.all((idx >= 0) & (idx < self.shape), axis=1)
+        result = np.zeros(idx.shape[0], dtype=np.uint16)
+        sel = idx[valid]
+        result[valid] = self.grid[sel[:, 0], sel[:, 1], sel[:, 2]]
+        return result
+
+    #-----------------------------------------------------------------------------
+    def getMaxReach(self, z):
+        """ Get the max horizontal reachable radius at the height z."""
+        zi = int(round((z - self.origin[2]) / self.resolution))
+        if not 0 <= zi < self.shape[2]: return 0.0
+        layer = np.asarray(self.grid[:, :, zi]) > 0
+        if not layer.any(): return 0.0
+        xi, yi = np.nonzero(layer)
+        xs = self.origin[0] + xi * self.resolution
+        ys = self.origin[1] + yi * self.resolution
+        return float(np.hypot(xs, ys).max())
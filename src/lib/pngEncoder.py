@@ -0,0 +1,58 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        pngEncoder.py
+#
+# Purpose:     This module provide the pure numpy/zlib PNG encoder of the RGB
+#              frames (such as the offscreen rendered simulator frames), so the
+#              frames can be saved without an image library.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/20
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    The image is written as one 8 bit truecolor (color type 2) PNG with one
+    IDAT chunk, every scanline uses the filter type 0 (none) so the encoding is
+    one numpy copy plus the zlib compression (zlib releases the GIL, the frames
+    can be encoded by a background thread in parallel to the rendering).
+
+    Usage:
+        with open('frame.png', 'wb') as fh:
+            fh.write(encodePNG(rgb))
+"""
+
+import zlib
+import struct
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_LEVEL = 6           # default zlib compression level.
+
+#-----------------------------------------------------------------------------
+def _chunk(tag, data):
+    """ Build the PNG chunk: length, tag, data and the CRC of the tag and data."""
+    return (struct.pack('>I', len(data)) + tag + data
+            + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+#-----------------------------------------------------------------------------
+def encodePNG(rgb, level=PNG_LEVEL):
+    """ Encode the RGB image to the PNG file bytes.
+        Args:
+            rgb (np.ndarray): (height, width, 3) uint8 image, top row first.
+            level (int, optional): zlib compression level. Defaults to PNG_LEVEL.
+        Returns:
+            bytes: the PNG file content.
+    """
+    rgb = np.asarray(rgb, dtype=np.uint8)
+    height, width = rgb.shape[:2]
+    # Each scanline starts with the filter type byte (0: none).
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, width * 3)
+    return b''.join((PNG_SIGNATURE,
+                     _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)),
+                     _chunk(b'IDAT', zlib.compress(raw.tobytes(), level)),
+                     _chunk(b'IEND', b'')))
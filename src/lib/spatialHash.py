@@ -0,0 +1,129 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        spatialHash.py
+#
+# Purpose:     This module provide a uniform grid spatial hash of points (such
+#              as the cubes in the robot arm work cell) for the radius and the
+#              nearest neighbor queries. The query only checks the points in the
+#              grid cells overlapping the query sphere, so the grab/collision
+#              checks cost does not grow with the total number of the objects.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/27
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    The space is divided into cubic cells of cellSize, a point (x, y, z) is in
+    the cell floor((x, y, z) / cellSize). The hash keeps:
+        cells   : (n, 3) int64 cell of every point.
+        buckets : dict {cell tuple: set of point indices}.
+    update() calculates the new cells of the moved points in one numpy pass and
+    only moves the points which changed the cell between the buckets, so the
+    per step update cost is proportional to the moved points (normally the few
+    falling or carried cubes), not the point number.
+
+    Usage:
+        index = SpatialHash(1.0, positions)
+        index.update(movedIdx, positions[movedIdx])
+        idx, dist = index.nearest(positions, (2.0, 1.0, 0.5), 1.0)
+"""
+
+import numpy as np
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class SpatialHash(object):
+    """ Uniform grid spatial hash of indexed 3D points."""
+    def __init__(self, cellSize, positions=None):
+        """ Init example: index = SpatialHash(1.0, cubePosArr)
+            Args:
+                cellSize (float): grid cell edge length, normally the most used
+                    query radius.
+                positions (array-like, optional): (n, 3) init point positions.
+        """
+        if cellSize <= 0: raise ValueError("Invalid cell size: %s" % str(cellSize))
+        self.cellSize = float(cellSize)
+        self.cells = np.zeros((0, 3), dtype=np.int64)
+        self.buckets = {}
+        if positions is not None: self.build(positions)
+
+    #-----------------------------------------------------------------------------
+    def _getCells(self, positions):
+        return np.floor(np.asarray(positions, dtype=np.float64) / self.cellSize).astype(np.int64)
+
+    def build(self, positions):
+        """ Rebuild the hash with the (n, 3) point positions."""
+        self.cells = self._getCells(positions).reshape(-1, 3)
+        self.buckets = {}
+        for idx, cell in enumerate(map(tuple, self.cells.tolist())):
+            self.buckets.setdefault(cell, set()).add(idx)
+
+    def update(self, indices, positions):
+        """ Update the points moved to the new positions.
+            Args:
+                indices (array-like): (k,) moved point indices.
+                positions (array-like): (k, 3) new positions of the points.
+        """
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        if not indices.size: return
+        newCells = self._getCells(positions).reshape(-1, 3)
+        changed = np.any(newCells != self.cells[indices], axis=1)
+        if not changed.any(): return
+        for idx, oldCell, newCell in zip(indices[changed].tolist(),
+                                         self.cells[indices[changed]].tolist(),
+                                         newCells[changed].tolist()):
+            bucket = self.buckets[tuple(oldCell)]
+            bucket.discard(idx)
+            if not bucket: del self.buckets[tuple(oldCell)]
+            self.buckets.setdefault(tuple(newCell), set()).add(idx)
+        self.cells[indices[changed]] = newCells[changed]
+
+    #-----------------------------------------------------------------------------
+    def queryCandidates(self, point, radius):
+        """ Return the indices of the points in the cells overlapping the sphere
+            (the caller needs to check the exact distance).
+        """
+        low = self._getCells(np.asarray(point) - radius)
+        high = self._getCells(np.asarray(point) + radius)
+        result = []
+        for cx in range(low[0], high[0] + 1):
+            for cy in range(low[1], high[1] + 1):
+                for cz in range(low[2], high[2] + 1):
+                    bucket = self.buckets.get((cx, cy, cz))
+                    if bucket: result.extend(bucket)
+        return np.array(result, dtype=np.int64)
+
+    def queryRadius(self, positions, point, radius):
+        """ Return the indices of the points within the radius of the point.
+            Args:
+                positions (np.ndarray): (n, 3) current point positions.
+                point (array-like): query (x, y, z) position.
+                radius (float): query radius.
+        """
+        candidates = self.queryCandidates(point, radius)
+        if not candidates.size: return candidates
+        distances = np.linalg.norm(positions[candidates] - point, axis=1)
+        return candidates[distances <= radius]
+
+    def nearest(self, positions, point, radius, excludeSet=None):
+        """ Find the nearest point within the radius of the point.
+            Args:
+                positions (np.ndarray): (n, 3) current point positions.
+                point (array-like): query (x, y, z) position.
+                radius (float): max search distance.
+                excludeSet (set, optional): point indices to skip.
+            Returns:
+                tuple: (point index or -1, distance or inf if not found).
+        """
+        candidates = self.queryCandidates(point, radius)
+        if excludeSet: candidates = np.array([i for i in candidates.tolist() if i not in excludeSet],
+                                             dtype=np.int64)
+        if not candidates.size: return (-1, float('inf'))
+        distances = np.linalg.norm(positions[candidates] - point, axis=1)
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > radius: return (-1, float('inf'))
+        return (int(candidates[nearest]), float(distances[nearest]))
@@ -68,6 +68,8 @@ def gDebugPrint(msg, prt=True, logType=LOG_INFO):
 import ConfigLoader
 CONFIG_FILE_NAME = 'controllerConfig.txt'
 gGonfigPath = os.path.join(dirpath, CONFIG_FILE_NAME)
+# The local config is not tracked, use the template if it is not created.
+if not os.path.exists(gGonfigPath): gGonfigPath = os.path.join(dirpath, 'controllerConfig_template.txt')
 iConfigLoader = ConfigLoader.ConfigLoader(gGonfigPath, mode='r')
 if iConfigLoader is None:
     print("Error: The config file %s is not exist.Program exit!" %str(gGonfigPath))
@@ -88,6 +90,11 @@ gPlcDict = {
 }
 gUAnamespace = 'Controller'
 gAutoGrabFlag = False 
+# Robot arm link lengths (base, shoulder, elbow, wrist) and theta1-theta4 ranges.
+gArmLinkLens = (2.0, 1.5, 1.0, 0.5)
+gArmJointLimits = ((-180, 180), (-90, 90), (-180, 180), (-90, 90))
+# Workspace reachability map storage folder.
+gWorkspaceDir = os.path.join(gTopDir, 'Workspace')
 
 #-------<GLOBAL PARAMTERS>-----------------------------------------------------
 iMainFrame = None   # MainFrame.
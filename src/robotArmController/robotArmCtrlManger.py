@@ -14,69 +14,66 @@
 # License:     MIT License  
 #-----------------------------------------------------------------------------
 
+import os
 import math
 import time
 import asyncio
 import threading
 import numpy as np
 from itertools import product
-from scipy.optimize import fsolve
 
 import robotArmCtrlGlobal as gv
 import robotArmCtrlConst as ct
 import opcuaComm
+import angleCalculation
+import armWorkspace
+
+GRAB_Z_TARGET = -2.0    # shift down 2.0 (base height) so the cube is on the ground
+GRAB_TOLERANCE = 0.5    # max gripper miss distance of the best-effort grab pose (simulator grab distance is 1).
 
 #-----------------------------------------------------------------------------
 #-----------------------------------------------------------------------------
-def getRobotJointAngles(x, y, initial_guess=None):
+def getRobotJointAngles(x, y, initial_guess=None, ikCache=None, tolerance=GRAB_TOLERANCE):
     """
-    Solve inverse kinematics for a 3-DOF robot arm.
+    Solve inverse kinematics for a 3-DOF robot arm with the closed-form solver,
+    the cube out of the level wrist reach gets the nearest (best-effort) pose.
     
     Args:
         x: Target x-coordinate of the cube
         y: Target y-coordinate of the cube
         initial_guess: Optional initial guess for [theta1, theta2, theta3] in radians
+        ikCache: Optional angleCalculation.IKCache to memoize the solutions
+        tolerance: Max gripper miss distance of the best-effort pose
     
     Returns:
-        dict with theta1, theta2, theta3 in both radians and degrees,
-        plus verification metrics
+        tuple of the (shoulder, elbow, wrist) int angles in degrees, None if the
+        cube position is not reachable inside the joint limits and tolerance.
+    """
+    if ikCache:
+        result = ikCache.solve(x, y, initial_guess=initial_guess, z_target=GRAB_Z_TARGET)
+    else:
+        result = angleCalculation.solve_robot_arm(x, y, initial_guess=initial_guess,
+                                                  z_target=GRAB_Z_TARGET,
+                                                  joint_limits=gv.gArmJointLimits[1:4])
+    if not (result['reachable'] or result['position_error'] <= tolerance): return None
+    return (int(result['theta1_deg']), int(result['theta2_deg']), int(result['theta3_deg']))
+
+#-----------------------------------------------------------------------------
+def getRobotJointAnglesBatch(xArr, yArr, initial_guess=None):
+    """ Solve the inverse kinematics of a batch of cube positions in one pass.
+        Args:
+            xArr (array-like): target x-coordinates of the cubes.
+            yArr (array-like): target y-coordinates of the cubes.
+            initial_guess (array-like, optional): (3,) or (N, 3) guess in radians.
+        Returns:
+            tuple: ((N, 3) float array of the (shoulder, elbow, wrist) angles in 
+                degrees, (N,) bool array of the reachable flags).
     """
-    # Calculate target distance and z-height
-    distance = np.sqrt(x**2 + y**2)
-    z_target = 2.0  # Fixed z-axis constraint
-    # Link lengths
-    L1, L2, L3 = 1.5, 1.0, 0.5
-    def equations(angles):
-        t1, t2, t3 = angles
-        # Cumulative angles
-        a12  = t1 + t2
-        a123 = t1 + t2 + t3
-        # Ground projections (x-axis)
-        a = np.cos(t1)  * L1
-        b = np.cos(a12) * L2
-        c = np.cos(a123)* L3
-        # Z-axis projections
-        d = np.sin(t1)  * L1
-        e = np.sin(a12) * L2
-        f = np.sin(a123)* L3
-        eq1 = (a + b + c) - distance   # X-axis constraint
-        eq2 = (d + e + f) + z_target   # Z-axis constraint (shift up by 2.0 so the cube is on the ground)
-        eq3 = a123                     # Wrist flat constraint (sum = 0 keeps wrist level)
-        return [eq1, eq2, eq3]
-    # Default initial guess if none provided
-    if initial_guess is None:
-        initial_guess = [np.pi/4, -np.pi/4, 0.0]
-    # Solve the system
-    solution, info, ier, msg = fsolve(equations, initial_guess, full_output=True)
-    if ier != 1:
-        print(f"Warning: Solver did not fully converge — {msg}")
-    t1, t2, t3 = solution
-    # Verify solution
-    a12  = t1 + t2
-    a123 = t1 + t2 + t3
-    computed_distance = np.cos(t1)*L1 + np.cos(a12)*L2 + np.cos(a123)*L3
-    computed_z       = np.sin(t1)*L1 + np.sin(a12)*L2 + np.sin(a123)*L3
-    return (int(np.degrees(t1)), int(np.degrees(t2)), int(np.degrees(t3)))
+    result = angleCalculation.solve_robot_arm_batch(xArr, yArr, initial_guess=initial_guess,
+                                                    z_target=GRAB_Z_TARGET,
+                                                    joint_limits=gv.gArmJointLimits[1:4])
+    angles = np.stack((result['theta1_deg'], result['theta2_deg'], result['theta3_deg']), axis=-1)
+    return (angles, result['converged'])
 
 #-----------------------------------------------------------------------------
 #-----------------------------------------------------------------------------
@@ -110,9 +107,38 @@ class plcDataManager(threading.Thread):
         # Init the OPC-UA connector
         serverUrl = "opc.tcp://%s:%s/%s/server/" %(gv.gPlcDict['ip'], str(gv.gPlcDict['port']), gv.gPlcDict['id'])
         self.armOPCUAclient = opcuaComm.opcuaClient(serverUrl, timeout=4, watchdog_interval=10)
+        # IK solution cache for the repeated auto grab at the same cube positions.
+        self.ikCache = angleCalculation.IKCache(link_lengths=gv.gArmLinkLens[1:],
+                                                joint_limits=gv.gArmJointLimits[1:4])
+        # Workspace map for the O(1) reachability check before solving the IK.
+        # The map keeps the level wrist the same as the IK solver, it is None
+        # (the IK result decides the reachability) until the map is ready.
+        self.workspaceMap = None
+        self._initWorkspaceMap()
         self.terminate = False
         gv.gDebugPrint('Management HMI PLC dataMgr init done.', logType=gv.LOG_INFO)
 
+    #-----------------------------------------------------------------------------
+    def _initWorkspaceMap(self):
+        """ Load the built workspace map, a missing map is built in a background
+            thread so the voxel build does not stall the PLC data loop start.
+        """
+        mapFile = armWorkspace.getMapName(gv.gArmLinkLens, gv.gArmJointLimits, armWorkspace.DEF_RES,
+                                          wristAngle=armWorkspace.LEVEL_WRIST) + '.npy'
+        if os.path.exists(os.path.join(gv.gWorkspaceDir, mapFile)):
+            self._loadWorkspaceMap()
+            return
+        gv.gDebugPrint('Workspace map %s not found, build it in the background.' % mapFile,
+                       logType=gv.LOG_INFO)
+        threading.Thread(target=self._loadWorkspaceMap, daemon=True).start()
+
+    def _loadWorkspaceMap(self):
+        startT = time.time()
+        self.workspaceMap = armWorkspace.WorkspaceMap.loadOrBuild(gv.gWorkspaceDir, gv.gArmLinkLens,
+                                                                  jointLimits=gv.gArmJointLimits,
+                                                                  wristAngle=armWorkspace.LEVEL_WRIST)
+        gv.gDebugPrint('Workspace map ready in %.2f sec.' % (time.time() - startT), logType=gv.LOG_INFO)
+
     #-----------------------------------------------------------------------------
     def run(self):
         """ Thread run() function will be called by start(). """
@@ -196,10 +222,6 @@ class plcDataManager(threading.Thread):
     def setAutoGrabAngle(self):
         x = self.dataVariableDict[ct.VN_CUBE_POS_X]
         y = self.dataVariableDict[ct.VN_CUBE_POS_Y]
-        targetDistance = np.sqrt(x**2 + y**2)
-        if targetDistance > 2.4:
-            gv.gDebugPrint("The cube is too far away, cannot grab it.")
-            return None 
         # Calculate the base angle
         baseAngle = 0 
         if x == 0 and y > 0:
@@ -208,9 +230,18 @@ class plcDataManager(threading.Thread):
             baseAngle = -90
         else:
             baseAngle = math.degrees(math.atan2(y, x))
+        # The gripper needs to reach the ground (within the grab range) to grab the
+        # cube, before the workspace map is built only the IK result is checked.
+        wsMap = self.workspaceMap
+        if wsMap is not None and not wsMap.isReachable(x, y, 0.0, tolerance=GRAB_TOLERANCE):
+            gv.gDebugPrint("The cube is out of the arm workspace, cannot grab it.")
+            return None
         # calculate the angle for the shoulder, elbow and wrist
         #angles = getRobotJointAngles(x, y, resolution=5)
-        angles = getRobotJointAngles(x, y)
+        angles = getRobotJointAngles(x, y, ikCache=self.ikCache)
+        if angles is None:
+            gv.gDebugPrint("The cube is out of the arm reachable range, cannot grab it.")
+            return None
         gv.iMainFrame.baseDisCtrl.SetValue(int(baseAngle))
         gv.iMainFrame.shoulderDisCtrl.SetValue(int(angles[0]))
         gv.iMainFrame.elbowDisCtrl.SetValue(int(angles[1]))
@@ -27,6 +27,7 @@ PLC_GRIPPER_ON  = 'gripperOn'
 ARM_POS_TAG     = 'pos'
 ARM_ANGLE_TAG   = 'angles'
 ARM_GRIP_TAG    = 'gripper'
+ARM_ID_TAG      = 'id'      # arm index in the simulator work cell.
 
 #-----------------------------------------------------------------------------
 # All the OPCUA object variable names
@@ -75,6 +75,7 @@ gInterval = float(CONFIG_DICT['CLK_INT'])
 gPlcName = CONFIG_DICT['PLC_NAME']
 gPlcHostIP = (CONFIG_DICT['OPCUA_IP'], int(CONFIG_DICT['OPCUA_PORT']))
 gReconnectTime = int(CONFIG_DICT['RW_RECONN_TIME'])
+gArmID = int(CONFIG_DICT['ARM_ID']) if 'ARM_ID' in CONFIG_DICT.keys() else 0
 gUAnamespace = 'Controller'
 
 #-------<GLOBAL PARAMETERS>-----------------------------------------------------
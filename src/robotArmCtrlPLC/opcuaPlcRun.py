@@ -152,7 +152,7 @@ class opcuaPlcSimulator(object):
     #-----------------------------------------------------------------------------
     def getArmSensorData(self):
         """ Get the current thetas' angle of the robot arm."""
-        requestDict = {ct.ARM_ANGLE_TAG: None}
+        requestDict = {ct.ARM_ID_TAG: gv.gArmID, ct.ARM_ANGLE_TAG: None}
         _, _, result = self.pwConnector.getPWItemData(requestType=ct.PLC_ARM_ANGLE,
                                                       dataDict=requestDict)
         self.dataVariableDict[ct.VN_ARM_ANGLE_1] = result['angles'][0]
@@ -186,7 +186,7 @@ class opcuaPlcSimulator(object):
             self.controlVariableDict[ct.VN_MOTOR5_CTRL],
             self.controlVariableDict[ct.VN_MOTOR6_CTRL]
         ]
-        requestDict = {ct.ARM_ANGLE_TAG: reqList}
+        requestDict = {ct.ARM_ID_TAG: gv.gArmID, ct.ARM_ANGLE_TAG: reqList}
         gv.gDebugPrint("setSimulatorArmState: requestDict = %s", logType=gv.LOG_INFO)
         result =  self.pwConnector.setPWItemState(requestType=ct.PLC_ARM_ANGLE, 
                                                 stateDict=requestDict)
@@ -195,7 +195,7 @@ class opcuaPlcSimulator(object):
     #-----------------------------------------------------------------------------
     def setSimulatorGripperState(self):
         """ Send the gripper control command to the robot arm simulator.  """
-        requestDict = {ct.ARM_GRIP_TAG: self.controlVariableDict[ct.VN_GRIPPER_CTRL]}
+        requestDict = {ct.ARM_ID_TAG: gv.gArmID, ct.ARM_GRIP_TAG: self.controlVariableDict[ct.VN_GRIPPER_CTRL]}
         gv.gDebugPrint("setSimulatorGripperState: requestDict = %s", logType=gv.LOG_INFO)
         result = self.pwConnector.setPWItemState(requestType=ct.PLC_GRIPPER,
                                                  stateDict=requestDict)
@@ -2,9 +2,10 @@
 #-----------------------------------------------------------------------------
 # Name:        robotArmAgents.py
 #
-# Purpose:     This module includes all the agent classes to define the visible 
-#              object (Cube, RobotArm, Env) shown in the robot arm simulator main 
-#              canvas window.
+# Purpose:     This module includes all the agent classes to define the simulated 
+#              object (Cube, RobotArm) shown in the robot arm simulator main canvas
+#              window. The module does not import wx/OpenGL so the agents can also
+#              be used by the headless simulation engine.
 #
 # Author:      Yuancheng Liu
 #
@@ -14,49 +15,131 @@
 # License:     MIT License
 #-----------------------------------------------------------------------------
 
-import math
-import wx
-import wx.glcanvas as glcanvas
-from OpenGL.GL import *
-from OpenGL.GLU import *
-from OpenGL.GLUT import *
+import numpy as np
 import robotArmGlobal as gv
+import armKinematics as kinematics
+
+# Index of the values in the robot arm state buffer.
+ARM_JOINT_NUM = 6           # theta1 - theta5 and gripper opening.
+ARM_LINK_IDX = 6            # l1 - l4 link lengths after the joints.
+ARM_BASE_IDX = 10           # base (x, y, z) position in the world.
+ARM_BUF_SZ = 13
+# Index of the values in the cube state buffer.
+CUBE_VEL_IDX = 3            # falling velocity after the (x, y, z) position.
+CUBE_SIZE_IDX = 4
+CUBE_BUF_SZ = 5
+
+#-----------------------------------------------------------------------------
+def _stateProperty(idx):
+    """ Create the state property stored in the object's float64 buffer at the 
+        index, setting a different value bumps the object state version so the 
+        cached results (such as forward kinematics) are refreshed.
+    """
+    def getter(self):
+        return self._buf[idx]
+    def setter(self, val):
+        if self._buf[idx] != val:
+            self._buf[idx] = val
+            self.stateVersion += 1
+    return property(getter, setter)
+
+#-----------------------------------------------------------------------------
+def _readOnlyView(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
 
 #-----------------------------------------------------------------------------
 #-----------------------------------------------------------------------------
 class Cube(object):
-    """ The small cube object for the robot arm to grab."""
-    def __init__(self, x, y, z, size=0.3):
+    """ The small cube object for the robot arm to grab, the state is stored in
+        one float64 buffer: [x, y, z, velocityZ, size].
+    """
+    __slots__ = ('_buf', '_posView', 'original_pos', 'stateVersion')
+    x = _stateProperty(0)
+    y = _stateProperty(1)
+    z = _stateProperty(2)
+    velocityZ = _stateProperty(CUBE_VEL_IDX)    # falling speed.
+    size = _stateProperty(CUBE_SIZE_IDX)
+
+    def __init__(self, x, y, z, size=0.3, buffer=None):
         """ Init example: self.cube =agents.Cube(2.0, 1.0, 0.3) 
             Args:
                 x (float): Cube init position x coordinate.
                 y (float): Cube init position y coordinate.
                 z (float): Cube init position z coordinate.
                 size (float, optional): size. Defaults to 0.3.
+                buffer (np.ndarray, optional): float64 (CUBE_BUF_SZ,) array (such
+                    as a row of a scene array) to store the state. Defaults to None.
         """
-        self.x = x
-        self.y = y
-        self.z = z
-        self.size = size
-        self.original_pos = [x, y, z]
+        self._buf = np.zeros(CUBE_BUF_SZ) if buffer is None else buffer
+        self._posView = _readOnlyView(self._buf[:3])
+        self.stateVersion = 0
+        self._buf[:] = (x, y, z, 0.0, size)
+        self.original_pos = (x, y, z)
     
     #-----------------------------------------------------------------------------
     def reset(self):
-        self.x, self.y, self.z = self.original_pos
+        self.setPosition(*self.original_pos)
+        self.velocityZ = 0.0
+
+    def applyGravity(self, dt):
+        """ Integrate the free falling of the cube for dt seconds until it rests on the ground."""
+        ground = self.size/2
+        if self.z > ground:
+            self.velocityZ -= gv.gCubeGravity * dt
+            self.z = max(self.z + self.velocityZ * dt, ground)
+        elif self.z < ground:
+            self.z = ground
+        if self.z == ground: self.velocityZ = 0.0
     
     def getPosition(self):
-        return [self.x, self.y, self.z]
+        """ Return the read-only (x, y, z) view of the position buffer."""
+        return self._posView
     
     def setPosition(self, x, y, z):
-        self.x = x
-        self.y = y
-        self.z = z
+        self._buf[:3] = (x, y, z)
+        self.stateVersion += 1
 
 #-----------------------------------------------------------------------------
 #-----------------------------------------------------------------------------
 class RobotArm(object):
-    """ Robot arm agent object."""
-    def __init__(self):
+    """ Robot arm agent object, the joint angles, link lengths and the base
+        position are stored in one contiguous float64 buffer: [theta1-theta5, 
+        gripper_open, l1-l4, baseX, baseY, baseZ].
+    """
+    __slots__ = ('_buf', '_jointView', '_baseView', 'stateVersion', '_fkBuffer', '_fkView',
+                 '_fkVersion', 'gripper_closed', 'holding_cube')
+    # Joint angles and link lengths, changing any of them bumps the stateVersion.
+    theta1 = _stateProperty(0)
+    theta2 = _stateProperty(1)
+    theta3 = _stateProperty(2)
+    theta4 = _stateProperty(3)
+    theta5 = _stateProperty(4)
+    gripper_open = _stateProperty(5)
+    l1 = _stateProperty(ARM_LINK_IDX)
+    l2 = _stateProperty(ARM_LINK_IDX + 1)
+    l3 = _stateProperty(ARM_LINK_IDX + 2)
+    l4 = _stateProperty(ARM_LINK_IDX + 3)
+
+    def __init__(self, buffer=None, basePos=(0.0, 0.0, 0.0)):
+        """ Init example: self.robot = agents.RobotArm()
+            Args:
+                buffer (np.ndarray, optional): float64 (ARM_BUF_SZ,) array (such 
+                    as a row of a scene array) to store the arm state. Defaults to None.
+                basePos (tuple, optional): arm base (x, y, z) position in the world.
+                    Defaults to (0.0, 0.0, 0.0).
+        """
+        self._buf = np.zeros(ARM_BUF_SZ) if buffer is None else buffer
+        self._jointView = _readOnlyView(self._buf[:ARM_JOINT_NUM])
+        self._baseView = _readOnlyView(self._buf[ARM_BASE_IDX:])
+        self.stateVersion = 0
+        # Forward kinematics result cache: preallocated buffer, read-only view
+        # returned to the caller and the state version it was calculated for.
+        self._fkBuffer = np.zeros((1, kinematics.JOINT_NUM, 3))
+        self._fkView = _readOnlyView(self._fkBuffer[0])
+        self._fkVersion = -1
+        self._buf[ARM_BASE_IDX:] = basePos
         # Define all the public variables:
         # Link lengths
         self.l1 = gv.gArmBaseLen        # Base to shoulder
@@ -76,33 +159,28 @@ class RobotArm(object):
     
     #-----------------------------------------------------------------------------
     def forwardKinematics(self):
-        """ Calculate the position of each joint. return the list with 5 joint positions."""
-        t1 = math.radians(self.theta1)  # Negate for correct rotation direction
-        t2 = math.radians(self.theta2)
-        t3 = math.radians(self.theta3)
-        t4 = math.radians(self.theta4)
-        # Base pos
-        p0 = [0, 0, 0]
-        # Joint 1
-        p1 = [0, 0, self.l1]
-        # Joint 2 (shoulder) - fixed rotation
-        x2 = self.l2 * math.cos(-t1) * math.cos(t2)
-        y2 = self.l2 * math.sin(-t1) * math.cos(t2)
-        z2 = self.l1 + self.l2 * math.sin(t2)
-        p2 = [x2, -y2, z2]
-        # Joint 3 (elbow)
-        angle_sum_23 = t2 + t3
-        x3 = math.cos(t1) * (self.l2 * math.cos(t2) + self.l3 * math.cos(angle_sum_23))
-        y3 = math.sin(t1) * (self.l2 * math.cos(t2) + self.l3 * math.cos(angle_sum_23))
-        z3 = self.l1 + self.l2 * math.sin(t2) + self.l3 * math.sin(angle_sum_23)
-        p3 = [x3, y3, z3]
-        # End effector (gripper position)
-        angle_sum_234 = t2 + t3 + t4
-        x4 = math.cos(t1) * (self.l2 * math.cos(t2) + self.l3 * math.cos(angle_sum_23) + self.l4 * math.cos(angle_sum_234))
-        y4 = math.sin(t1) * (self.l2 * math.cos(t2) + self.l3 * math.cos(angle_sum_23) + self.l4 * math.cos(angle_sum_234))
-        z4 = self.l1 + self.l2 * math.sin(t2) + self.l3 * math.sin(angle_sum_23) + self.l4 * math.sin(angle_sum_234)
-        p4 = [x4, y4, z4]    
-        return [p0, p1, p2, p3, p4]
+        """ Calculate the position of each joint. return the read-only (5, 3) array 
+            with 5 joint positions, the cached result is returned until the joint 
+            angles or link lengths are changed.
+        """
+        if self._fkVersion != self.stateVersion:
+            kinematics.forwardKinematicsBatch(self._buf[:ARM_JOINT_NUM], 
+                                              self._buf[ARM_LINK_IDX:ARM_BASE_IDX], out=self._fkBuffer)
+            self._fkBuffer += self._buf[ARM_BASE_IDX:]
+            self._fkVersion = self.stateVersion
+        return self._fkView
+
+    #-----------------------------------------------------------------------------
+    def forwardKinematicsBatch(self, jointAngles):
+        """ Calculate the joint positions of a batch of poses with the arm's link lengths.
+            Args:
+                jointAngles (array-like): (N, 5) joint angles in degrees.
+            Returns:
+                np.ndarray: (N, 5, 3) joint positions in the world.
+        """
+        posArr = kinematics.forwardKinematicsBatch(jointAngles, self._buf[ARM_LINK_IDX:ARM_BASE_IDX])
+        posArr += self._buf[ARM_BASE_IDX:]
+        return posArr
     
     #-----------------------------------------------------------------------------
     def getGripperOrientation(self):
@@ -115,326 +193,17 @@ class RobotArm(object):
     
     #-----------------------------------------------------------------------------
     def getJointAngles(self):
-        return [self.theta1, self.theta2, self.theta3, self.theta4, self.theta5, self.gripper_open]
+        """ Return the read-only view of the 6 joint values buffer."""
+        return self._jointView
 
-    def getCubeHoldingState(self):
-        return self.holding_cube
+    def setJointAngles(self, angles):
+        """ Set the 6 joint values [theta1-theta5, gripper_open] in one call."""
+        self._buf[:ARM_JOINT_NUM] = angles
+        self.stateVersion += 1
 
-#-----------------------------------------------------------------------------
-#-----------------------------------------------------------------------------
-class GLCanvas(glcanvas.GLCanvas):
-    """ The sense and canvas of the robot arm and cube."""
-    def __init__(self, parent, robot, cube):
-        glcanvas.GLCanvas.__init__(self, parent, -1)
-        self.context = glcanvas.GLContext(self)
-        self.robot = robot
-        self.cube = cube
-        self.init = False
-        self.rotation_x = -50
-        self.rotation_y = -80
-        self.distance = 10 # cam distance to the origin (0, 0)
-        self.last_x = 0
-        self.last_y = 0
-        # bind the mouse event.
-        self.Bind(wx.EVT_PAINT, self.OnPaint)
-        self.Bind(wx.EVT_SIZE, self.OnSize)
-        self.Bind(wx.EVT_LEFT_DOWN, self.OnMouseDown)
-        self.Bind(wx.EVT_MOTION, self.OnMouseMotion)
-        self.Bind(wx.EVT_MOUSEWHEEL, self.OnMouseWheel)
-        gv.gDebugPrint("The Robot Arm Simulator Canvas is created.", logType=gv.LOG_INFO)
-    
-    #-----------------------------------------------------------------------------
-    def InitGL(self):
-        """ Init the openGL scene."""
-        self.SetCurrent(self.context)
-        #glClearColor(0.95, 0.95, 0.95, 1.0)
-        glClearColor(gv.gCanvasBgColor[0], gv.gCanvasBgColor[1],gv.gCanvasBgColor[2], gv.gCanvasBgColor[3])
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
-        glEnable(GL_LIGHT0)
-        glEnable(GL_COLOR_MATERIAL)
-        glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
-        # Light position
-        glLightfv(GL_LIGHT0, GL_POSITION, [5, 5, 10, 1])
-        glLightfv(GL_LIGHT0, GL_AMBIENT, [0.3, 0.3, 0.3, 1])
-        glLightfv(GL_LIGHT0, GL_DIFFUSE, [0.8, 0.8, 0.8, 1])
-        self.init = True
-    
-    #-----------------------------------------------------------------------------
-    def OnPaint(self, event):
-        if not self.init: self.InitGL()
-        self.SetCurrent(self.context)
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        width, height = self.GetSize()
-        gluPerspective(45, width / height, 0.1, 100.0)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        gluLookAt(0, 0, self.distance, 0, 0, 0, 0, 1, 0)
-        glRotatef(self.rotation_x, 1, 0, 0)
-        glRotatef(self.rotation_y, 0, 0, 1)
-        self.DrawScene()
-        self.SwapBuffers()
-    
-    #-----------------------------------------------------------------------------
-    def DrawScene(self):
-        """ Draw the scene with all the objects. """
-        self.DrawGrid()
-        self.DrawCube()
-        # Draw robot arm
-        positions = self.robot.forwardKinematics()
-        # Draw base area identify the max range the robot can reach
-        glPushMatrix()
-        glColor3f(0, 0.8, 0)
-        glTranslatef(0, 0, 0)
-        # Draw the area the robot can reach
-        #self.DrawCylinder(1, 0.05)
-        self.DrawCylinder(2.4, 0.05) # 2.4 the max radius range the robot can reach
-        glPopMatrix()
-        # Draw arm segments
-        colors = [(1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 0)]
-        for i in range(len(positions) - 1):
-            p1 = positions[i]
-            p2 = positions[i + 1]
-            glColor3f(*colors[i])
-            self.DrawSegment(p1, p2, 0.1)
-            # Draw joint sphere
-            glPushMatrix()
-            glTranslatef(*p2)
-            self.DrawSphere(0.15)
-            glPopMatrix()
-        # Draw gripper
-        self.DrawGripper(positions[-1])
-    
-    #-----------------------------------------------------------------------------
-    def DrawGrid(self):
-        """Draw the ground grid."""
-        glDisable(GL_LIGHTING)
-        glColor3f(0.7, 0.7, 0.7)
-        glBegin(GL_LINES)
-        for i in range(-5, 6):
-            glVertex3f(i, -5, 0)
-            glVertex3f(i, 5, 0)
-            glVertex3f(-5, i, 0)
-            glVertex3f(5, i, 0)
-        glEnd()
-        # Draw coordinate markers at grid intersections
-        glPointSize(5)
-        glBegin(GL_POINTS)
-        glColor3f(0.5, 0.5, 0.5)
-        for x in range(-5, 6, 2):
-            for y in range(-5, 6, 2):
-                if x == 0 and y == 0:
-                    glColor3f(0.0, 0.0, 0.0)  # Black for origin
-                    glVertex3f(x, y, 0.02)
-                    glColor3f(0.5, 0.5, 0.5)
-                else:
-                    glVertex3f(x, y, 0.02)
-        glEnd()
-        glPointSize(1)
-        # Draw axes
-        glLineWidth(5)
-        glBegin(GL_LINES)
-        # X axis - red
-        glColor3f(1, 0, 0)
-        glVertex3f(0, 0, 0)
-        glVertex3f(2, 0, 0)
-        # Y axis - green
-        glColor3f(0, 1, 0)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, 2, 0)
-        # Z axis - blue
-        glColor3f(0, 0, 1)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, 0, 2)
-        glEnd()
-        glLineWidth(1)
-        glEnable(GL_LIGHTING)
-    
-    #-----------------------------------------------------------------------------
-    def DrawCube(self):
-        glPushMatrix()
-        glTranslatef(self.cube.x, self.cube.y, self.cube.z)
-        # Different color based on whether it's being held
-        if self.robot.holding_cube:
-            glColor3f(1.0, 0.5, 0.0)  # Orange when held
-        else:
-            glColor3f(1.0, 0.8, 0.0)  # Yellow when free
-        s = self.cube.size / 2
-        # Draw cube 6 faces
-        glBegin(GL_QUADS)
-        # Front face
-        glNormal3f(0, 0, 1)
-        glVertex3f(-s, -s, s)
-        glVertex3f(s, -s, s)
-        glVertex3f(s, s, s)
-        glVertex3f(-s, s, s)
-        # Back face
-        glNormal3f(0, 0, -1)
-        glVertex3f(-s, -s, -s)
-        glVertex3f(-s, s, -s)
-        glVertex3f(s, s, -s)
-        glVertex3f(s, -s, -s)
-        # Top face
-        glNormal3f(0, 1, 0)
-        glVertex3f(-s, s, -s)
-        glVertex3f(-s, s, s)
-        glVertex3f(s, s, s)
-        glVertex3f(s, s, -s)
-        # Bottom face
-        glNormal3f(0, -1, 0)
-        glVertex3f(-s, -s, -s)
-        glVertex3f(s, -s, -s)
-        glVertex3f(s, -s, s)
-        glVertex3f(-s, -s, s)
-        # Right face
-        glNormal3f(1, 0, 0)
-        glVertex3f(s, -s, -s)
-        glVertex3f(s, s, -s)
-        glVertex3f(s, s, s)
-        glVertex3f(s, -s, s)
-        # Left face
-        glNormal3f(-1, 0, 0)
-        glVertex3f(-s, -s, -s)
-        glVertex3f(-s, -s, s)
-        glVertex3f(-s, s, s)
-        glVertex3f(-s, s, -s)
-        glEnd()
-        glPopMatrix()
-    
-    #-----------------------------------------------------------------------------
-    def DrawGripper(self, position):
-        glPushMatrix()
-        glTranslatef(*position)
-        # Get gripper orientation
-        yaw, pitch, roll = self.robot.getGripperOrientation()
-        #print((yaw, pitch, roll))
-        glRotatef(yaw, 0, 0, 1)
-        glRotatef(pitch, 0, 1, 0)
-        glRotatef(roll, 0, 0, 1)  # Add roll rotation
-        # Draw gripper base
-        glColor3f(0.3, 0.3, 0.3)
-        self.DrawCylinder(0.08, 0.15)
-        # Calculate gripper finger opening
-        opening = self.robot.gripper_open / 100.0 * 0.2  # Max 0.2 units
-        # Draw gripper fingers
-        glColor3f(0.2, 0.2, 0.2)
-        # Left finger
-        glPushMatrix()
-        glTranslatef(-opening, 0, 0.15)
-        glScalef(0.03, 0.03, 0.2)
-        self.DrawBox()
-        glPopMatrix()
-        # Right finger
-        glPushMatrix()
-        glTranslatef(opening, 0, 0.15)
-        glScalef(0.03, 0.03, 0.2)
-        self.DrawBox()
-        glPopMatrix()
-        # Draw gripper palm to the main scene
-        glPopMatrix()
-    
-    #-----------------------------------------------------------------------------
-    def DrawBox(self):
-        glBegin(GL_QUADS)
-        # Front
-        glNormal3f(0, 0, 1)
-        glVertex3f(-1, -1, 1)
-        glVertex3f(1, -1, 1)
-        glVertex3f(1, 1, 1)
-        glVertex3f(-1, 1, 1)
-        # Back
-        glNormal3f(0, 0, -1)
-        glVertex3f(-1, -1, -1)
-        glVertex3f(-1, 1, -1)
-        glVertex3f(1, 1, -1)
-        glVertex3f(1, -1, -1)
-        # Top
-        glNormal3f(0, 1, 0)
-        glVertex3f(-1, 1, -1)
-        glVertex3f(-1, 1, 1)
-        glVertex3f(1, 1, 1)
-        glVertex3f(1, 1, -1)
-        # Bottom
-        glNormal3f(0, -1, 0)
-        glVertex3f(-1, -1, -1)
-        glVertex3f(1, -1, -1)
-        glVertex3f(1, -1, 1)
-        glVertex3f(-1, -1, 1)
-        # Right
-        glNormal3f(1, 0, 0)
-        glVertex3f(1, -1, -1)
-        glVertex3f(1, 1, -1)
-        glVertex3f(1, 1, 1)
-        glVertex3f(1, -1, 1)
-        # Left
-        glNormal3f(-1, 0, 0)
-        glVertex3f(-1, -1, -1)
-        glVertex3f(-1, -1, 1)
-        glVertex3f(-1, 1, 1)
-        glVertex3f(-1, 1, -1)
-        glEnd()
-    
-    #-----------------------------------------------------------------------------
-    def DrawSegment(self, p1, p2, radius):
-        """Draw the arm segment"""
-        dx = p2[0] - p1[0]
-        dy = p2[1] - p1[1]
-        dz = p2[2] - p1[2]
-        length = math.sqrt(dx**2 + dy**2 + dz**2)
-        glPushMatrix()
-        glTranslatef(*p1)
-        if length > 0:
-            ax = math.degrees(math.atan2(dy, dx))
-            ay = math.degrees(math.acos(dz / length))
-            glRotatef(ax, 0, 0, 1)
-            glRotatef(ay, 0, 1, 0)
-        self.DrawCylinder(radius, length)
-        glPopMatrix()
-    
-    #-----------------------------------------------------------------------------
-    def DrawCylinder(self, radius, height):
-        quad = gluNewQuadric()
-        gluCylinder(quad, radius, radius, height, 20, 1)
-        gluDeleteQuadric(quad)
-    
-    #-----------------------------------------------------------------------------
-    def DrawSphere(self, radius):
-        quad = gluNewQuadric()
-        gluSphere(quad, radius, 20, 20)
-        gluDeleteQuadric(quad)
-    
-    #-----------------------------------------------------------------------------
-    def OnSize(self, event):
-        self.Refresh()
-    
-    def OnMouseDown(self, event):
-        self.last_x, self.last_y = event.GetPosition()
-    
-    def OnMouseMotion(self, event):
-        if event.Dragging() and event.LeftIsDown():
-            x, y = event.GetPosition()
-            dx = x - self.last_x
-            dy = y - self.last_y
-            self.rotation_y += dx
-            self.rotation_x += dy
-            self.last_x = x
-            self.last_y = y
-            self.Refresh()
-    
-    #-----------------------------------------------------------------------------
-    def OnMouseWheel(self, event):
-        delta = event.GetWheelRotation()
-        self.distance -= delta / 120.0
-        self.distance = max(3, min(20, self.distance))
-        self.Refresh()
+    def getBasePosition(self):
+        """ Return the read-only (x, y, z) view of the base position buffer."""
+        return self._baseView
 
-    #-----------------------------------------------------------------------------
-    def updateCubeZ(self):
-        """ Update the cube Z position to simulate the gravity effect."""
-        if gv.iRobotArmObj.holding_cube: return
-        if self.cube.z > self.cube.size/2: 
-            self.cube.z -= 0.1
-        elif self.cube.z < self.cube.size/2:
-            self.cube.z =self.cube.size/2
+    def getCubeHoldingState(self):
+        return self.holding_cube
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmBatchRunner.py
+#
+# Purpose:     This module is the batch runner to execute a folder of the robot
+#              arm action scenario json files (same format as the controller's
+#              Scenarios folder), each of them in an isolated headless simulation
+#              engine in a process pool, then collect the final arm pose, cube
+#              position, timing and failures of all the scenarios in one result
+#              table (csv file).
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/24
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    Scenario json file: a list of actions {"act": <act>, "key": <key>, "val": <val>}
+        RST : reset the arm and cube to the init state.
+        MOV : move the joint <key> to the servo position <val>.
+    The servo position is in the range 0 - 270 with the joint zero position at
+    SERVO_CENTER, the simulator joint target is (val - SERVO_CENTER) clamped to
+    the joint limits. Each action waits the arm to arrive the target (max
+    MOV_TIMEOUT sec simulation time), the engine is stepped directly in the
+    worker process so the scenario runs as fast as the CPU can.
+
+    Usage:
+        python robotArmBatchRunner.py [--dir <scenarioFolder>] [--workers 8] [--out result.csv]
+"""
+
+import os
+import csv
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import robotArmGlobal as gv
+import robotArmEngine as engine
+
+SCE_DIR = os.path.join(gv.gTopDir, 'robotArmController', 'Scenarios')
+SERVO_CENTER = 135  # servo position of the joint zero angle.
+MOV_TIMEOUT = 30    # max simulation time (sec) to wait for one action.
+JOINT_KEYS = {'base': 0, 'shld': 1, 'elbw': 2, 'wrtP': 3, 'wrtR': 4, 'grip': 5}
+RESULT_FIELDS = ('scenario', 'result', 'actions', 'simTime', 'wallTime', 'theta1', 'theta2',
+                 'theta3', 'theta4', 'theta5', 'gripper', 'cubeX', 'cubeY', 'cubeZ', 'error')
+
+#-----------------------------------------------------------------------------
+def runScenario(filePath, rate=None):
+    """ Run one scenario file in a new headless simulation engine.
+        Args:
+            filePath (str): scenario json file path.
+            rate (float, optional): simulation steps per second. Defaults to None.
+        Returns:
+            dict: result row with the RESULT_FIELDS keys.
+    """
+    gv.gTestMD = False  # the arm follows the scenario target.
+    resultDict = dict.fromkeys(RESULT_FIELDS, '')
+    resultDict.update({'scenario': os.path.basename(filePath), 'result': 'failed', 'actions': 0})
+    startT = time.time()
+    simEngine = engine.SimulationEngine(rate=rate)
+    try:
+        with open(filePath, 'r') as fh:
+            actionList = json.load(fh)
+        simEngine.setArmTarget(simEngine.robotArm.getJointAngles())
+        for idx, action in enumerate(actionList):
+            if action['act'] == 'RST':
+                simEngine.reset()
+                simEngine.setArmTarget(simEngine.robotArm.getJointAngles())
+            elif action['act'] == 'MOV':
+                target = simEngine.getArmTarget()
+                target[JOINT_KEYS[action['key']]] = float(action['val']) - SERVO_CENTER
+                simEngine.setArmTarget(target)
+            else:
+                raise ValueError("action %s: unknown act %s" % (idx, str(action['act'])))
+            if not simEngine.runUntilArrived(MOV_TIMEOUT):
+                raise RuntimeError("action %s: arm not arrived in %s sec" % (idx, MOV_TIMEOUT))
+            resultDict['actions'] = idx + 1
+        resultDict['result'] = 'success'
+    except Exception as err:
+        resultDict['error'] = str(err)
+    angles = simEngine.robotArm.getJointAngles().round(3).tolist()
+    cubePos = simEngine.cube.getPosition().round(3).tolist()
+    resultDict.update(zip(RESULT_FIELDS[5:14], angles + cubePos))
+    resultDict['simTime'] = round(simEngine.getSimTime(), 3)
+    resultDict['wallTime'] = round(time.time() - startT, 3)
+    return resultDict
+
+#-----------------------------------------------------------------------------
+def runBatch(fileList, workers=None, rate=None):
+    """ Run the scenario files in a process pool and return the result rows
+        sorted by the scenario name.
+    """
+    resultList = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futureDict = {executor.submit(runScenario, filePath, rate): filePath for filePath in fileList}
+        for future in as_completed(futureDict):
+            try:
+                resultList.append(future.result())
+            except Exception as err:
+                # worker process crashed.
+                resultDict = dict.fromkeys(RESULT_FIELDS, '')
+                resultDict.update({'scenario': os.path.basename(futureDict[future]),
+                                   'result': 'failed', 'error': str(err)})
+                resultList.append(resultDict)
+    return sorted(resultList, key=lambda r: r['scenario'])
+
+#-----------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description='Run the robot arm scenarios in parallel.')
+    parser.add_argument('--dir', default=SCE_DIR, help='scenario json files folder.')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes.')
+    parser.add_argument('--rate', type=float, default=gv.gSimRate, help='simulation steps per second.')
+    parser.add_argument('--out', default='scenarioResult.csv', help='result csv file path.')
+    args = parser.parse_args()
+    fileList = sorted(glob.glob(os.path.join(args.dir, '*.json')))
+    if not fileList:
+        gv.gDebugPrint("No scenario file in %s" % args.dir, logType=gv.LOG_WARN)
+        return
+    startT = time.time()
+    resultList = runBatch(fileList, workers=args.workers, rate=args.rate)
+    with open(args.out, 'w', newline='') as fh:
+        writer = csv.DictWriter(fh, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(resultList)
+    failedCount = sum(1 for r in resultList if r['result'] != 'success')
+    for r in resultList:
+        print("%-30s %-8s simTime: %-8s wallTime: %-8s %s" % (r['scenario'], r['result'],
+              str(r['simTime']), str(r['wallTime']), r['error']))
+    gv.gDebugPrint("Run %s scenarios (%s failed) in %.2f sec, result saved to %s"
+                   % (len(resultList), failedCount, time.time() - startT, args.out), logType=gv.LOG_INFO)
+
+#-----------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmCanvas.py
+#
+# Purpose:     This module includes the wxPython OpenGL canvas class to draw the
+#              scene (Env, RobotArm and Cube agents) of the robot arm simulator.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/01/19
+# Version:     v_0.0.3
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    The GL drawing (meshes cache, arm, gripper, cubes and grid) is done by the
+    robotArmRenderer.SceneRenderer which is shared with the offscreen renderer,
+    this canvas owns the wx GL context, handles the camera mouse events and
+    frees the cached meshes with the context when the canvas is destroyed.
+
+    The canvas is repainted on demand: RefreshIfChanged() compares the scene
+    render version and the camera with the ones of the last paint, the UI timer
+    calls it every tick, so an idle simulator does not redraw the scene. While
+    the HUD is shown the idle canvas is still repainted every HUD_REFRESH_INT
+    seconds so the stats keep following the render loop.
+
+    Each paint is timed into the renderer's frameStats (the SwapBuffers() time
+    is the swap phase), the HUD text is drawn with the GLUT bitmap font.
+"""
+
+import time
+import wx
+import wx.glcanvas as glcanvas
+from OpenGL.GL import *
+from OpenGL.GLUT import *
+import robotArmGlobal as gv
+import robotArmRenderer as renderer
+
+HUD_REFRESH_INT = 1.0   # sec, min repaint interval of the idle canvas with the HUD shown.
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class GLCanvas(glcanvas.GLCanvas, renderer.SceneRenderer):
+    """ The sense and canvas of the work cell robot arms and cubes."""
+    def __init__(self, parent, scene):
+        glcanvas.GLCanvas.__init__(self, parent, -1)
+        # The max radius range the robot can reach on the ground.
+        reachRadius = gv.iWorkspaceMap.getMaxReach(0.0) if gv.iWorkspaceMap else 2.4
+        renderer.SceneRenderer.__init__(self, scene, reachRadius=reachRadius)
+        self.context = glcanvas.GLContext(self)
+        self.last_x = 0
+        self.last_y = 0
+        self.paintVersion = None    # scene and camera version of the last paint.
+        self.paintTime = 0.0        # time of the last paint.
+        self.glutReady = None       # GLUT bitmap font is usable, None if not checked.
+        # bind the mouse event.
+        self.Bind(wx.EVT_PAINT, self.OnPaint)
+        self.Bind(wx.EVT_SIZE, self.OnSize)
+        self.Bind(wx.EVT_LEFT_DOWN, self.OnMouseDown)
+        self.Bind(wx.EVT_MOTION, self.OnMouseMotion)
+        self.Bind(wx.EVT_MOUSEWHEEL, self.OnMouseWheel)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.OnDestroy)
+        gv.gDebugPrint("The Robot Arm Simulator Canvas is created.", logType=gv.LOG_INFO)
+    
+    #-----------------------------------------------------------------------------
+    def OnDestroy(self, event):
+        """ Free the cached meshes while the GL context is still alive."""
+        if self.init and event.GetEventObject() is self:
+            self.SetCurrent(self.context)
+            self.ReleaseGL()
+        event.Skip()
+    
+    #-----------------------------------------------------------------------------
+    def OnPaint(self, event):
+        self.SetCurrent(self.context)
+        if not self.init: self.InitGL()
+        self.paintVersion = self.getViewVersion()
+        self.paintTime = time.time()
+        width, height = self.GetSize()
+        self.frameStats.beginFrame()
+        self.RenderScene(width, height)
+        start = time.perf_counter()
+        self.SwapBuffers()
+        self.frameStats.addPhase('swap', start)
+        self.frameStats.endFrame()
+
+    #-----------------------------------------------------------------------------
+    def DrawHUDText(self, x, y, text):
+        """ Draw the HUD text with the GLUT bitmap font."""
+        if self.glutReady is None:
+            try:
+                glutInit()
+                self.glutReady = True
+            except Exception as err:
+                gv.gDebugPrint("GLUT font is not available, HUD text disabled: %s" % str(err),
+                               logType=gv.LOG_WARN)
+                self.glutReady = False
+        if not self.glutReady: return
+        glRasterPos2f(x, y)
+        for char in text:
+            glutBitmapCharacter(GLUT_BITMAP_8_BY_13, ord(char))
+    
+    #-----------------------------------------------------------------------------
+    def RefreshIfChanged(self):
+        """ Repaint the canvas only if the scene or the camera changed after the 
+            last paint, so an idle simulator does not redraw every timer tick.
+            With the HUD shown the idle canvas is repainted every HUD_REFRESH_INT.
+            Returns:
+                bool: True if the repaint is requested.
+        """
+        if self.getViewVersion() == self.paintVersion:
+            if not self.showHUD or time.time() - self.paintTime < HUD_REFRESH_INT: return False
+        self.Refresh()
+        return True
+
+    #-----------------------------------------------------------------------------
+    def OnSize(self, event):
+        self.Refresh()
+    
+    def OnMouseDown(self, event):
+        self.last_x, self.last_y = event.GetPosition()
+    
+    def OnMouseMotion(self, event):
+        if event.Dragging() and event.LeftIsDown():
+            x, y = event.GetPosition()
+            dx = x - self.last_x
+            dy = y - self.last_y
+            self.rotation_y += dx
+            self.rotation_x += dy
+            self.last_x = x
+            self.last_y = y
+            self.Refresh()
+    
+    #-----------------------------------------------------------------------------
+    def OnMouseWheel(self, event):
+        delta = event.GetWheelRotation()
+        self.distance -= delta / 120.0
+        self.distance = max(3, min(20, self.distance))
+        self.Refresh()
@@ -32,11 +32,18 @@ PLC_COMM_REP = 'REP'
 PLC_CUBE_POS = 'cubePos'
 PLC_ARM_ANGLE = 'armAngle'
 PLC_GRIPPER_ON = 'gripperOn'
+PLC_ARM_LINEAR = 'armLinear'   # gripper straight line move to a position.
+PLC_ARM_PLAN = 'armPlan'       # collision free planned move to the joint angles.
+PLC_RENDER_STATS = 'renderStats'   # render frame time statistics.
 
 # Arm Parameter Key
 ARM_POS_TAG = 'pos'
 ARM_ANGLE_TAG = 'angles'
 ARM_GRIP_TAG = 'gripper'
+ARM_WRIST_TAG = 'wrist'  # optional wrist angle of the linear move.
+ARM_PLAN_TAG = 'planning'   # planning running flag in the plan state reply.
+ARM_ID_TAG = 'id'       # optional arm index in the request, default arm 0.
+CUBE_ID_TAG = 'cube'    # optional cube index in the cube position request, default cube 0.
 
 # Define all the local utility functions here:
 #-----------------------------------------------------------------------------
@@ -54,6 +61,13 @@ def parseIncomeMsg(msg):
         gv.gDebugPrint(str(err), logType=gv.LOG_ERR)
         return('', '', json.dumps({}))
 
+def getReqIndex(reqDict, key, count):
+    """ Get the arm/cube index from the request dict, raise ValueError if invalid."""
+    idx = reqDict.get(key) if isinstance(reqDict, dict) else None
+    idx = 0 if idx is None else int(idx)
+    if not 0 <= idx < count: raise ValueError("Invalid %s index: %s" % (key, idx))
+    return idx
+
 #-----------------------------------------------------------------------------
 #-----------------------------------------------------------------------------
 class robotArmDataMgr(threading.Thread):
@@ -64,25 +78,62 @@ class robotArmDataMgr(threading.Thread):
         # Init a udp server to accept all the other plc module's data fetch/set request.
         self.server = udpCom.udpServer(None, gv.gUDPPort)
         self.daemon = True
-        # Init the request robot arm angles list 
+        # Init the request robot arm angles list of each arm
         #self.armAngleReq= [gv.gMotoAngle1, gv.gMotoAngle2, gv.gMotoAngle3, gv.gMotoAngle4,
         #                   gv.gMotoAngle5, gv.gMotoAngle6]
-        self.armAngleReq= [25, -10,-50, 0, 0, 20]
+        # One request per arm of the running engine (its arm bases may differ from the config).
+        armNum = gv.iSimEngine.getArmNum() if gv.iSimEngine else len(gv.gArmBaseList)
+        self.armAngleReqs = [[25, -10,-50, 0, 0, 20] for _ in range(armNum)]
+        if gv.iSimEngine:
+            for armId, armAngleReq in enumerate(self.armAngleReqs):
+                gv.iSimEngine.setArmTarget(armAngleReq, armId=armId)
         self.terminate = False
     
     #-----------------------------------------------------------------------------
-    def _fetchCubePos(self):
-        posList = gv.iCubeObj.getPosition()
-        respDict = {ARM_POS_TAG: posList.copy()}
-        return json.dumps(respDict)
+    def _fetchCubePos(self, reqJsonStr):
+        respStr = json.dumps({'result': 'failed'})
+        try:
+            cubes = gv.iSimEngine.scene.cubes
+            reqDict = json.loads(reqJsonStr) if reqJsonStr else {}
+            cubeId = getReqIndex(reqDict, CUBE_ID_TAG, len(cubes))
+            respStr = json.dumps({CUBE_ID_TAG: cubeId, ARM_POS_TAG: cubes[cubeId].getPosition().tolist()})
+        except Exception as err:
+            gv.gDebugPrint("_fetchCubePos() Error: %s" %str(err), logType=gv.LOG_EXCEPT)
+        return respStr
+
+    def _fetchArmAngles(self, reqJsonStr):
+        respStr = json.dumps({'result': 'failed'})
+        try:
+            arms = gv.iSimEngine.scene.arms
+            reqDict = json.loads(reqJsonStr) if reqJsonStr else {}
+            armId = getReqIndex(reqDict, ARM_ID_TAG, len(arms))
+            respStr = json.dumps({ARM_ID_TAG: armId, ARM_ANGLE_TAG: arms[armId].getJointAngles().tolist()})
+        except Exception as err:
+            gv.gDebugPrint("_fetchArmAngles() Error: %s" %str(err), logType=gv.LOG_EXCEPT)
+        return respStr
 
-    def _fetchArmAngles(self):
-        angles = gv.iRobotArmObj.getJointAngles()
-        respDict = {ARM_ANGLE_TAG: angles.copy()}
-        return json.dumps(respDict)
+    def _fetchArmPlan(self, reqJsonStr):
+        respStr = json.dumps({'result': 'failed'})
+        try:
+            reqDict = json.loads(reqJsonStr) if reqJsonStr else {}
+            armId = getReqIndex(reqDict, ARM_ID_TAG, gv.iSimEngine.getArmNum())
+            planning, msg = gv.iSimEngine.getPlanStatus(armId)
+            respStr = json.dumps({ARM_ID_TAG: armId, ARM_PLAN_TAG: planning, 'msg': msg})
+        except Exception as err:
+            gv.gDebugPrint("_fetchArmPlan() Error: %s" %str(err), logType=gv.LOG_EXCEPT)
+        return respStr
+
+    def _fetchRenderStats(self, reqJsonStr):
+        respStr = json.dumps({'result': 'failed'})
+        try:
+            if gv.iRenderStats is not None:
+                respStr = json.dumps(gv.iRenderStats.getStats())
+        except Exception as err:
+            gv.gDebugPrint("_fetchRenderStats() Error: %s" %str(err), logType=gv.LOG_EXCEPT)
+        return respStr
 
-    def getArmAngleRequest(self):
-        return self.armAngleReq
+    def getArmAngleRequest(self, armId=0):
+        return self.armAngleReqs[armId]
 
     #-----------------------------------------------------------------------------
     def setArmAngleParm(self, reqJsonStr):
@@ -92,7 +143,9 @@ class robotArmDataMgr(threading.Thread):
             reqDict = json.loads(reqJsonStr)
             gv.gDebugPrint("setArmAngleParm(): accept motor angles set state: %s" %reqJsonStr, 
                            logType=gv.LOG_INFO)
-            self.armAngleReq = list(reqDict[ARM_ANGLE_TAG]).copy()
+            armId = getReqIndex(reqDict, ARM_ID_TAG, len(self.armAngleReqs))
+            self.armAngleReqs[armId] = list(reqDict[ARM_ANGLE_TAG]).copy()
+            if gv.iSimEngine: gv.iSimEngine.setArmTarget(self.armAngleReqs[armId], armId=armId)
             respStr = json.dumps({'result': 'success'})
         except Exception as err:
             gv.gDebugPrint("setArmAngleParm() Error: %s" %str(err), logType=gv.LOG_EXCEPT)
@@ -106,15 +159,59 @@ class robotArmDataMgr(threading.Thread):
             reqDict = json.loads(reqJsonStr)
             gv.gDebugPrint("setGripperParm(): accept gripper close state : %s" %reqJsonStr, 
                            logType=gv.LOG_INFO)
+            armId = getReqIndex(reqDict, ARM_ID_TAG, gv.iSimEngine.getArmNum())
             if bool(reqDict[ARM_GRIP_TAG]): 
-                gv.iMainFrame.OnGrabCube(None)
+                gv.iSimEngine.grabCube(armId=armId)
             else:
-                gv.iMainFrame.OnReleaseCube(None)
+                gv.iSimEngine.releaseCube(armId=armId)
             respStr = json.dumps({'result': 'success'})
         except Exception as err:
             gv.gDebugPrint("setWeatherParm() Error: %s" %str(err), logType=gv.LOG_EXCEPT)
         return respStr
 
+    #-----------------------------------------------------------------------------
+    def setArmLinearParm(self, reqJsonStr):
+        """ Accept and handle the gripper straight line move request, example:
+            {"id": 0, "pos": [2.0, 1.0, 0.8], "wrist": -90}
+        """
+        respStr = json.dumps({'result': 'failed'})
+        try:
+            reqDict = json.loads(reqJsonStr)
+            gv.gDebugPrint("setArmLinearParm(): accept linear move request: %s" %reqJsonStr, 
+                           logType=gv.LOG_INFO)
+            armId = getReqIndex(reqDict, ARM_ID_TAG, len(self.armAngleReqs))
+            wristAngle = reqDict.get(ARM_WRIST_TAG)
+            pos = [float(v) for v in reqDict[ARM_POS_TAG]][:3]
+            if gv.iSimEngine.moveLinear(pos, armId=armId, 
+                                        wristAngle=None if wristAngle is None else float(wristAngle)):
+                self.armAngleReqs[armId] = gv.iSimEngine.getArmTarget(armId)
+                respStr = json.dumps({'result': 'success', 'time': gv.iSimEngine.getMoveTime(armId)})
+            else:
+                respStr = json.dumps({'result': 'failed', 'msg': gv.iSimEngine.getStatus()})
+        except Exception as err:
+            gv.gDebugPrint("setArmLinearParm() Error: %s" %str(err), logType=gv.LOG_EXCEPT)
+        return respStr
+
+    #-----------------------------------------------------------------------------
+    def setArmPlanParm(self, reqJsonStr):
+        """ Accept and handle the collision free planned move request, example:
+            {"id": 0, "angles": [60, -10, 30, 0, 0, 50]}, the planning runs in the
+            planner worker process, the PLC polls the result with GET armPlan.
+        """
+        respStr = json.dumps({'result': 'failed'})
+        try:
+            reqDict = json.loads(reqJsonStr)
+            gv.gDebugPrint("setArmPlanParm(): accept planned move request: %s" %reqJsonStr, 
+                           logType=gv.LOG_INFO)
+            armId = getReqIndex(reqDict, ARM_ID_TAG, len(self.armAngleReqs))
+            angles = [float(v) for v in reqDict[ARM_ANGLE_TAG]]
+            gv.iSimEngine.planMotion(angles, armId=armId)
+            self.armAngleReqs[armId] = angles
+            respStr = json.dumps({'result': 'success', 'msg': gv.iSimEngine.getStatus()})
+        except Exception as err:
+            gv.gDebugPrint("setArmPlanParm() Error: %s" %str(err), logType=gv.LOG_EXCEPT)
+        return respStr
+
    #-----------------------------------------------------------------------------
     def msgHandler(self, msg):
         """ Function to handle the data-fetch/control request from the PLC modules.
@@ -134,11 +231,17 @@ class robotArmDataMgr(threading.Thread):
             if reqType == PLC_LOGIN:
                 resp = ';'.join((PLC_COMM_REP, PLC_LOGIN, json.dumps({'state':'ready'})))
             elif reqType == PLC_CUBE_POS:
-                respStr = self._fetchCubePos()
+                respStr = self._fetchCubePos(reqJsonStr)
                 resp =';'.join((PLC_COMM_REP, PLC_CUBE_POS, respStr))
             elif reqType == PLC_ARM_ANGLE:
-                respStr = self._fetchArmAngles()
+                respStr = self._fetchArmAngles(reqJsonStr)
                 resp =';'.join((PLC_COMM_REP, PLC_ARM_ANGLE, respStr))
+            elif reqType == PLC_ARM_PLAN:
+                respStr = self._fetchArmPlan(reqJsonStr)
+                resp =';'.join((PLC_COMM_REP, PLC_ARM_PLAN, respStr))
+            elif reqType == PLC_RENDER_STATS:
+                respStr = self._fetchRenderStats(reqJsonStr)
+                resp =';'.join((PLC_COMM_REP, PLC_RENDER_STATS, respStr))
         elif reqKey== PLC_COMM_SET:
             if reqType == PLC_ARM_ANGLE:
                 respStr = self.setArmAngleParm(reqJsonStr)
@@ -146,6 +249,12 @@ class robotArmDataMgr(threading.Thread):
             elif reqType == PLC_GRIPPER_ON:
                 respStr = self.setGripperParm(reqJsonStr)
                 resp =';'.join((PLC_COMM_REP, PLC_COMM_SET, respStr))
+            elif reqType == PLC_ARM_LINEAR:
+                respStr = self.setArmLinearParm(reqJsonStr)
+                resp =';'.join((PLC_COMM_REP, PLC_COMM_SET, respStr))
+            elif reqType == PLC_ARM_PLAN:
+                respStr = self.setArmPlanParm(reqJsonStr)
+                resp =';'.join((PLC_COMM_REP, PLC_COMM_SET, respStr))
             # TODO: Handle all the control request here.
         if isinstance(resp, str): resp = resp.encode('utf-8')
         #gv.gDebugPrint('reply: %s' %str(resp), logType=gv.LOG_INFO)
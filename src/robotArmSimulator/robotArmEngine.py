@@ -0,0 +1,399 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmEngine.py
+#
+# Purpose:     This module is the headless simulation engine of the robot arm
+#              simulator. It owns the work cell scene (robot arms and cubes) and
+#              the fixed time step simulation loop, handles the cube grab/release
+#              and gravity. The module does not import wx/OpenGL so it can run on
+#              the display-less server.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/23
+# Version:     v_0.0.2
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    The engine API keeps the single arm usage (robotArm/cube are the arm 0 and
+    cube 0 of the scene), the arm related functions accept the armId parameter
+    to control the other arms of the work cell.
+
+    Snapshot blob format (little endian), used to reset or fork the simulation
+    from any state without replaying it from the start:
+        header : magic b'RASN', version (uint16), clock step count (uint64),
+                 clock dt (float64), arm number N (uint32), cube number M (uint32).
+        body   : float64 array of the scene armState (N x ARM_BUF_SZ), armTarget
+                 (N x 6), servo velocity (N x 6), armArrived (N), holdIdx (N),
+                 cubeState (M x CUBE_BUF_SZ), cubeOrigin (M x 3), trajectory start
+                 joints (N x 6), trajectory time (N), trajectory kind (N), linear
+                 move goal (N x 4), path move waypoint number (N), followed by
+                 the path moves' joint waypoints (sum of the waypoint number x 6)
+                 (the arm trajectories are rebuilt from them, so the restored
+                 motion is the same).
+
+    Motion planning: planMotion() sends the arm's planning request to the
+    armPlanner worker process and returns at once, the planned path is started
+    in the worker result thread (under the engine lock) if the arm did not get
+    another command during the planning.
+"""
+
+import struct
+import threading
+import numpy as np
+
+import robotArmGlobal as gv
+import robotArmAgents as agents
+import robotArmMotion as motion
+import robotArmRecorder as recorder
+import robotArmScene as scene
+import armCollision as collision
+import armPlanner as planner
+
+SNAP_MAGIC = b'RASN'
+SNAP_VERSION = 5
+SNAP_HEADER = struct.Struct('<4sHQdII')
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class SimulationEngine(object):
+    """ Headless robot arm simulation engine."""
+    def __init__(self, rate=None, speed=None, armBases=None, cubePosList=None):
+        """ Init example: gv.iSimEngine = SimulationEngine(rate=1000, speed=50)
+            Args:
+                rate (float, optional): simulation steps per second. Defaults to
+                    None (use gv.gSimRate).
+                speed (float, optional): simulation time scale, 0 to run as fast as
+                    possible. Defaults to None (use gv.gSimSpeed).
+                armBases (list, optional): arms base positions. Defaults to None
+                    (use gv.gArmBaseList).
+                cubePosList (list, optional): cubes init positions. Defaults to None
+                    (use gv.gCubePosList).
+        """
+        self.scene = scene.SimulationScene(
+            armBases=gv.gArmBaseList if armBases is None else armBases,
+            cubePosList=gv.gCubePosList if cubePosList is None else cubePosList)
+        self.robotArm = self.scene.arms[0]
+        self.cube = self.scene.cubes[0]
+        self.statusMsg = "Ready"
+        self.simLoop = motion.SimulationLoop(self.step, rate=gv.gSimRate if rate is None else rate,
+                                             timeScale=gv.gSimSpeed if speed is None else speed)
+        # Lock the other threads (UI, UDP handler) need to hold to change the state.
+        self.lock = self.simLoop.lock
+        self.recorder = None    # binary state recorder.
+        self.replayer = None    # the recorded state replayer, replace the physics if set.
+        # Motion planner worker process, the per arm request id (a new command of
+        # the arm discards its running request) and the planning finished events.
+        self.planner = planner.PlannerWorker()
+        self.planIds = [0] * self.scene.armNum
+        self.planEvents = [threading.Event() for _ in range(self.scene.armNum)]
+        for event in self.planEvents: event.set()
+        self.planMsgs = [''] * self.scene.armNum   # last planning result of the arms.
+
+    #-----------------------------------------------------------------------------
+    def start(self):
+        """ Start the simulation loop thread."""
+        self.simLoop.start()
+
+    def stop(self):
+        self.simLoop.stop()
+        self.planner.stop()
+
+    def getSimTime(self):
+        return self.simLoop.clock.simTime
+
+    def getSpeed(self):
+        return self.simLoop.clock.timeScale
+
+    def setSpeed(self, speed):
+        """ Set the simulation time scale, 0 to run as fast as possible."""
+        with self.lock:
+            self.simLoop.clock.setTimeScale(speed)
+
+    def getStatus(self):
+        return self.statusMsg
+
+    #-----------------------------------------------------------------------------
+    def step(self, dt):
+        """ Simulation loop call back to integrate the state for dt seconds."""
+        if self.replayer:
+            self.replayer.step(self, dt)
+            return
+        # update all the arms control movement.
+        if not gv.gTestMD:
+            blocked = self.scene.stepArms(dt)
+            if blocked.size: self.statusMsg = "Arm %s stopped by collision" % ','.join(map(str, blocked))
+        self.scene.updateCubes(dt)
+        if self.recorder:
+            self.recorder.record(self.getSimTime() + dt, self.scene.armState[:, :agents.ARM_JOINT_NUM],
+                                 self.scene.armTarget, self.scene.cubeState[:, :3], self.scene.holdIdx)
+
+    def runSteps(self, steps):
+        """ Run the simulation steps directly in the caller thread (used when the
+            loop thread is not started, e.g. the batch runner).
+        """
+        dt = self.simLoop.clock.dt
+        with self.lock:
+            for _ in range(steps):
+                self.step(dt)
+                self.simLoop.clock.addSteps(1)
+
+    def runUntilArrived(self, timeout, armId=None):
+        """ Run the simulation steps until the arm arrives its target.
+            Args:
+                timeout (float): max simulation time (sec) to run.
+                armId (int, optional): arm index, None to wait for all the arms.
+            Returns:
+                bool: True if the arm arrived before the timeout.
+        """
+        batch = max(int(0.01 / self.simLoop.clock.dt), 1)
+        endTime = self.getSimTime() + timeout
+        while not self.isArrived(armId) and self.getSimTime() < endTime:
+            self.runSteps(batch)
+        return self.isArrived(armId)
+
+    #-----------------------------------------------------------------------------
+    def getArmNum(self):
+        return self.scene.armNum
+
+    def getArmTarget(self, armId=0):
+        return self.scene.armTarget[armId].tolist()
+
+    def setArmTarget(self, angles, armId=0):
+        """ Set the arm's 6 joints [theta1-theta5, gripper opening] target angles."""
+        with self.lock:
+            self._cancelPlan(armId)
+            self.scene.armTarget[armId] = angles
+            self.scene.armArrived[armId] = False
+
+    def getMoveTime(self, armId=0):
+        """ Get the remaining time (sec) for the arm to arrive its target."""
+        with self.lock:
+            return self.scene.getMoveTime(armId)
+
+    def moveLinear(self, goalPos, armId=0, wristAngle=None):
+        """ Move the arm's gripper along the straight line to the goal position.
+            Args:
+                goalPos (array-like): gripper goal (x, y, z) in the world.
+                armId (int, optional): arm index. Defaults to 0.
+                wristAngle (float, optional): absolute wrist link angle (degrees)
+                    kept along the path, None to keep the current wrist angle.
+            Returns:
+                bool: False if the path is rejected (unreachable or collision).
+        """
+        with self.lock:
+            planned, self.statusMsg = self.scene.planLinearMove(armId, goalPos, self.simLoop.clock.dt,
+                                                                wristAngle=wristAngle)
+            if planned: self._cancelPlan(armId)
+        gv.gDebugPrint("moveLinear(): arm %s, %s" % (armId, self.statusMsg),
+                       logType=gv.LOG_INFO if planned else gv.LOG_WARN)
+        return planned
+
+    def planMotion(self, goalJoints, armId=0, callback=None, timeout=None):
+        """ Plan a collision free path of the arm to the goal joints in the planner
+            worker process (the function does not wait for the planning), the arm
+            starts moving along the path when the planning finishes.
+            Args:
+                goalJoints (array-like): goal joints [theta1-theta5, gripper].
+                armId (int, optional): arm index. Defaults to 0.
+                callback (function, optional): callback(bool started) called when
+                    the planning finishes. Defaults to None.
+                timeout (float, optional): max planning time (sec). Defaults to
+                    None (armPlanner.PLAN_TIMEOUT).
+        """
+        with self.lock:
+            request = self.scene.getPlanRequest(armId, goalJoints)
+            self._cancelPlan(armId)
+            planId = self.planIds[armId]
+            # The request id is the random seed, so a run plans the same paths.
+            request['seed'] = planId
+            if timeout is not None: request['timeout'] = timeout
+            self.planEvents[armId].clear()
+            self.statusMsg = self.planMsgs[armId] = "Arm %s motion planning..." % armId
+        self.planner.submit(request, lambda path, msg, planTime:
+                            self._onPlanDone(armId, planId, path, msg, planTime, callback))
+
+    def _onPlanDone(self, armId, planId, path, msg, planTime, callback):
+        """ Planner worker result call back, start the planned path move."""
+        started = False
+        with self.lock:
+            if planId != self.planIds[armId]:
+                msg = "Arm %s planning result discarded (new command)" % armId
+            elif path is None:
+                msg = self.statusMsg = "Arm %s planning failed: %s" % (armId, msg)
+            else:
+                started, moveMsg = self.scene.startPathMove(armId, path, self.simLoop.clock.dt)
+                msg = self.statusMsg = "Arm %s planned in %.2f sec (%s), %s" % (armId, planTime, msg, moveMsg)
+            if planId == self.planIds[armId]:
+                self.planMsgs[armId] = msg
+                self.planEvents[armId].set()
+        gv.gDebugPrint("planMotion(): %s" % msg, logType=gv.LOG_INFO if started else gv.LOG_WARN)
+        if callback: callback(started)
+
+    def _cancelPlan(self, armId):
+        """ Discard the arm's running planning request (call with the lock held)."""
+        if self.isPlanning(armId): self.planMsgs[armId] = "Arm %s planning cancelled" % armId
+        self.planIds[armId] += 1
+        self.planEvents[armId].set()
+
+    def isPlanning(self, armId=0):
+        return not self.planEvents[armId].is_set()
+
+    def getPlanStatus(self, armId=0):
+        """ Return the arm's (planning flag, last planning result message)."""
+        return (self.isPlanning(armId), self.planMsgs[armId])
+
+    def waitPlanning(self, armId=0, timeout=None):
+        """ Wait the arm's planning to finish, return False if timeout."""
+        return self.planEvents[armId].wait(timeout)
+
+    def isArrived(self, armId=None):
+        """ Check whether the arm (all the arms if armId is None) is at the target."""
+        if armId is None: return bool(self.scene.armArrived.all())
+        return bool(self.scene.armArrived[armId])
+
+    #-----------------------------------------------------------------------------
+    def grabCube(self, armId=0):
+        """ Try to grab the nearest cube with the arm's gripper, return True if grabbed."""
+        with self.lock:
+            cubeIdx, self.statusMsg = self.scene.grabCube(armId)
+            return cubeIdx != scene.NO_CUBE
+
+    def releaseCube(self, armId=0):
+        with self.lock:
+            self.scene.releaseCube(armId)
+            self.statusMsg = "Cube released"
+
+    def getHeldCube(self, armId=0):
+        return self.scene.getHeldCube(armId)
+
+    #-----------------------------------------------------------------------------
+    def setJointAngles(self, angles, armId=0):
+        """ Set the arm joints directly (local control) and carry the holding cube.
+            Returns:
+                bool: False if the pose is rejected by the collision check.
+        """
+        with self.lock:
+            flag = self.scene.setArmJoints(armId, angles)
+            if flag != collision.COLL_NONE:
+                self.statusMsg = "Collision: %s" % collision.getCollisionName(flag)
+                return False
+            self._cancelPlan(armId)
+            self.scene.updateCubes(0)
+            return True
+
+    #-----------------------------------------------------------------------------
+    def startRecord(self, filePath):
+        """ Start recording every simulation step state to the binary file."""
+        with self.lock:
+            if self.recorder: self.recorder.close()
+            self.recorder = recorder.StateRecorder(filePath, self.scene.armNum, self.scene.cubeNum,
+                                                   dt=self.simLoop.clock.dt)
+        gv.gDebugPrint("Start recording the simulation to %s" % filePath, logType=gv.LOG_INFO)
+
+    def stopRecord(self):
+        with self.lock:
+            if self.recorder:
+                self.recorder.close()
+                gv.gDebugPrint("Recorded %s frames to %s" % (self.recorder.count, self.recorder.filePath),
+                               logType=gv.LOG_INFO)
+            self.recorder = None
+
+    def startReplay(self, filePath, startTime=None):
+        """ Replay the record file (from the startTime) instead of simulating."""
+        replayer = recorder.StateReplayer(filePath)
+        if (replayer.armNum, replayer.cubeNum) != (self.scene.armNum, self.scene.cubeNum):
+            raise ValueError("The record scene (%s arms, %s cubes) does not match the engine."
+                             % (replayer.armNum, replayer.cubeNum))
+        if startTime is not None: replayer.seek(startTime)
+        with self.lock:
+            self.replayer = replayer
+        gv.gDebugPrint("Replay %s, %s frames, time range: %s"
+                       % (filePath, replayer.count, str(replayer.getDuration())), logType=gv.LOG_INFO)
+
+    def stopReplay(self):
+        with self.lock:
+            self.replayer = None
+
+    #-----------------------------------------------------------------------------
+    def snapshot(self):
+        """ Pack the full simulation state into a compact binary blob."""
+        sc = self.scene
+        with self.lock:
+            velocity = sc.armServo.velocity
+            header = SNAP_HEADER.pack(SNAP_MAGIC, SNAP_VERSION, self.simLoop.clock.stepCount,
+                                      self.simLoop.clock.dt, sc.armNum, sc.cubeNum)
+            trajStart, trajTime, trajKind, linearGoal, paths = sc.getTrajectoryState()
+            paths = [np.zeros((0, 6)) if path is None else path for path in paths]
+            body = np.concatenate([sc.armState.ravel(), sc.armTarget.ravel(),
+                                   np.zeros(sc.armNum * 6) if velocity is None else velocity.ravel(),
+                                   sc.armArrived, sc.holdIdx, sc.cubeState.ravel(), sc.cubeOrigin.ravel(),
+                                   trajStart.ravel(), trajTime, trajKind, linearGoal.ravel(),
+                                   [len(path) for path in paths]] + [path.ravel() for path in paths])
+            return header + body.astype('<f8').tobytes()
+
+    def restore(self, blob):
+        """ Restore the full simulation state from the snapshot() blob."""
+        sc = self.scene
+        magic, version, stepCount, dt, armNum, cubeNum = SNAP_HEADER.unpack_from(blob)
+        if magic != SNAP_MAGIC or version != SNAP_VERSION:
+            raise ValueError("Unsupported snapshot: %s v%s" % (str(magic), str(version)))
+        if (armNum, cubeNum) != (sc.armNum, sc.cubeNum):
+            raise ValueError("The snapshot scene (%s arms, %s cubes) does not match the engine."
+                             % (armNum, cubeNum))
+        if dt != self.simLoop.clock.dt:
+            raise ValueError("Snapshot time step %s does not match the engine %s"
+                             % (dt, self.simLoop.clock.dt))
+        sizes = (armNum * agents.ARM_BUF_SZ, armNum * 6, armNum * 6, armNum, armNum,
+                 cubeNum * agents.CUBE_BUF_SZ, cubeNum * 3, armNum * 6, armNum, armNum, armNum * 4, armNum)
+        body = np.frombuffer(blob, dtype='<f8', offset=SNAP_HEADER.size).astype(np.float64)
+        if len(body) < sum(sizes) or len(body) != sum(sizes) + 6 * body[sum(sizes) - armNum:sum(sizes)].sum():
+            raise ValueError("Invalid snapshot size: %s" % len(blob))
+        (armState, target, velocity, arrived, holdIdx, cubeState, cubeOrigin, trajStart, trajTime,
+         trajKind, linearGoal, pathLens, pathData) = np.split(body, np.cumsum(sizes))
+        pathLens = pathLens.astype(np.int64)
+        paths = [path.reshape(-1, 6) if len(path) else None
+                 for path in np.split(pathData, np.cumsum(pathLens[:-1] * 6))]
+        with self.lock:
+            for i in range(armNum): self._cancelPlan(i)
+            sc.armState[:] = armState.reshape(sc.armState.shape)
+            sc.armServo.velocity = velocity.reshape(armNum, 6)
+            sc.armArrived[:] = arrived.astype(bool)
+            sc.cubeState[:] = cubeState.reshape(sc.cubeState.shape)
+            sc.cubeOrigin[:] = cubeOrigin.reshape(sc.cubeOrigin.shape)
+            for j, cube in enumerate(sc.cubes): cube.original_pos = tuple(sc.cubeOrigin[j].tolist())
+            sc.applyState(sc.armState[:, :agents.ARM_JOINT_NUM], target.reshape(armNum, 6),
+                          sc.cubeState[:, :3], holdIdx.astype(np.int64))
+            sc.setTrajectoryState(trajStart.reshape(armNum, 6), trajTime, trajKind.astype(np.int64),
+                                  linearGoal.reshape(armNum, 4), paths, dt)
+            self.simLoop.clock.stepCount = 0
+            self.simLoop.clock.accumulator = 0.0
+            self.simLoop.clock.addSteps(stepCount)
+
+    #-----------------------------------------------------------------------------
+    def saveSnapshot(self, filePath):
+        with open(filePath, 'wb') as fh:
+            fh.write(self.snapshot())
+
+    def loadSnapshot(self, filePath):
+        with open(filePath, 'rb') as fh:
+            self.restore(fh.read())
+
+    @classmethod
+    def fromSnapshot(cls, blob, rate=None, speed=None):
+        """ Create a new (not started) engine forked from the snapshot blob."""
+        _, _, _, _, armNum, cubeNum = SNAP_HEADER.unpack_from(blob)
+        simEngine = cls(rate=rate, speed=speed, armBases=((0.0, 0.0, 0.0),) * armNum,
+                        cubePosList=((0.0, 0.0, 0.0),) * cubeNum)
+        simEngine.restore(blob)
+        return simEngine
+
+    #-----------------------------------------------------------------------------
+    def reset(self):
+        """ Reset the arms and cubes to the init state."""
+        with self.lock:
+            for i in range(self.scene.armNum): self._cancelPlan(i)
+            self.scene.reset()
+            self.statusMsg = "Reset complete"
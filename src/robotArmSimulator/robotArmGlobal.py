@@ -44,6 +44,8 @@ Log.initLogger(gTopDir, 'Logs', APP_NAME[0], APP_NAME[1], historyCnt=100, fPutLo
 import ConfigLoader
 CONFIG_FILE_NAME = 'robotArmSimulatorConfig.txt'
 gConfigPath = os.path.join(dirpath, CONFIG_FILE_NAME)
+# The local config is not tracked, use the template if it is not created.
+if not os.path.exists(gConfigPath): gConfigPath = os.path.join(dirpath, 'robotArmSimulatorConfig_template.txt')
 iConfigLoader = ConfigLoader.ConfigLoader(gConfigPath, mode='r')
 if iConfigLoader is None:
     print("Error: The config file %s is not exist.Program exit!" %str(gConfigPath))
@@ -51,6 +53,8 @@ if iConfigLoader is None:
 CONFIG_DICT = iConfigLoader.getJson()
 UI_TITLE = CONFIG_DICT['UI_TITLE']
 UDP_PORT = 3001 # default UPD channel port.
+SIM_RATE = 1000 # default simulation steps per second.
+SIM_SPEED = 1.0 # default simulation time scale (0 for as fast as possible).
 # Init the log type parameters.
 DEBUG_FLG   = False
 LOG_INFO    = 0
@@ -58,6 +62,21 @@ LOG_WARN    = 1
 LOG_ERR     = 2
 LOG_EXCEPT  = 3
 
+#-----------------------------------------------------------------------------
+def parsePosList(text, default, size=3):
+    """ Parse the config position list string "x1,y1[,z1];x2,y2[,z2]..." to the list
+        of (x, y, z) tuples (z is 0 if not set), return the default if text is empty.
+        The size parameter sets the number of the values of each item (e.g. 6 for
+        the obstacle boxes), the missing values are set to 0.
+    """
+    if not text or not str(text).strip(): return list(default)
+    posList = []
+    for item in str(text).split(';'):
+        if not item.strip(): continue
+        values = [float(v) for v in item.split(',')]
+        posList.append(tuple(values + [0.0] * (size - len(values)))[:size])
+    return posList
+
 #-------<GLOBAL VARIABLES (start with "g")>------------------------------------
 # VARIABLES are the built in data type.
 def gDebugPrint(msg, prt=True, logType=LOG_INFO):
@@ -73,6 +92,8 @@ def gDebugPrint(msg, prt=True, logType=LOG_INFO):
 
 gTestMD = CONFIG_DICT['TEST_MD']
 gUDPPort = int(CONFIG_DICT['UDP_PORT']) if 'UDP_PORT' in CONFIG_DICT.keys() else UDP_PORT
+gSimRate = float(CONFIG_DICT['SIM_RATE']) if 'SIM_RATE' in CONFIG_DICT.keys() else SIM_RATE
+gSimSpeed = float(CONFIG_DICT['SIM_SPEED']) if 'SIM_SPEED' in CONFIG_DICT.keys() else SIM_SPEED
 gCanvasBgColor = (0.15, 0.15, 0.15, 1.0)    # Default canvas background color
 # Arm Link lengths
 gArmBaseLen = 2.0
@@ -87,13 +108,35 @@ gMotoAngle4 = 0.0
 gMotoAngle5 = 0.0
 gMotoAngle6 = 50.0
 gMotorDegSpeed = 5 # The moving speed of the motor.
+# Joints [theta1-theta5, gripper opening] servo max velocity (deg/sec, the default 
+# 16.7 is the same as 5 deg per 300ms) and max acceleration (deg/sec^2).
+gJointMaxVel = (16.7, 16.7, 16.7, 16.7, 16.7, 16.7)
+gJointMaxAcc = (60.0, 60.0, 60.0, 60.0, 60.0, 60.0)
+# Arm move profile: 'trapezoid' or 'quintic' precomputed synchronized joint 
+# trajectory, 'servo' for the independent joint servo model.
+gMotionProfile = str(CONFIG_DICT.get('MOTION_PROFILE', 'trapezoid')).strip().lower()
+# Arm joints angle range (theta1-theta5 in degrees, gripper opening 0-100)
+gArmJointLimits = ((-180, 180), (-90, 90), (-180, 180), (-90, 90), (-180, 180), (0, 100))
+# Workspace reachability map storage folder.
+gWorkspaceDir = os.path.join(gTopDir, 'Workspace')
 # Cube init position in the canvas
 gCubePosX = 2.0
 gCubePosY = 1.0
 gCubePosZ = 0.3
+gCubeGravity = 9.8 # The gravity acceleration of the free falling cube.
+# Work cell scene: the robot arms base positions and the cubes init positions.
+gArmBaseList = parsePosList(CONFIG_DICT.get('ARM_BASES'), [(0.0, 0.0, 0.0)])
+gCubePosList = parsePosList(CONFIG_DICT.get('CUBE_POS'), [(gCubePosX, gCubePosY, gCubePosZ)])
+# Arm collision check (self, ground and the obstacle boxes), the arm stops before
+# the step which will cause the collision.
+gCollisionCheck = bool(CONFIG_DICT.get('COLLISION_CHECK', True))
+gObstacleList = parsePosList(CONFIG_DICT.get('OBSTACLES'), [], size=6)
 
 #-------</GLOBAL VARIABLES (start with "g")>------------------------------------
+iSimEngine = None
 iRobotArmObj = None
 iCubeObj = None
+iWorkspaceMap = None
 iDataManager = None
+iRenderStats = None     # renderer FrameStats, None if the scene is not rendered.
 iMainFrame = None
\ No newline at end of file
@@ -0,0 +1,121 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmHeadless.py
+#
+# Purpose:     This module is the headless (no wxPython/OpenGL) entry point of
+#              the robot arm simulator. It runs the simulation engine and the UDP
+#              data manager so the arm can be controlled by the remote PLC on a
+#              display-less server, CI runner or container. The scene can be
+#              rendered offscreen (OSMesa/EGL) to PNG frames or raw RGB stream.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/23
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Usage:
+        python robotArmHeadless.py [--rate 1000] [--speed 50] [--port 3004] [--interval 5]
+            [--record run.rec | --replay run.rec [--seek 120]]
+            [--render frames/ | --render out.rgb] [--fps 10] [--size 640x480] [--backend osmesa]
+        --speed 0 runs the simulation as fast as possible.
+        --render needs PyOpenGL with the OSMesa or EGL library, the frames are 
+        sampled at --fps wall clock rate.
+"""
+
+import os
+import time
+import argparse
+
+import robotArmGlobal as gv
+import robotArmEngine as engine
+import robotArmDataMgr as dataMgr
+import armWorkspace as workspace
+
+#-----------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description='Run the robot arm simulator without GUI.')
+    parser.add_argument('--rate', type=float, default=gv.gSimRate,
+                        help='simulation steps per second.')
+    parser.add_argument('--speed', type=float, default=gv.gSimSpeed,
+                        help='simulation time scale, 0 to run as fast as possible.')
+    parser.add_argument('--port', type=int, default=gv.gUDPPort,
+                        help='UDP port to accept the PLC request.')
+    parser.add_argument('--record', default=None, help='record the simulation state to the file.')
+    parser.add_argument('--replay', default=None, help='replay the recorded state file.')
+    parser.add_argument('--seek', type=float, default=None, help='replay start simulation time.')
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help='state report interval in seconds, 0 to disable.')
+    parser.add_argument('--render', default=None,
+                        help='render the scene to the PNG frames folder or the .rgb raw stream file.')
+    parser.add_argument('--fps', type=float, default=10.0, help='rendered frames per second.')
+    parser.add_argument('--size', default='640x480', help='rendered frame size WxH.')
+    parser.add_argument('--backend', default='osmesa', choices=('osmesa', 'egl'),
+                        help='offscreen OpenGL platform.')
+    args = parser.parse_args()
+    # Without GUI the arm is always driven by the remote controller.
+    gv.gTestMD = False
+    gv.gUDPPort = args.port
+    gv.iSimEngine = engine.SimulationEngine(rate=args.rate, speed=args.speed)
+    gv.iRobotArmObj = gv.iSimEngine.robotArm
+    gv.iCubeObj = gv.iSimEngine.cube
+    gv.iDataManager = dataMgr.robotArmDataMgr()
+    if args.replay:
+        gv.iSimEngine.startReplay(args.replay, startTime=args.seek)
+    elif args.record:
+        gv.iSimEngine.startRecord(args.record)
+    offRenderer = writer = None
+    if args.render:
+        # The OpenGL platform is selected when the offscreen module is imported.
+        os.environ['PYOPENGL_PLATFORM'] = args.backend
+        import robotArmOffscreen as offscreen
+        width, height = (int(val) for val in args.size.lower().split('x'))
+        # Draw the same reach ring as the GUI from the workspace reachability map.
+        gv.iWorkspaceMap = workspace.WorkspaceMap.loadOrBuild(
+            gv.gWorkspaceDir, (gv.gArmBaseLen, gv.gArmShoulderLen, gv.gArmElbowLen, gv.gArmWristLen),
+            jointLimits=gv.gArmJointLimits[:4], wristAngle=workspace.LEVEL_WRIST)
+        offRenderer = offscreen.OffscreenRenderer(gv.iSimEngine.scene, width, height,
+                                                  gv.iWorkspaceMap.getMaxReach(0.0))
+        gv.iRenderStats = offRenderer.frameStats
+        writer = offscreen.FrameWriter(args.render)
+        writer.start()
+    gv.iSimEngine.start()
+    gv.iDataManager.start()
+    gv.gDebugPrint("Headless robot arm simulator started, rate: %s, speed: %s, UDP port: %s"
+                   % (str(args.rate), str(args.speed), str(args.port)), logType=gv.LOG_INFO)
+    frameInt = 1.0 / args.fps if offRenderer else None
+    nextFrame = time.time()
+    nextReport = nextFrame + args.interval
+    try:
+        while True:
+            now = time.time()
+            if offRenderer and now >= nextFrame:
+                writer.put(offRenderer.renderFrame())
+                # Skip the missed frame slots if the rendering falls behind.
+                nextFrame = max(nextFrame + frameInt, now)
+            if args.interval > 0 and now >= nextReport:
+                msg = "simTime: %.2f, arm: %s, cube: %s, status: %s" % (
+                    gv.iSimEngine.getSimTime(), str(gv.iRobotArmObj.getJointAngles().round(2).tolist()),
+                    str(gv.iCubeObj.getPosition().round(2).tolist()), gv.iSimEngine.getStatus())
+                stats = gv.iRenderStats.getStats() if gv.iRenderStats else None
+                if stats and stats['frames']:
+                    msg += ", render: %.1f fps p50 %.2f ms p99 %.2f ms" % (
+                        stats['fps'], stats['p50Ms'], stats['p99Ms'])
+                gv.gDebugPrint(msg, logType=gv.LOG_INFO)
+                nextReport += args.interval
+            wakeTimes = [nextFrame] if offRenderer else []
+            if args.interval > 0: wakeTimes.append(nextReport)
+            time.sleep(max(min(wakeTimes) - time.time(), 0) if wakeTimes else 1)
+    except KeyboardInterrupt:
+        gv.gDebugPrint("Stop the headless robot arm simulator.", logType=gv.LOG_INFO)
+    gv.iDataManager.stop()
+    gv.iSimEngine.stop()
+    gv.iSimEngine.stopRecord()
+    if offRenderer:
+        writer.stop()
+        offRenderer.close()
+
+#-----------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmMotion.py
+#
+# Purpose:     This module provide the robot arm joints motion model used by the
+#              simulator. The module only depends on numpy so the same motion is
+#              simulated headless or with the wxPython GUI.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/22
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    JointServo steps the 6 joints [theta1-theta5, gripper opening] of one arm
+    (shape (6,)) or many arms (shape (N, 6)) toward their target with numpy
+    array operations:
+        1. The target is clamped to the joint limits.
+        2. The desired velocity is the max velocity which can still stop at the
+           target with the joint's acceleration limit: sqrt(2 * acc * |error|),
+           clamped to the joint's max velocity.
+        3. The velocity change per step is limited by the acceleration.
+        4. A joint arrives (snaps to the target, velocity reset to 0) when the
+           remaining error is smaller than the step distance or the tolerance.
+
+    FixedStepClock + SimulationLoop decouple the simulation from the UI timer:
+    the loop thread measures the real elapsed time, the clock converts it to a 
+    number of fixed dt steps (accumulator method) and the step function is called
+    for each of them, so the motion does not depend on the timer jitter and the 
+    renderer only samples the latest state.
+
+    Time scale: the real elapsed time is multiplied by the clock time scale (e.g.
+    50 runs the simulation 50x faster than the wall clock). Time scale 0 is the
+    unbounded mode, the loop runs the steps as fast as possible. The steps are
+    run in batches of STEP_BATCH and the loop lock is released between batches
+    so the UI/UDP threads are not starved in the fast modes.
+"""
+
+import time
+import threading
+import numpy as np
+
+ARRIVE_TOL = 1e-6   # joint position tolerance to identify arrival.
+DEF_SIM_RATE = 1000 # default simulation rate (steps per second).
+MAX_FRAME_T = 0.25  # max real time (sec) simulated per clock advance, the rest is dropped.
+STEP_BATCH = 1000   # max number of steps run under the lock in one batch.
+UNBOUNDED = 0       # time scale of the "as fast as possible" mode.
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class JointServo(object):
+    """ Vectorized servo model of the robot arm joints."""
+    def __init__(self, maxVel, maxAcc, limits, tolerance=ARRIVE_TOL):
+        """ Init example: servo = JointServo(gv.gJointMaxVel, gv.gJointMaxAcc, gv.gArmJointLimits)
+            Args:
+                maxVel (array-like): (6,) joint max velocity (unit per second).
+                maxAcc (array-like): (6,) joint max acceleration (unit per second^2).
+                limits (array-like): (6, 2) joint (min, max) position limits.
+                tolerance (float, optional): arrival tolerance. Defaults to ARRIVE_TOL.
+        """
+        self.maxVel = np.asarray(maxVel, dtype=np.float64)
+        self.maxAcc = np.asarray(maxAcc, dtype=np.float64)
+        limits = np.asarray(limits, dtype=np.float64)
+        self.posMin = limits[:, 0]
+        self.posMax = limits[:, 1]
+        self.tolerance = float(tolerance)
+        self.velocity = None    # current joints velocity, shape same as the position.
+
+    #-----------------------------------------------------------------------------
+    def reset(self):
+        """ Stop all the joints (clear the velocity state)."""
+        self.velocity = None
+
+    def clampTarget(self, target):
+        return np.clip(np.asarray(target, dtype=np.float64), self.posMin, self.posMax)
+
+    def atTarget(self, pos, target):
+        """ Check whether all the joints are at the (clamped) target positions."""
+        return bool(np.all(np.abs(self.clampTarget(target) - pos) <= self.tolerance))
+
+    #-----------------------------------------------------------------------------
+    def step(self, pos, target, dt):
+        """ Move the joints toward the target for dt seconds.
+            Args:
+                pos (array-like): (6,) or (N, 6) current joint positions.
+                target (array-like): target joint positions (same shape as pos).
+                dt (float): time step in seconds.
+            Returns:
+                tuple: (new joint positions array, bool array of arrived flags
+                    with the shape of pos).
+        """
+        pos = np.asarray(pos, dtype=np.float64)
+        target = self.clampTarget(target)
+        if self.velocity is None or self.velocity.shape != pos.shape:
+            self.velocity = np.zeros(pos.shape)
+        err = target - pos
+        dist = np.abs(err)
+        # Max velocity which can still stop at the target, then acceleration limit.
+        desired = np.sign(err) * np.minimum(np.sqrt(2.0 * self.maxAcc * dist), self.maxVel)
+        dv = self.maxAcc * dt
+        vel = np.clip(desired, self.velocity - dv, self.velocity + dv)
+        stepDist = vel * dt
+        arrived = (dist <= np.abs(stepDist)) | (dist <= self.tolerance)
+        newPos = np.where(arrived, target, pos + stepDist)
+        self.velocity = np.where(arrived, 0.0, vel)
+        return np.clip(newPos, self.posMin, self.posMax), arrived
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class FixedStepClock(object):
+    """ Fixed time step simulation clock with the time accumulator."""
+    def __init__(self, rate=DEF_SIM_RATE, maxFrameT=MAX_FRAME_T, timeScale=1.0):
+        """ Init example: clock = FixedStepClock(rate=1000, timeScale=50)
+            Args:
+                rate (float, optional): simulation steps per second. Defaults to DEF_SIM_RATE.
+                maxFrameT (float, optional): max real time simulated per advance() to 
+                    avoid the "spiral of death" when the host is overloaded.
+                timeScale (float, optional): simulation time / real time ratio, 
+                    UNBOUNDED(0) to run as fast as possible. Defaults to 1.0.
+        """
+        self.dt = 1.0 / float(rate)
+        self.maxFrameT = float(maxFrameT)
+        self.timeScale = 1.0
+        self.setTimeScale(timeScale)
+        self.simTime = 0.0      # simulation time in seconds.
+        self.stepCount = 0
+        self.accumulator = 0.0
+
+    #-----------------------------------------------------------------------------
+    def setTimeScale(self, timeScale):
+        """ Set the simulation time / real time ratio, UNBOUNDED(0) to run as fast
+            as possible.
+        """
+        if timeScale < 0: raise ValueError("Invalid time scale: %s" % str(timeScale))
+        self.timeScale = float(timeScale)
+        self.accumulator = 0.0
+
+    def isUnbounded(self):
+        return self.timeScale == UNBOUNDED
+
+    #-----------------------------------------------------------------------------
+    def advance(self, realDt):
+        """ Add the real elapsed time and return the number of fixed steps to run,
+            a batch of STEP_BATCH steps is returned in the unbounded mode. The
+            caller counts the steps with addSteps() when they are finished.
+        """
+        if self.isUnbounded():
+            steps = STEP_BATCH
+        else:
+            self.accumulator += min(max(realDt, 0.0), self.maxFrameT) * self.timeScale
+            steps = int(self.accumulator / self.dt)
+            self.accumulator -= steps * self.dt
+        return steps
+
+    def addSteps(self, steps):
+        """ Count the finished steps, the simTime is the end time of the last step."""
+        self.stepCount += steps
+        self.simTime = self.stepCount * self.dt
+
+    def getTimeToNextStep(self):
+        """ Get the real time (sec) to wait for the next step."""
+        if self.isUnbounded(): return 0.0
+        return max(self.dt - self.accumulator, 0.0) / self.timeScale
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class SimulationLoop(threading.Thread):
+    """ Thread to run the simulation step function with the fixed step clock."""
+    def __init__(self, stepFunc, rate=DEF_SIM_RATE, timeScale=1.0):
+        """ Init example: simLoop = SimulationLoop(self.simulationStep, rate=gv.gSimRate)
+            Args:
+                stepFunc (function): simulation step function with the dt (sec) parameter.
+                rate (float, optional): simulation steps per second. Defaults to DEF_SIM_RATE.
+                timeScale (float, optional): simulation time / real time ratio, 
+                    UNBOUNDED(0) to run as fast as possible. Defaults to 1.0.
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.stepFunc = stepFunc
+        self.clock = FixedStepClock(rate=rate, timeScale=timeScale)
+        # lock for other threads (UI) to change the simulation state between steps.
+        self.lock = threading.Lock()
+        self.terminate = False
+
+    #-----------------------------------------------------------------------------
+    def run(self):
+        lastT = time.perf_counter()
+        while not self.terminate:
+            now = time.perf_counter()
+            steps = self.clock.advance(now - lastT)
+            lastT = now
+            while steps > 0 and not self.terminate:
+                batch = min(steps, STEP_BATCH)
+                with self.lock:
+                    for _ in range(batch):
+                        self.stepFunc(self.clock.dt)
+                        self.clock.addSteps(1)
+                steps -= batch
+                # yield the GIL to the other threads between the batches.
+                if steps > 0: time.sleep(0)
+            time.sleep(self.clock.getTimeToNextStep())
+
+    #-----------------------------------------------------------------------------
+    def stop(self):
+        self.terminate = True
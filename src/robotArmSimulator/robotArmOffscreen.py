@@ -0,0 +1,229 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmOffscreen.py
+#
+# Purpose:     This module provide the offscreen (no window system/GPU) renderer
+#              of the robot arm simulator. The scene is drawn by the shared
+#              SceneRenderer into an OSMesa or EGL software surface and the
+#              frames are written to PNG image sequence or raw RGB stream file
+#              by a background encoder thread.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/20
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    PyOpenGL selects the GL platform when it is imported the first time, so the
+    PYOPENGL_PLATFORM environment variable ('osmesa' by default or 'egl') is
+    set before this module (and robotArmRenderer) imports OpenGL, the importer
+    can set it to select the backend:
+        osmesa: Mesa software rasterizer into a client memory buffer.
+        egl   : EGL pbuffer surface (Mesa llvmpipe or the GPU driver headless).
+
+    renderFrame() reads the frame back as a (height, width, 3) uint8 array, if
+    the scene render version and the camera are not changed after the last
+    frame, the last frame is returned without redrawing (same as the on-demand
+    repaint of the GUI canvas).
+
+    The FrameWriter thread takes the frames from a bounded queue and writes:
+        <dir>            : PNG files <dir>/frame_000000.png ... (zlib releases
+                           the GIL so the encoding runs parallel to rendering).
+        <file>.rgb       : raw rgb24 stream, all frames appended to the file, it
+                           can be converted to video by:
+                           ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -r FPS -i <file>.rgb out.mp4
+    The render loop is only blocked if the encoder falls FRAME_QUEUE_SZ frames
+    behind, no frame is dropped.
+
+    Usage:
+        os.environ['PYOPENGL_PLATFORM'] = 'egl'   # optional, before the import.
+        import robotArmOffscreen as offscreen
+        offRenderer = offscreen.OffscreenRenderer(gv.iSimEngine.scene, 640, 480, reachRadius)
+        writer = offscreen.FrameWriter('frames/')
+        writer.start()
+        writer.put(offRenderer.renderFrame())
+        writer.stop()
+        offRenderer.close()
+"""
+
+import os
+import time
+import queue
+import ctypes
+import threading
+import numpy as np
+
+# Select the GL platform before the first OpenGL import.
+os.environ.setdefault('PYOPENGL_PLATFORM', 'osmesa')
+
+from OpenGL.GL import *
+import robotArmGlobal as gv
+import robotArmRenderer as renderer
+import pngEncoder
+
+BACKENDS = ('osmesa', 'egl')
+FRAME_QUEUE_SZ = 16     # max frames waiting for the encoder.
+RAW_EXT = '.rgb'        # output file extension of the raw RGB stream.
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class FrameWriter(threading.Thread):
+    """ Background thread to encode and write the rendered frames."""
+    def __init__(self, outPath, queueSize=FRAME_QUEUE_SZ):
+        """ Init example: writer = FrameWriter('frames/')
+            Args:
+                outPath (str): PNG frames folder or the raw RGB stream file path
+                    (with the RAW_EXT extension).
+                queueSize (int, optional): max frames waiting for the encoder.
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.outPath = outPath
+        self.rawMode = outPath.lower().endswith(RAW_EXT)
+        self.frameQueue = queue.Queue(maxsize=queueSize)
+        self.frameCount = 0
+        self.frameShape = None
+        if not self.rawMode: os.makedirs(outPath, exist_ok=True)
+
+    #-----------------------------------------------------------------------------
+    def put(self, frame):
+        """ Queue the (height, width, 3) uint8 frame, block if the queue is full."""
+        self.frameQueue.put(frame)
+
+    def run(self):
+        rawFile = open(self.outPath, 'wb') if self.rawMode else None
+        try:
+            while True:
+                frame = self.frameQueue.get()
+                if frame is None: break
+                if self.frameShape is None: self.frameShape = frame.shape
+                if rawFile:
+                    rawFile.write(frame.tobytes())
+                else:
+                    filePath = os.path.join(self.outPath, 'frame_%06d.png' % self.frameCount)
+                    with open(filePath, 'wb') as fh:
+                        fh.write(pngEncoder.encodePNG(frame))
+                self.frameCount += 1
+        finally:
+            if rawFile: rawFile.close()
+
+    def stop(self):
+        """ Write all the queued frames and stop the thread."""
+        self.frameQueue.put(None)
+        self.join()
+        msg = "FrameWriter: %s frames written to %s" % (self.frameCount, self.outPath)
+        if self.rawMode and self.frameShape:
+            msg += " (rgb24 %sx%s)" % (self.frameShape[1], self.frameShape[0])
+        gv.gDebugPrint(msg, logType=gv.LOG_INFO)
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class OffscreenRenderer(renderer.SceneRenderer):
+    """ Render the scene into the OSMesa or EGL software surface."""
+    def __init__(self, scene, width, height, reachRadius):
+        """ Init example: offRenderer = OffscreenRenderer(gv.iSimEngine.scene, 640, 480, 2.4)
+            Args:
+                scene (robotArmScene.SimulationScene): the scene to draw.
+                width (int): frame width in pixels.
+                height (int): frame height in pixels.
+                reachRadius (float): max radius range the robot can reach on
+                    the ground, the workspace map getMaxReach(0.0) as the GUI.
+        """
+        renderer.SceneRenderer.__init__(self, scene, reachRadius=reachRadius)
+        self.width = int(width)
+        self.height = int(height)
+        self.backend = os.environ['PYOPENGL_PLATFORM']
+        if self.backend not in BACKENDS:
+            raise ValueError("Unsupported offscreen GL platform: %s" % self.backend)
+        self.context = None
+        self._buffer = None     # OSMesa color buffer.
+        self._egl = None        # EGL (display, surface).
+        if self.backend == 'osmesa':
+            self._createOSMesa()
+        else:
+            self._createEGL()
+        self.InitGL()
+        self.frameVersion = None
+        self.lastFrame = None
+        gv.gDebugPrint("Offscreen renderer created: %s %sx%s"
+                       % (self.backend, self.width, self.height), logType=gv.LOG_INFO)
+
+    #-----------------------------------------------------------------------------
+    def _createOSMesa(self):
+        from OpenGL import arrays, osmesa
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not self.context: raise RuntimeError("Failed to create the OSMesa context")
+        self._buffer = arrays.GLubyteArray.zeros((self.height, self.width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.context, self._buffer, GL_UNSIGNED_BYTE,
+                                        self.width, self.height):
+            raise RuntimeError("Failed to make the OSMesa context current")
+
+    def _createEGL(self):
+        from OpenGL import EGL
+        display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("Failed to init the EGL display")
+        configAttribs = (EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                         EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+                         EGL.EGL_DEPTH_SIZE, 24, EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+                         EGL.EGL_NONE)
+        config, configNum = EGL.EGLConfig(), EGL.EGLint()
+        if not EGL.eglChooseConfig(display, (EGL.EGLint * len(configAttribs))(*configAttribs),
+                                   ctypes.pointer(config), 1, ctypes.pointer(configNum)) \
+                or configNum.value < 1:
+            raise RuntimeError("No EGL config supports the OpenGL pbuffer")
+        surfaceAttribs = (EGL.EGL_WIDTH, self.width, EGL.EGL_HEIGHT, self.height, EGL.EGL_NONE)
+        surface = EGL.eglCreatePbufferSurface(display, config,
+                                              (EGL.EGLint * len(surfaceAttribs))(*surfaceAttribs))
+        # The scene is drawn with the fixed function (compatibility) OpenGL API.
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+        if surface == EGL.EGL_NO_SURFACE or self.context == EGL.EGL_NO_CONTEXT:
+            raise RuntimeError("Failed to create the EGL pbuffer context")
+        EGL.eglMakeCurrent(display, surface, surface, self.context)
+        self._egl = (display, surface)
+
+    #-----------------------------------------------------------------------------
+    def renderFrame(self):
+        """ Render the scene and read back the frame.
+            Returns:
+                np.ndarray: (height, width, 3) uint8 RGB frame (top row first), the
+                    last frame is returned if the scene and camera are not changed.
+        """
+        version = self.getViewVersion()
+        if self.lastFrame is not None and version == self.frameVersion: return self.lastFrame
+        self.frameVersion = version
+        self.frameStats.beginFrame()
+        self.RenderScene(self.width, self.height)
+        # The finish and read back time is the swap phase.
+        start = time.perf_counter()
+        glFinish()
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE)
+        # GL rows start from the bottom of the image.
+        frame = np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3)
+        self.lastFrame = np.ascontiguousarray(frame[::-1])
+        self.frameStats.addPhase('swap', start)
+        self.frameStats.endFrame()
+        return self.lastFrame
+
+    #-----------------------------------------------------------------------------
+    def close(self):
+        """ Free the cached meshes and destroy the GL context."""
+        if self.context is None: return
+        self.ReleaseGL()
+        if self.backend == 'osmesa':
+            from OpenGL import osmesa
+            osmesa.OSMesaDestroyContext(self.context)
+        else:
+            from OpenGL import EGL
+            display, surface = self._egl
+            EGL.eglMakeCurrent(display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroySurface(display, surface)
+            EGL.eglDestroyContext(display, self.context)
+            EGL.eglTerminate(display)
+        self.context = None
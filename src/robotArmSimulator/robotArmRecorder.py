@@ -0,0 +1,206 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmRecorder.py
+#
+# Purpose:     This module provide the binary state recorder and the replayer of
+#              the robot arm simulator. The recorder appends one fixed size frame
+#              per simulation step to a preallocated memory-mapped file and the
+#              replayer feeds the recorded frames back to the simulation engine
+#              (headless or with the GUI) with O(log n) seek to any time.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/25
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    Record file layout (little endian):
+        header (HEADER_SZ bytes): magic b'RARC', version, frame size, frame
+            capacity, recorded frame count, simulation dt, scene arm number N
+            and cube number M.
+        frames: capacity x frame records [simTime, joints(N, 6), targets(N, 6),
+            cubes(M, 3), holdIdx(N)], holdIdx is the index of the cube held by
+            the arm (-1 for none).
+    The file is preallocated (sparse) with the capacity frames and doubled when
+    it is full, one frame write is a single record assignment into the mapped
+    pages (the header frame count is synced every COUNT_SYNC frames), the OS 
+    flushes the pages in the background. The file is trimmed to the recorded
+    frames when the recorder is closed.
+
+    The frame simTime increases monotonically, so the replayer seeks a time with
+    a binary search on the memory-mapped simTime column.
+
+    Usage:
+        recorder = StateRecorder('run.rec', armNum=1, cubeNum=1, dt=0.001)
+        recorder.record(simTime, joints, targets, cubePos, holdIdx)
+        replayer = StateReplayer('run.rec')
+        replayer.seek(120.0)
+"""
+
+import os
+import numpy as np
+
+REC_MAGIC = b'RARC'
+REC_VERSION = 3
+HEADER_SZ = 64
+DEF_CAPACITY = 1 << 20  # default preallocated frames (about 17 min at 1 kHz).
+COUNT_SYNC = 1000       # frames interval to update the header frame count.
+
+HEADER_DTYPE = np.dtype([('magic', 'S4'), ('version', '<u2'), ('frameSize', '<u4'),
+                         ('capacity', '<u8'), ('count', '<u8'), ('dt', '<f8'),
+                         ('armNum', '<u4'), ('cubeNum', '<u4')])
+
+#-----------------------------------------------------------------------------
+def makeFrameDtype(armNum, cubeNum):
+    """ Get the frame record dtype of the scene with armNum arms and cubeNum cubes."""
+    return np.dtype([('simTime', '<f8'), ('joints', '<f8', (armNum, 6)), ('targets', '<f8', (armNum, 6)),
+                     ('cube', '<f8', (cubeNum, 3)), ('holdIdx', '<i4', (armNum,))])
+
+#-----------------------------------------------------------------------------
+def readHeader(filePath):
+    """ Read the record file header, raise ValueError if it is not a record file."""
+    header = np.fromfile(filePath, dtype=HEADER_DTYPE, count=1)
+    if header.size != 1 or header['magic'][0] != REC_MAGIC:
+        raise ValueError("%s is not a robot arm record file." % filePath)
+    frameDtype = makeFrameDtype(int(header['armNum'][0]), int(header['cubeNum'][0]))
+    if header['version'][0] != REC_VERSION or header['frameSize'][0] != frameDtype.itemsize:
+        raise ValueError("Unsupported record file version: %s" % str(header['version'][0]))
+    return header[0]
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class StateRecorder(object):
+    """ Append the simulation state frames to a memory-mapped record file."""
+    def __init__(self, filePath, armNum=1, cubeNum=1, dt=0.0, capacity=DEF_CAPACITY):
+        """ Init example: recorder = StateRecorder('run.rec', armNum=2, cubeNum=4, dt=0.001)
+            Args:
+                filePath (str): record file path (overwritten if exists).
+                armNum (int, optional): number of arms in the scene. Defaults to 1.
+                cubeNum (int, optional): number of cubes in the scene. Defaults to 1.
+                dt (float, optional): simulation time step saved in the header.
+                capacity (int, optional): preallocated frames. Defaults to DEF_CAPACITY.
+        """
+        self.filePath = filePath
+        self.frameDtype = makeFrameDtype(armNum, cubeNum)
+        self.count = 0
+        self.capacity = 0
+        self._header = None
+        self._mmap = None
+        self._frames = None     # plain ndarray view of the memmap for the fast write.
+        folder = os.path.dirname(filePath)
+        if folder and not os.path.exists(folder): os.makedirs(folder)
+        with open(filePath, 'wb') as fh:
+            header = np.zeros(1, dtype=HEADER_DTYPE)
+            header[0] = (REC_MAGIC, REC_VERSION, self.frameDtype.itemsize, 0, 0, dt, armNum, cubeNum)
+            fh.write(header.tobytes().ljust(HEADER_SZ, b'\0'))
+        self._resize(max(int(capacity), 1))
+
+    #-----------------------------------------------------------------------------
+    def _resize(self, capacity):
+        """ Resize the file to the capacity frames and remap it."""
+        if self._mmap is not None: self._mmap.flush()
+        self._header = self._mmap = self._frames = None
+        with open(self.filePath, 'r+b') as fh:
+            fh.truncate(HEADER_SZ + capacity * self.frameDtype.itemsize)
+        self.capacity = capacity
+        self._header = np.memmap(self.filePath, dtype=HEADER_DTYPE, mode='r+', shape=(1,))
+        self._header['capacity'] = capacity
+        self._header['count'] = self.count
+        if capacity > 0:
+            self._mmap = np.memmap(self.filePath, dtype=self.frameDtype, mode='r+',
+                                   offset=HEADER_SZ, shape=(capacity,))
+            self._frames = self._mmap.view(np.ndarray)
+
+    #-----------------------------------------------------------------------------
+    def record(self, simTime, joints, targets, cubePos, holdIdx):
+        """ Append one state frame.
+            Args:
+                simTime (float): simulation time in seconds.
+                joints (array-like): (N, 6) joint values [theta1-theta5, gripper opening].
+                targets (array-like): (N, 6) joint target values.
+                cubePos (array-like): (M, 3) cubes (x, y, z) position.
+                holdIdx (array-like): (N,) index of the cube held by the arm, -1 for none.
+        """
+        if self.count == self.capacity: self._resize(self.capacity * 2)
+        self._frames[self.count] = (simTime, joints, targets, cubePos, holdIdx)
+        self.count += 1
+        if self.count % COUNT_SYNC == 0: self._header['count'] = self.count
+
+    #-----------------------------------------------------------------------------
+    def close(self):
+        """ Flush the frames and trim the file to the recorded frames."""
+        if self._header is None: return
+        self._resize(self.count)
+        if self._mmap is not None: self._mmap.flush()
+        self._header.flush()
+        self._header = self._mmap = self._frames = None
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class StateReplayer(object):
+    """ Read the record file and feed the frames back to the simulation engine."""
+    def __init__(self, filePath):
+        """ Init example: replayer = StateReplayer('run.rec')
+            Args:
+                filePath (str): record file path.
+        """
+        self.filePath = filePath
+        header = readHeader(filePath)
+        self.dt = float(header['dt'])
+        self.count = int(header['count'])
+        self.armNum = int(header['armNum'])
+        self.cubeNum = int(header['cubeNum'])
+        frameDtype = makeFrameDtype(self.armNum, self.cubeNum)
+        self.frames = np.memmap(filePath, dtype=frameDtype, mode='r', offset=HEADER_SZ,
+                                shape=(self.count,)) if self.count else np.zeros(0, dtype=frameDtype)
+        self.replayTime = float(self.frames['simTime'][0]) if self.count else 0.0
+        self.cursor = 0
+        self.appliedIdx = -1    # index of the frame applied to the engine.
+        self.finished = self.count == 0
+
+    #-----------------------------------------------------------------------------
+    def getDuration(self):
+        """ Return the (start, end) simulation time of the record."""
+        if not self.count: return (0.0, 0.0)
+        return (float(self.frames['simTime'][0]), float(self.frames['simTime'][-1]))
+
+    def getIndex(self, simTime):
+        """ Get the index of the last frame recorded at or before the simTime."""
+        idx = int(np.searchsorted(self.frames['simTime'], simTime, side='right')) - 1
+        return min(max(idx, 0), max(self.count - 1, 0))
+
+    def getFrame(self, idx):
+        return self.frames[idx]
+
+    #-----------------------------------------------------------------------------
+    def seek(self, simTime):
+        """ Move the replay position to the simTime."""
+        self.replayTime = float(simTime)
+        self.cursor = self.getIndex(simTime)
+        self.appliedIdx = -1
+        self.finished = self.count == 0 or self.replayTime >= self.getDuration()[1]
+
+    def step(self, simEngine, dt):
+        """ Advance the replay time for dt seconds and apply the frame to the engine."""
+        if self.finished: return
+        self.replayTime += dt
+        # The frames are normally recorded every step, so check the next frame
+        # before the binary search.
+        nextIdx = self.cursor + 1
+        if nextIdx < self.count and self.frames['simTime'][nextIdx] <= self.replayTime:
+            lastIdx = nextIdx + 1
+            if lastIdx < self.count and self.frames['simTime'][lastIdx] <= self.replayTime:
+                nextIdx = self.getIndex(self.replayTime)
+            self.cursor = nextIdx
+        if self.cursor != self.appliedIdx:
+            self.applyFrame(simEngine, self.cursor)
+            self.appliedIdx = self.cursor
+        self.finished = self.cursor >= self.count - 1
+
+    def applyFrame(self, simEngine, idx):
+        """ Set the engine scene state to the frame."""
+        frame = self.frames[idx]
+        simEngine.scene.applyState(frame['joints'], frame['targets'], frame['cube'], frame['holdIdx'])
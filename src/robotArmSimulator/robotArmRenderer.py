@@ -0,0 +1,552 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmRenderer.py
+#
+# Purpose:     This module includes the window system independent OpenGL scene
+#              renderer (Env, RobotArm and Cube agents) of the robot arm 
+#              simulator, it is shared by the wxPython canvas and the offscreen
+#              (display-less) renderer.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/20
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    The SceneRenderer only issues the GL calls to the context which is current
+    when it is called, the owner (the wx GLCanvas or the OSMesa/EGL offscreen
+    renderer) creates the context, makes it current and presents the frame.
+
+    The static geometry is compiled to GL display lists by the MeshCache when
+    it is drawn the first time: the ground grid with the axes (in the world
+    frame), the unit box (-1 to 1), and the cylinders (height 1) and spheres
+    tessellated with one reused GLU quadric, keyed by (shape, radius, slices).
+    Each frame only sets the object transform and calls the list, the arm link
+    and joint transforms (translate, rotate and stretch the cylinder to the link
+    length) are calculated with numpy and loaded by one glMultMatrixd() call, so
+    a paint makes a few Python level GL calls per object instead of one per
+    vertex and does not allocate or tessellate the meshes. GL_NORMALIZE keeps
+    the normals of the scaled box correct for the lighting. The owner calls
+    ReleaseGL() to free the cached lists and the quadric before its context is
+    destroyed.
+
+    getViewVersion() returns the scene render version with the camera, so the
+    owner can skip the repaint (or reuse the last frame) if nothing changed.
+
+    Render statistics: the FrameStats keeps the frame and per phase (grid, cube,
+    arm segments, gripper, hud and swap/readback) times of the last STATS_WINDOW
+    frames in numpy ring buffers, getStats() exports the frame time, FPS and the
+    rolling p50/p99 as a dict (thread safe, the data manager reads it). The
+    phase times are the CPU time to issue the GL calls, the GPU (or software
+    rasterizer) work is mostly waited in the swap phase. The toggleable HUD
+    (showHUD) draws the stats as phase bars over the scene, the owner with a 
+    window system overrides DrawHUDText() to add the text.
+"""
+
+import math
+import time
+import threading
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+import robotArmGlobal as gv
+
+MESH_SLICES = 20    # tessellation slices (and sphere stacks) of the cached meshes.
+JOINT_RADIUS = 0.15 # joint sphere radius.
+LINK_RADIUS = 0.1   # arm link cylinder radius.
+LINK_COLORS = ((1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 0))
+# Render statistics and HUD.
+STATS_WINDOW = 240  # frames in the rolling statistics window.
+RENDER_PHASES = ('grid', 'cube', 'arm', 'gripper', 'hud', 'swap')
+PHASE_COLORS = ((0.6, 0.6, 0.6), (1.0, 0.8, 0.0), (0.2, 0.6, 1.0), (0.8, 0.3, 0.8),
+                (0.4, 0.8, 0.4), (1.0, 0.3, 0.3))
+HUD_LINE_H = 16     # HUD text line height in pixels.
+HUD_MS_PX = 8       # HUD phase bar pixels per millisecond.
+
+#-----------------------------------------------------------------------------
+def getSegmentMatrices(starts, ends, radius=1.0):
+    """ Get the transforms which map the cylinder (height 1 along the Z axis)
+        to the segments.
+        Args:
+            starts, ends (np.ndarray): (n, 3) segment end points.
+            radius (float, optional): cylinder radius scale. Defaults to 1.0
+                (the cached mesh already has the segment radius).
+        Returns:
+            list: n column-major (4, 4) glMultMatrixd() matrices, None for the
+                zero length segments.
+    """
+    axis = ends - starts
+    length = np.linalg.norm(axis, axis=1)
+    result = []
+    for start, zAxis, segLen in zip(starts, axis, length):
+        if segLen <= 0:
+            result.append(None)
+            continue
+        zAxis = zAxis / segLen
+        # Same frame as glRotatef(atan2(dy, dx), Z) then glRotatef(acos(dz), Y).
+        azimuth = math.atan2(zAxis[1], zAxis[0])
+        xAxis = np.array((zAxis[2] * math.cos(azimuth), zAxis[2] * math.sin(azimuth),
+                          -math.hypot(zAxis[0], zAxis[1])))
+        yAxis = np.cross(zAxis, xAxis)
+        matrix = np.zeros((4, 4))
+        matrix[0, :3] = xAxis * radius
+        matrix[1, :3] = yAxis * radius
+        matrix[2, :3] = zAxis * segLen
+        matrix[3, :3] = start
+        matrix[3, 3] = 1.0
+        result.append(matrix)
+    return result
+
+def getArmMatrices(positions):
+    """ Get the link cylinder and the joint sphere (at the link end) transforms
+        of the arm joint positions (5, 3).
+    """
+    linkMats = getSegmentMatrices(positions[:-1], positions[1:])
+    jointMats = []
+    for pos in positions[1:]:
+        matrix = np.identity(4)
+        matrix[3, :3] = pos
+        jointMats.append(matrix)
+    return (linkMats, jointMats)
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class MeshCache(object):
+    """ Display list cache of the meshes keyed by (shape, radius, slices), the
+        meshes are built once in the current GL context and reused by all the
+        frames until release() is called.
+    """
+    def __init__(self):
+        self.lists = {}
+        self.quadric = None     # GLU quadric reused by all the tessellations.
+
+    def getList(self, key, emitFunc):
+        """ Return the display list of the key, compile it with the emitFunc() if
+            it is not cached (needs the current GL context).
+        """
+        listId = self.lists.get(key)
+        if listId is None:
+            listId = glGenLists(1)
+            glNewList(listId, GL_COMPILE)
+            emitFunc()
+            glEndList()
+            self.lists[key] = listId
+        return listId
+
+    def _getQuadric(self):
+        if self.quadric is None: self.quadric = gluNewQuadric()
+        return self.quadric
+
+    def getCylinder(self, radius, slices=MESH_SLICES):
+        """ Return the display list of the cylinder (height 1 along the Z axis)."""
+        return self.getList(('cylinder', float(radius), slices), lambda:
+                            gluCylinder(self._getQuadric(), radius, radius, 1.0, slices, 1))
+
+    def getSphere(self, radius, slices=MESH_SLICES):
+        return self.getList(('sphere', float(radius), slices), lambda:
+                            gluSphere(self._getQuadric(), radius, slices, slices))
+
+    def release(self):
+        """ Free all the cached display lists and the quadric (needs the current
+            GL context).
+        """
+        for listId in self.lists.values(): glDeleteLists(listId, 1)
+        self.lists = {}
+        if self.quadric is not None: gluDeleteQuadric(self.quadric)
+        self.quadric = None
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class FrameStats(object):
+    """ Rolling frame time statistics of the render loop."""
+    def __init__(self, window=STATS_WINDOW):
+        self.window = window
+        self.frameCount = 0
+        self.phaseIdx = dict((name, i) for i, name in enumerate(RENDER_PHASES))
+        # Ring buffers of the frame time, the phase times and the frame end time (sec).
+        self.frameTimes = np.zeros(window)
+        self.phaseTimes = np.zeros((window, len(RENDER_PHASES)))
+        self.endTimes = np.zeros(window)
+        self._current = np.zeros(len(RENDER_PHASES))
+        self._frameStart = 0.0
+        self._lock = threading.Lock()
+
+    #-----------------------------------------------------------------------------
+    def beginFrame(self):
+        """ Start timing a new frame, returns the start time."""
+        self._current[:] = 0.0
+        self._frameStart = time.perf_counter()
+        return self._frameStart
+
+    def addPhase(self, name, start):
+        """ Add the time from the start to now to the phase of the current frame.
+            Returns:
+                float: now, the start time of the next phase.
+        """
+        now = time.perf_counter()
+        self._current[self.phaseIdx[name]] += now - start
+        return now
+
+    def endFrame(self):
+        now = time.perf_counter()
+        with self._lock:
+            slot = self.frameCount % self.window
+            self.frameTimes[slot] = now - self._frameStart
+            self.phaseTimes[slot] = self._current
+            self.endTimes[slot] = now
+            self.frameCount += 1
+
+    #-----------------------------------------------------------------------------
+    def getStats(self):
+        """ Get the render statistics of the frames in the rolling window.
+            Returns:
+                dict: {'frames': total frames, 'frameMs': last frame time, 'fps',
+                    'p50Ms', 'p99Ms', 'maxMs', 'phases': {phase: {'lastMs', 
+                    'meanMs', 'p50Ms', 'p99Ms'}}}, times in milliseconds.
+        """
+        with self._lock:
+            num = min(self.frameCount, self.window)
+            if num == 0: return {'frames': 0}
+            last = (self.frameCount - 1) % self.window
+            frameTimes = self.frameTimes[:num] * 1000
+            phaseTimes = self.phaseTimes[:num] * 1000
+            lastPhases = self.phaseTimes[last] * 1000
+            span = self.endTimes[last] - self.endTimes[:num].min()
+            stats = {'frames': self.frameCount, 'frameMs': float(frameTimes[last])}
+        stats['fps'] = float((num - 1) / span) if span > 0 else 0.0
+        stats['p50Ms'], stats['p99Ms'] = (float(v) for v in np.percentile(frameTimes, (50, 99)))
+        stats['maxMs'] = float(frameTimes.max())
+        p50, p99 = np.percentile(phaseTimes, (50, 99), axis=0)
+        means = phaseTimes.mean(axis=0)
+        stats['phases'] = dict((name, {'lastMs': float(lastPhases[i]), 'meanMs': float(means[i]),
+                                       'p50Ms': float(p50[i]), 'p99Ms': float(p99[i])})
+                               for i, name in enumerate(RENDER_PHASES))
+        return stats
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class SceneRenderer(object):
+    """ Draw the work cell robot arms and cubes with the current GL context."""
+    def __init__(self, scene, reachRadius=2.4):
+        """ Init example: renderer = SceneRenderer(gv.iSimEngine.scene)
+            Args:
+                scene (robotArmScene.SimulationScene): the scene to draw.
+                reachRadius (float, optional): max radius range the robot can 
+                    reach on the ground. Defaults to 2.4.
+        """
+        self.scene = scene
+        self.init = False
+        self.rotation_x = -50
+        self.rotation_y = -80
+        self.distance = 10 # cam distance to the origin (0, 0)
+        self.reachRadius = reachRadius
+        self.meshCache = MeshCache()
+        self.frameStats = FrameStats()
+        self.showHUD = False
+
+    #-----------------------------------------------------------------------------
+    def InitGL(self):
+        """ Init the openGL scene state of the current context."""
+        #glClearColor(0.95, 0.95, 0.95, 1.0)
+        glClearColor(gv.gCanvasBgColor[0], gv.gCanvasBgColor[1],gv.gCanvasBgColor[2], gv.gCanvasBgColor[3])
+        glEnable(GL_DEPTH_TEST)
+        glEnable(GL_LIGHTING)
+        glEnable(GL_LIGHT0)
+        glEnable(GL_COLOR_MATERIAL)
+        glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
+        # Light position
+        glLightfv(GL_LIGHT0, GL_POSITION, [5, 5, 10, 1])
+        glLightfv(GL_LIGHT0, GL_AMBIENT, [0.3, 0.3, 0.3, 1])
+        glLightfv(GL_LIGHT0, GL_DIFFUSE, [0.8, 0.8, 0.8, 1])
+        # The unit box is scaled by the object transform.
+        glEnable(GL_NORMALIZE)
+        self.init = True
+
+    def ReleaseGL(self):
+        """ Free the cached meshes, the context must be current."""
+        if self.init: self.meshCache.release()
+        self.init = False
+
+    #-----------------------------------------------------------------------------
+    def RenderScene(self, width, height):
+        """ Clear the frame buffer and draw the scene from the camera with the 
+            viewport size (width, height), the caller presents the frame.
+        """
+        glViewport(0, 0, width, height)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(45, width / height, 0.1, 100.0)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        gluLookAt(0, 0, self.distance, 0, 0, 0, 0, 1, 0)
+        glRotatef(self.rotation_x, 1, 0, 0)
+        glRotatef(self.rotation_y, 0, 0, 1)
+        self.DrawScene()
+        if self.showHUD:
+            start = time.perf_counter()
+            self.DrawHUD(width, height)
+            self.frameStats.addPhase('hud', start)
+
+    #-----------------------------------------------------------------------------
+    def getViewVersion(self):
+        """ Get the version of all the drawn content: the scene state and the camera."""
+        return (self.scene.getRenderVersion(), self.rotation_x, self.rotation_y, self.distance)
+
+    #-----------------------------------------------------------------------------
+    def DrawScene(self):
+        """ Draw the scene with all the objects. """
+        start = time.perf_counter()
+        self.DrawGrid()
+        start = self.frameStats.addPhase('grid', start)
+        heldCubes = set(int(idx) for idx in self.scene.holdIdx if idx >= 0)
+        for idx, cube in enumerate(self.scene.cubes):
+            self.DrawCube(cube, idx in heldCubes)
+        self.frameStats.addPhase('cube', start)
+        for robot in self.scene.arms:
+            self.DrawArm(robot)
+
+    #-----------------------------------------------------------------------------
+    def DrawArm(self, robot):
+        """ Draw one robot arm. """
+        start = time.perf_counter()
+        positions = robot.forwardKinematics()
+        # Draw base area identify the max range the robot can reach
+        glPushMatrix()
+        glColor3f(0, 0.8, 0)
+        glTranslatef(*robot.getBasePosition())
+        # Draw the area the robot can reach
+        self.DrawCylinder(self.reachRadius, 0.05)
+        glPopMatrix()
+        # Draw arm segments and the joint spheres at their end.
+        linkMats, jointMats = getArmMatrices(positions)
+        cylinderId = self.meshCache.getCylinder(LINK_RADIUS)
+        sphereId = self.meshCache.getSphere(JOINT_RADIUS)
+        for color, linkMat, jointMat in zip(LINK_COLORS, linkMats, jointMats):
+            glColor3f(*color)
+            for matrix, listId in ((linkMat, cylinderId), (jointMat, sphereId)):
+                if matrix is None: continue
+                glPushMatrix()
+                glMultMatrixd(matrix)
+                glCallList(listId)
+                glPopMatrix()
+        start = self.frameStats.addPhase('arm', start)
+        # Draw gripper
+        self.DrawGripper(robot, positions[-1])
+        self.frameStats.addPhase('gripper', start)
+
+    #-----------------------------------------------------------------------------
+    def DrawHUD(self, width, height):
+        """ Draw the render statistics overlay at the top left corner: the last 
+            frame phase time bars with the rolling frame time statistics text.
+        """
+        stats = self.frameStats.getStats()
+        if not stats['frames']: return
+        glPushAttrib(GL_ENABLE_BIT | GL_CURRENT_BIT)
+        glDisable(GL_LIGHTING)
+        glDisable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(0, width, 0, height, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        # Background panel, 2 stats lines and 1 line per phase.
+        top = height - 5
+        bottom = top - HUD_LINE_H * (len(RENDER_PHASES) + 2) - 5
+        glColor4f(0.0, 0.0, 0.0, 0.6)
+        glRectf(5, bottom, 300, top)
+        glColor3f(1, 1, 1)
+        y = top - HUD_LINE_H
+        self.DrawHUDText(10, y + 4, "Frame %.2f ms  FPS %.1f" % (stats['frameMs'], stats['fps']))
+        y -= HUD_LINE_H
+        self.DrawHUDText(10, y + 4, "p50 %.2f  p99 %.2f  max %.2f ms"
+                         % (stats['p50Ms'], stats['p99Ms'], stats['maxMs']))
+        for name, color in zip(RENDER_PHASES, PHASE_COLORS):
+            y -= HUD_LINE_H
+            phase = stats['phases'][name]
+            glColor3f(*color)
+            barLen = min(phase['lastMs'] * HUD_MS_PX, 140)
+            glRectf(150, y + 3, 150 + max(barLen, 1), y + HUD_LINE_H - 3)
+            glColor3f(1, 1, 1)
+            self.DrawHUDText(10, y + 4, "%-7s %5.2f / %5.2f" % (name, phase['lastMs'], phase['p99Ms']))
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopAttrib()
+
+    def DrawHUDText(self, x, y, text):
+        """ Draw the HUD text at the window position (x, y), the renderer without 
+            a font (such as the offscreen context) only draws the phase bars.
+        """
+        return
+    
+    #-----------------------------------------------------------------------------
+    def DrawGrid(self):
+        """Draw the ground grid."""
+        glCallList(self.meshCache.getList(('grid', 0.0, 0), self._emitGrid))
+
+    def _emitGrid(self):
+        """ Emit the ground grid, markers and axes vertices."""
+        glDisable(GL_LIGHTING)
+        glColor3f(0.7, 0.7, 0.7)
+        glBegin(GL_LINES)
+        for i in range(-5, 6):
+            glVertex3f(i, -5, 0)
+            glVertex3f(i, 5, 0)
+            glVertex3f(-5, i, 0)
+            glVertex3f(5, i, 0)
+        glEnd()
+        # Draw coordinate markers at grid intersections
+        glPointSize(5)
+        glBegin(GL_POINTS)
+        glColor3f(0.5, 0.5, 0.5)
+        for x in range(-5, 6, 2):
+            for y in range(-5, 6, 2):
+                if x == 0 and y == 0:
+                    glColor3f(0.0, 0.0, 0.0)  # Black for origin
+                    glVertex3f(x, y, 0.02)
+                    glColor3f(0.5, 0.5, 0.5)
+                else:
+                    glVertex3f(x, y, 0.02)
+        glEnd()
+        glPointSize(1)
+        # Draw axes
+        glLineWidth(5)
+        glBegin(GL_LINES)
+        # X axis - red
+        glColor3f(1, 0, 0)
+        glVertex3f(0, 0, 0)
+        glVertex3f(2, 0, 0)
+        # Y axis - green
+        glColor3f(0, 1, 0)
+        glVertex3f(0, 0, 0)
+        glVertex3f(0, 2, 0)
+        # Z axis - blue
+        glColor3f(0, 0, 1)
+        glVertex3f(0, 0, 0)
+        glVertex3f(0, 0, 2)
+        glEnd()
+        glLineWidth(1)
+        glEnable(GL_LIGHTING)
+    
+    #-----------------------------------------------------------------------------
+    def DrawCube(self, cube, held):
+        glPushMatrix()
+        glTranslatef(cube.x, cube.y, cube.z)
+        # Different color based on whether it's being held
+        if held:
+            glColor3f(1.0, 0.5, 0.0)  # Orange when held
+        else:
+            glColor3f(1.0, 0.8, 0.0)  # Yellow when free
+        s = cube.size / 2
+        glScalef(s, s, s)
+        self.DrawBox()
+        glPopMatrix()
+    
+    #-----------------------------------------------------------------------------
+    def DrawGripper(self, robot, position):
+        glPushMatrix()
+        glTranslatef(*position)
+        # Get gripper orientation
+        yaw, pitch, roll = robot.getGripperOrientation()
+        #print((yaw, pitch, roll))
+        glRotatef(yaw, 0, 0, 1)
+        glRotatef(pitch, 0, 1, 0)
+        glRotatef(roll, 0, 0, 1)  # Add roll rotation
+        # Draw gripper base
+        glColor3f(0.3, 0.3, 0.3)
+        self.DrawCylinder(0.08, 0.15)
+        # Calculate gripper finger opening
+        opening = robot.gripper_open / 100.0 * 0.2  # Max 0.2 units
+        # Draw gripper fingers
+        glColor3f(0.2, 0.2, 0.2)
+        # Left finger
+        glPushMatrix()
+        glTranslatef(-opening, 0, 0.15)
+        glScalef(0.03, 0.03, 0.2)
+        self.DrawBox()
+        glPopMatrix()
+        # Right finger
+        glPushMatrix()
+        glTranslatef(opening, 0, 0.15)
+        glScalef(0.03, 0.03, 0.2)
+        self.DrawBox()
+        glPopMatrix()
+        # Draw gripper palm to the main scene
+        glPopMatrix()
+    
+    #-----------------------------------------------------------------------------
+    def DrawBox(self):
+        """ Draw the unit box (-1 to 1 in all the axes)."""
+        glCallList(self.meshCache.getList(('box', 1.0, 0), self._emitBox))
+
+    def _emitBox(self):
+        glBegin(GL_QUADS)
+        # Front
+        glNormal3f(0, 0, 1)
+        glVertex3f(-1, -1, 1)
+        glVertex3f(1, -1, 1)
+        glVertex3f(1, 1, 1)
+        glVertex3f(-1, 1, 1)
+        # Back
+        glNormal3f(0, 0, -1)
+        glVertex3f(-1, -1, -1)
+        glVertex3f(-1, 1, -1)
+        glVertex3f(1, 1, -1)
+        glVertex3f(1, -1, -1)
+        # Top
+        glNormal3f(0, 1, 0)
+        glVertex3f(-1, 1, -1)
+        glVertex3f(-1, 1, 1)
+        glVertex3f(1, 1, 1)
+        glVertex3f(1, 1, -1)
+        # Bottom
+        glNormal3f(0, -1, 0)
+        glVertex3f(-1, -1, -1)
+        glVertex3f(1, -1, -1)
+        glVertex3f(1, -1, 1)
+        glVertex3f(-1, -1, 1)
+        # Right
+        glNormal3f(1, 0, 0)
+        glVertex3f(1, -1, -1)
+        glVertex3f(1, 1, -1)
+        glVertex3f(1, 1, 1)
+        glVertex3f(1, -1, 1)
+        # Left
+        glNormal3f(-1, 0, 0)
+        glVertex3f(-1, -1, -1)
+        glVertex3f(-1, -1, 1)
+        glVertex3f(-1, 1, 1)
+        glVertex3f(-1, 1, -1)
+        glEnd()
+    
+    #-----------------------------------------------------------------------------
+    def DrawSegment(self, p1, p2, radius):
+        """Draw the arm segment"""
+        matrix = getSegmentMatrices(np.array([p1]), np.array([p2]))[0]
+        if matrix is None: return
+        glPushMatrix()
+        glMultMatrixd(matrix)
+        glCallList(self.meshCache.getCylinder(radius))
+        glPopMatrix()
+    
+    #-----------------------------------------------------------------------------
+    def DrawCylinder(self, radius, height):
+        """ Draw the cylinder along the Z axis from the current origin."""
+        glPushMatrix()
+        # Only stretch the Z axis, the side normals are not changed.
+        glScalef(1.0, 1.0, height)
+        glCallList(self.meshCache.getCylinder(radius))
+        glPopMatrix()
+    
+    #-----------------------------------------------------------------------------
+    def DrawSphere(self, radius):
+        glCallList(self.meshCache.getSphere(radius))
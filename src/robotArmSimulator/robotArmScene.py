@@ -0,0 +1,479 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmScene.py
+#
+# Purpose:     This module provide the simulation scene of the robot arm work
+#              cell with N robot arms and M cubes. The state of all the arms and
+#              cubes are stored as numpy structure-of-arrays and the agents are
+#              row views of them, so the motion, gravity and grab checks of all
+#              the bodies are calculated in one numpy pass per simulation step.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/26
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+""" Program Design:
+
+    Scene arrays:
+        armState    : (N, ARM_BUF_SZ) [theta1-theta5, gripper, l1-l4, baseXYZ]
+        armTarget   : (N, 6) joint target values set by the controller.
+        armArrived  : (N,) bool arm at its target flags.
+        holdIdx     : (N,) int index of the cube held by the arm, -1 for none.
+        cubeState   : (M, CUBE_BUF_SZ) [x, y, z, velocityZ, size]
+        cubeOrigin  : (M, 3) cube init positions (for reset).
+    The cube positions are indexed by a spatial hash (cell size GRAB_DIS) which
+    is updated with the cubes moved in the step (falling or carried), so the
+    grab check only looks at the cubes near the gripper.
+    Arm motion: with the trapezoid/quintic motion profile an arm moving to a new
+    target gets a precomputed JointTrajectory (all the joints synchronized) and
+    the step samples it with the arm's elapsed move time (trajTime), with the
+    servo profile all the arms are stepped by the JointServo model. A Cartesian
+    straight line move (planLinearMove) gives the arm a PathTrajectory through
+    the batched IK waypoints, a planned collision free joint path from the
+    armPlanner (startPathMove) gives it a PathTrajectory through the path, they
+    are followed with all the motion profiles.
+    The moved arms' new poses are checked with the capsule collision model in
+    one batch, an arm which would collide (self, ground or obstacle box) is
+    stopped at its current pose and the target is dropped. After a check the
+    arm gets a clearance budget which every step reduces by the links motion
+    bound, the full check is only done when the budget runs out (so an arm far
+    from the obstacles is not checked every step).
+    scene.arms[i] / scene.cubes[j] are the RobotArm / Cube agents using the row
+    i / j of the arrays as their state buffer, so the UI and the UDP handler
+    can still use the per-object API.
+"""
+
+import numpy as np
+
+import robotArmGlobal as gv
+import robotArmAgents as agents
+import robotArmMotion as motion
+import armKinematics as kinematics
+import spatialHash
+import armCollision as collision
+import armTrajectory as trajectory
+import armCartesian as cartesian
+
+GRAB_DIS = 1            # max distance between the gripper and cube to grab it.
+GRAB_OPENING = 30       # max gripper opening to grab the cube.
+CUBE_OFFSET = 0.3       # cube center offset under the gripper when holding.
+NO_CUBE = -1
+PROFILE_SERVO = 'servo'
+NO_TRAJ = -1.0        # trajTime of the arm without trajectory.
+PATH_START_TOL = 1e-3 # max joint distance between the arm and the start of a planned path.
+TRAJ_JOINT = 0        # trajectory kinds: joint space move to the target.
+TRAJ_LINEAR = 1       # Cartesian straight line move.
+TRAJ_PATH = 2         # joint path move (from the motion planner).
+
+#-----------------------------------------------------------------------------
+#-----------------------------------------------------------------------------
+class SimulationScene(object):
+    """ Work cell scene with N robot arms and M cubes."""
+    def __init__(self, armBases=((0.0, 0.0, 0.0),), cubePosList=((2.0, 1.0, 0.3),), cubeSize=0.3):
+        """ Init example: scene = SimulationScene(armBases=[(0, 0, 0), (6, 0, 0)])
+            Args:
+                armBases (list, optional): arms base (x, y, z) positions.
+                cubePosList (list, optional): cubes init (x, y, z) positions.
+                cubeSize (float, optional): cube size. Defaults to 0.3.
+        """
+        self.armNum = len(armBases)
+        self.cubeNum = len(cubePosList)
+        self.armState = np.zeros((self.armNum, agents.ARM_BUF_SZ))
+        self.cubeState = np.zeros((self.cubeNum, agents.CUBE_BUF_SZ))
+        self.arms = [agents.RobotArm(buffer=self.armState[i], basePos=armBases[i])
+                     for i in range(self.armNum)]
+        self.cubes = [agents.Cube(x, y, z, size=cubeSize, buffer=self.cubeState[j])
+                      for j, (x, y, z) in enumerate(cubePosList)]
+        self.cubeOrigin = np.array(cubePosList, dtype=np.float64).reshape(self.cubeNum, 3)
+        self.armTarget = self.armState[:, :agents.ARM_JOINT_NUM].copy()
+        self.armArrived = np.ones(self.armNum, dtype=bool)
+        self.holdIdx = np.full(self.armNum, NO_CUBE, dtype=np.int64)
+        self.armServo = motion.JointServo(gv.gJointMaxVel, gv.gJointMaxAcc, gv.gArmJointLimits)
+        self.cubeIndex = spatialHash.SpatialHash(GRAB_DIS, self.cubeState[:, :3])
+        self.collisionCheck = gv.gCollisionCheck
+        self.obstacles = np.asarray(gv.gObstacleList, dtype=np.float64).reshape(-1, 6)
+        self.collisionBudget = np.full(self.armNum, -np.inf)   # -inf: check next move.
+        self.motionProfile = gv.gMotionProfile
+        if self.motionProfile not in trajectory.PROFILES + (PROFILE_SERVO,):
+            raise ValueError("Unknown motion profile: %s" % str(self.motionProfile))
+        self.armTraj = [None] * self.armNum
+        self.trajTime = np.full(self.armNum, NO_TRAJ)
+        self.trajKind = np.full(self.armNum, TRAJ_JOINT)
+        self.linearGoal = np.zeros((self.armNum, 4))  # linear move tool goal (x, y, z) and wrist angle.
+        self.armPath = [None] * self.armNum          # (k, 6) joint path of the TRAJ_PATH moves.
+
+    #-----------------------------------------------------------------------------
+    def getGripperPositions(self):
+        """ Return the (N, 3) gripper positions of all the arms in the world."""
+        linkLens = self.armState[:, agents.ARM_LINK_IDX:agents.ARM_BASE_IDX].T
+        posArr = kinematics.forwardKinematicsBatch(self.armState[:, :agents.ARM_JOINT_NUM], linkLens)
+        return posArr[:, -1] + self.armState[:, agents.ARM_BASE_IDX:]
+
+    #-----------------------------------------------------------------------------
+    def getLinkLens(self, armIdx):
+        """ Return the link lengths (l1, l2, l3, l4) tuple of (k,) arrays of the arms."""
+        return tuple(self.armState[armIdx, agents.ARM_LINK_IDX:agents.ARM_BASE_IDX].T)
+
+    def checkCollision(self, armIdx, joints, clearance=False):
+        """ Check the collision of the arms at the joint poses.
+            Args:
+                armIdx (array-like): (k,) arm indices.
+                joints (array-like): (k, 6) joint values of the arms.
+                clearance (bool, optional): also return the clearance of the poses.
+            Returns:
+                np.ndarray: (k,) uint8 armCollision flags (and the clearance).
+        """
+        return collision.checkCollisionBatch(joints, self.getLinkLens(armIdx),
+                                             basePos=self.armState[armIdx, agents.ARM_BASE_IDX:],
+                                             boxes=self.obstacles, clearance=clearance)
+
+    def getNewCollision(self, armIdx, joints):
+        """ Check the collision flags the joint poses add to the arms' current
+            poses (a pose already in collision can still move out of it).
+            Returns:
+                tuple: ((k,) new collision flags, (k,) clearance of the poses).
+        """
+        armIdx = np.asarray(armIdx, dtype=np.int64).reshape(-1)
+        newFlags, margin = self.checkCollision(armIdx, joints, clearance=True)
+        hit = np.flatnonzero(newFlags)
+        if hit.size:
+            oldFlags = self.checkCollision(armIdx[hit], self.armState[armIdx[hit], :agents.ARM_JOINT_NUM])
+            newFlags[hit] &= ~oldFlags
+        return (newFlags, margin)
+
+    #-----------------------------------------------------------------------------
+    def stepArms(self, dt):
+        """ Move all the arms toward their target with the servo model for dt seconds.
+            Returns:
+                np.ndarray: indices of the arms stopped by the collision check.
+        """
+        blocked = np.zeros(0, dtype=np.int64)
+        if self.armArrived.all(): return blocked
+        joints = self.armState[:, :agents.ARM_JOINT_NUM]
+        atTarget = np.all(np.abs(self.armServo.clampTarget(self.armTarget) - joints)
+                          <= self.armServo.tolerance, axis=1)
+        for i in np.flatnonzero(atTarget & ~self.armArrived):
+            gv.gDebugPrint("The arm %s is at the request position." % i, logType=gv.LOG_INFO)
+        self.armArrived = atTarget
+        if atTarget.all(): return blocked
+        movingIdx = np.flatnonzero(~atTarget)
+        if self.motionProfile == PROFILE_SERVO:
+            newJoints, _ = self.armServo.step(joints, self.armTarget, dt)
+            # The linear moves follow their path trajectory in the servo mode.
+            trajIdx = [i for i in movingIdx if self.armTraj[i] is not None]
+            if trajIdx:
+                self.armServo.velocity[trajIdx] = 0.0
+                self.stepTrajectories(joints, newJoints, trajIdx, dt)
+        else:
+            newJoints = joints.copy()
+            self.stepTrajectories(joints, newJoints, movingIdx, dt)
+        moved = np.any(newJoints != joints, axis=1)
+        if self.collisionCheck and moved.any():
+            movedIdx = np.flatnonzero(moved)
+            # The self collision gap shrinks by the motion of both the links.
+            self.collisionBudget[movedIdx] -= 2 * collision.getMotionBound(
+                joints[movedIdx], newJoints[movedIdx], self.getLinkLens(movedIdx))
+            checkIdx = movedIdx[self.collisionBudget[movedIdx] <= 0]
+            if checkIdx.size:
+                flags, margin = self.getNewCollision(checkIdx, newJoints[checkIdx])
+                self.collisionBudget[checkIdx] = np.where(flags == collision.COLL_NONE, margin, -np.inf)
+                blocked = checkIdx[flags != collision.COLL_NONE]
+                for i, flag in zip(blocked, flags[flags != collision.COLL_NONE]):
+                    gv.gDebugPrint("The arm %s stopped, collision: %s" % (i, collision.getCollisionName(flag)),
+                                   logType=gv.LOG_WARN)
+                # Stop the blocked arms at the current pose.
+                newJoints[blocked] = joints[blocked]
+                if self.armServo.velocity is not None: self.armServo.velocity[blocked] = 0.0
+                self.armTarget[blocked] = joints[blocked]
+                for i in blocked: self.clearTrajectory(i)
+                moved[blocked] = False
+        joints[:] = newJoints
+        for i in np.flatnonzero(moved):
+            self.arms[i].stateVersion += 1
+        return blocked
+
+    def stepTrajectories(self, joints, newJoints, armIdx, dt):
+        """ Sample the moving arms' trajectories after dt seconds to the newJoints,
+            a trajectory is planned from the current joints when the arm's target
+            changed (in the servo mode the arm goes back to the servo).
+        """
+        target = self.armServo.clampTarget(self.armTarget)
+        for i in armIdx:
+            traj = self.armTraj[i]
+            if traj is None or not np.array_equal(traj.goal, target[i]):
+                if self.motionProfile == PROFILE_SERVO:
+                    self.clearTrajectory(i)
+                    continue
+                traj = self.planTrajectory(i, joints[i], dt)
+            self.trajTime[i] += dt
+            newJoints[i] = traj.sample(self.trajTime[i])
+            if traj.isFinished(self.trajTime[i]): self.clearTrajectory(i)
+
+    def planTrajectory(self, armId, start, dt):
+        """ Plan the arm's trajectory from the start joints to its (clamped) target."""
+        self.armTraj[armId] = trajectory.JointTrajectory(
+            start, self.armServo.clampTarget(self.armTarget[armId]), self.armServo.maxVel,
+            self.armServo.maxAcc, profile=self.motionProfile, dt=dt)
+        self.trajTime[armId] = 0.0
+        self.trajKind[armId] = TRAJ_JOINT
+        return self.armTraj[armId]
+
+    def planLinearMove(self, armId, goalPos, dt, wristAngle=None, startJoints=None, checkCollision=True):
+        """ Plan the arm's gripper straight line move to the goal position and
+            start it if all the waypoints are reachable and collision free.
+            Args:
+                armId (int): arm index.
+                goalPos (array-like): gripper goal (x, y, z) in the world.
+                dt (float): trajectory sample time step.
+                wristAngle (float, optional): absolute wrist link angle (degrees)
+                    kept along the path. Defaults to None (current wrist angle).
+                startJoints (array-like, optional): joints the move starts from.
+                    Defaults to None (current joints).
+                checkCollision (bool, optional): check the waypoints collision.
+            Returns:
+                tuple: (bool planned, result message).
+        """
+        start = self.armState[armId, :agents.ARM_JOINT_NUM].copy() if startJoints is None \
+            else np.asarray(startJoints, dtype=np.float64)
+        if wristAngle is None: wristAngle = cartesian.getWristAngle(start)
+        linkLens = self.armState[armId, agents.ARM_LINK_IDX:agents.ARM_BASE_IDX]
+        basePos = self.armState[armId, agents.ARM_BASE_IDX:]
+        startPos = kinematics.forwardKinematicsBatch(start, linkLens)[0, -1]
+        jointLimits = np.column_stack((self.armServo.posMin, self.armServo.posMax))
+        jointPath, _, msg = cartesian.planLinearPath(startPos, np.asarray(goalPos, dtype=np.float64) - basePos,
+                                                     linkLens, start, wristAngle=wristAngle,
+                                                     jointLimits=jointLimits)
+        if jointPath is None: return (False, msg)
+        # theta5 and the gripper keep their current value along the path.
+        waypoints = np.column_stack((jointPath, np.tile(start[4:], (len(jointPath), 1))))
+        startJump = np.abs(waypoints[0] - start).max()
+        if startJump > cartesian.MAX_JOINT_JUMP:
+            # Only the waypoints are collision checked and the path is timed by
+            # even segments, a big 1st segment (branch flip or wrist change) is rejected.
+            return (False, "Joint jump %.1f degrees from the start joints to waypoint 0" % startJump)
+        if startJump > self.armServo.tolerance:
+            waypoints = np.vstack((start, waypoints))
+        if self.collisionCheck and checkCollision:
+            flags, _ = self.getNewCollision(np.full(len(waypoints), armId), waypoints)
+            if flags.any():
+                failIdx = int(np.argmax(flags != collision.COLL_NONE))
+                return (False, "Waypoint %s collision: %s" % (failIdx, collision.getCollisionName(flags[failIdx])))
+        traj = self._setPathTrajectory(armId, waypoints, TRAJ_LINEAR, dt)
+        self.linearGoal[armId] = tuple(goalPos) + (wristAngle,)
+        return (True, "Linear move planned, %s waypoints, %.2f sec" % (len(waypoints), traj.duration))
+
+    def startPathMove(self, armId, path, dt):
+        """ Start the arm's move along the (planned collision free) joint path.
+            Args:
+                armId (int): arm index.
+                path (array-like): (k, 6) joint path from the arm's current joints.
+                dt (float): trajectory sample time step.
+            Returns:
+                tuple: (bool started, result message).
+        """
+        path = np.asarray(path, dtype=np.float64).reshape(-1, agents.ARM_JOINT_NUM)
+        if np.abs(path[0] - self.armState[armId, :agents.ARM_JOINT_NUM]).max() > PATH_START_TOL:
+            return (False, "The arm moved away from the path start")
+        traj = self._setPathTrajectory(armId, path, TRAJ_PATH, dt)
+        self.armPath[armId] = path
+        return (True, "Path move started, %s waypoints, %.2f sec" % (len(path), traj.duration))
+
+    def _setPathTrajectory(self, armId, waypoints, kind, dt):
+        """ Give the arm the PathTrajectory through the waypoints."""
+        profile = trajectory.PROFILE_TRAPEZOID if self.motionProfile == PROFILE_SERVO else self.motionProfile
+        self.armTraj[armId] = trajectory.PathTrajectory(waypoints, self.armServo.maxVel, self.armServo.maxAcc,
+                                                        profile=profile, dt=dt)
+        self.trajTime[armId] = 0.0
+        self.trajKind[armId] = kind
+        self.armTarget[armId] = waypoints[-1]
+        self.armArrived[armId] = False
+        return self.armTraj[armId]
+
+    def getPlanRequest(self, armId, goalJoints):
+        """ Build the armPlanner.planMotion() request of the arm's move from its
+            current joints to the (clamped) goal joints.
+        """
+        return {'start': self.armState[armId, :agents.ARM_JOINT_NUM].copy(),
+                'goal': self.armServo.clampTarget(np.asarray(goalJoints, dtype=np.float64)),
+                'linkLens': self.armState[armId, agents.ARM_LINK_IDX:agents.ARM_BASE_IDX].copy(),
+                'basePos': self.armState[armId, agents.ARM_BASE_IDX:].copy(),
+                'boxes': self.obstacles.copy(),
+                'jointLimits': np.column_stack((self.armServo.posMin, self.armServo.posMax))}
+
+    def clearTrajectory(self, armId):
+        self.armTraj[armId] = None
+        self.trajTime[armId] = NO_TRAJ
+        self.trajKind[armId] = TRAJ_JOINT
+        self.armPath[armId] = None
+
+    def getTrajectoryState(self):
+        """ Return the ((N, 6) trajectory start joints, (N,) trajTime, (N,) trajKind,
+            (N, 4) linear move goals, N joint paths (None if not a path move)) of
+            the arms, used by the snapshot to rebuild the trajectories (trajTime
+            is NO_TRAJ if the arm has no trajectory).
+        """
+        start = np.array([self.armState[i, :agents.ARM_JOINT_NUM] if traj is None else traj.start
+                          for i, traj in enumerate(self.armTraj)]).reshape(self.armNum, agents.ARM_JOINT_NUM)
+        return (start, self.trajTime.copy(), self.trajKind.copy(), self.linearGoal.copy(), list(self.armPath))
+
+    def setTrajectoryState(self, start, trajTime, trajKind, linearGoal, paths, dt):
+        """ Rebuild the arms' trajectories from the getTrajectoryState() data."""
+        for i in range(self.armNum):
+            self.clearTrajectory(i)
+            if trajTime[i] == NO_TRAJ: continue
+            if trajKind[i] == TRAJ_PATH:
+                arrived = self.armArrived[i]
+                self._setPathTrajectory(i, paths[i], TRAJ_PATH, dt)
+                self.armPath[i] = paths[i]
+                self.armArrived[i] = arrived
+            elif trajKind[i] == TRAJ_LINEAR:
+                arrived = self.armArrived[i]
+                self.planLinearMove(i, linearGoal[i, :3], dt, wristAngle=linearGoal[i, 3],
+                                    startJoints=start[i], checkCollision=False)
+                self.armArrived[i] = arrived
+            elif self.motionProfile != PROFILE_SERVO:
+                self.planTrajectory(i, start[i], dt)
+            if self.armTraj[i] is not None: self.trajTime[i] = trajTime[i]
+
+    def getMoveTime(self, armId):
+        """ Get the remaining move time (sec) of the arm to its target."""
+        if self.armTraj[armId] is not None:
+            return max(self.armTraj[armId].duration - self.trajTime[armId], 0.0)
+        profile = trajectory.PROFILE_TRAPEZOID if self.motionProfile == PROFILE_SERVO else self.motionProfile
+        return trajectory.getMoveDuration(self.armState[armId, :agents.ARM_JOINT_NUM],
+                                          self.armServo.clampTarget(self.armTarget[armId]),
+                                          self.armServo.maxVel, self.armServo.maxAcc, profile=profile)
+
+    #-----------------------------------------------------------------------------
+    def updateCubes(self, dt):
+        """ Carry the held cubes with the grippers and integrate the gravity of the
+            free cubes for dt seconds.
+        """
+        z = self.cubeState[:, 2]
+        ground = self.cubeState[:, agents.CUBE_SIZE_IDX] / 2
+        moving = z != ground
+        held = self.holdIdx != NO_CUBE
+        if held.any():
+            cubeIdx = self.holdIdx[held]
+            gripperPos = self.getGripperPositions()[held]
+            gripperPos[:, 2] -= CUBE_OFFSET
+            moved = np.any(self.cubeState[cubeIdx, :3] != gripperPos, axis=1)
+            self.cubeState[cubeIdx, :3] = gripperPos
+            self.cubeState[cubeIdx, agents.CUBE_VEL_IDX] = 0.0
+            for j in cubeIdx[moved]: self.cubes[j].stateVersion += 1
+            self.cubeIndex.update(cubeIdx[moved], gripperPos[moved])
+            moving[cubeIdx] = False
+        # Gravity of the free cubes which are not resting on the ground.
+        if not moving.any(): return
+        falling = np.flatnonzero(moving)
+        vel = self.cubeState[falling, agents.CUBE_VEL_IDX]
+        above = z[falling] > ground[falling]
+        vel = np.where(above, vel - gv.gCubeGravity * dt, 0.0)
+        newZ = np.maximum(np.where(above, z[falling] + vel * dt, ground[falling]), ground[falling])
+        self.cubeState[falling, 2] = newZ
+        self.cubeState[falling, agents.CUBE_VEL_IDX] = np.where(newZ == ground[falling], 0.0, vel)
+        for j in falling: self.cubes[j].stateVersion += 1
+        self.cubeIndex.update(falling, self.cubeState[falling, :3])
+
+    #-----------------------------------------------------------------------------
+    def findGrabCube(self, armId):
+        """ Find the nearest free cube the arm can grab.
+            Returns:
+                tuple: (cube index or NO_CUBE, distance to the nearest free cube).
+        """
+        heldSet = set(self.holdIdx[self.holdIdx != NO_CUBE].tolist())
+        gripperPos = self.arms[armId].forwardKinematics()[-1]
+        idx, distance = self.cubeIndex.nearest(self.cubeState[:, :3], gripperPos, GRAB_DIS,
+                                               excludeSet=heldSet)
+        if idx != NO_CUBE and distance < GRAB_DIS: return (idx, distance)
+        return (NO_CUBE, distance)
+
+    def findCubesNear(self, point, radius):
+        """ Return the indices of the cubes within the radius of the point."""
+        return self.cubeIndex.queryRadius(self.cubeState[:, :3], np.asarray(point, dtype=np.float64), radius)
+
+    def grabCube(self, armId):
+        """ Try to grab the nearest cube with the arm's gripper.
+            Returns:
+                tuple: (grabbed cube index or NO_CUBE, status message).
+        """
+        arm = self.arms[armId]
+        if self.holdIdx[armId] != NO_CUBE: return (int(self.holdIdx[armId]), "Holding cube")
+        cubeIdx, distance = self.findGrabCube(armId)
+        if cubeIdx != NO_CUBE and arm.gripper_open < GRAB_OPENING:
+            self.holdIdx[armId] = cubeIdx
+            arm.holding_cube = True
+            self.updateCubes(0)
+            return (cubeIdx, "Holding cube")
+        return (NO_CUBE, "Too far from cube!" if distance >= 0.4 else "Close gripper more!")
+
+    def releaseCube(self, armId):
+        self.holdIdx[armId] = NO_CUBE
+        self.arms[armId].holding_cube = False
+
+    #-----------------------------------------------------------------------------
+    def setArmJoints(self, armId, angles):
+        """ Set the arm joints directly if the new pose does not cause a collision.
+            Returns:
+                int: the collision flags, COLL_NONE if the joints are set.
+        """
+        if self.collisionCheck:
+            joints = np.asarray(angles, dtype=np.float64).reshape(1, -1)
+            flag = int(self.getNewCollision([armId], joints)[0][0])
+            if flag != collision.COLL_NONE: return flag
+        self.arms[armId].setJointAngles(angles)
+        self.collisionBudget[armId] = -np.inf
+        self.clearTrajectory(armId)
+        return collision.COLL_NONE
+
+    def getHeldCube(self, armId):
+        """ Return the cube held by the arm, None if not holding."""
+        idx = self.holdIdx[armId]
+        return None if idx == NO_CUBE else self.cubes[idx]
+
+    #-----------------------------------------------------------------------------
+    def applyState(self, joints, targets, cubePos, holdIdx):
+        """ Set the (recorded) state of all the arms and cubes.
+            Args:
+                joints (array-like): (N, 6) joint values.
+                targets (array-like): (N, 6) joint targets.
+                cubePos (array-like): (M, 3) cube positions.
+                holdIdx (array-like): (N,) held cube index of the arms.
+        """
+        self.armState[:, :agents.ARM_JOINT_NUM] = joints
+        self.armTarget[:] = targets
+        self.holdIdx[:] = holdIdx
+        self.collisionBudget[:] = -np.inf
+        for i, arm in enumerate(self.arms):
+            self.clearTrajectory(i)
+            arm.holding_cube = bool(self.holdIdx[i] != NO_CUBE)
+            arm.stateVersion += 1
+        self.cubeState[:, :3] = cubePos
+        for cube in self.cubes: cube.stateVersion += 1
+        self.cubeIndex.update(np.arange(self.cubeNum), self.cubeState[:, :3])
+
+    def getRenderVersion(self):
+        """ Get the version of the drawn state (arm joints and gripper, cube positions
+            and the held cubes), the agents' stateVersion only increases so the sums
+            change whenever any agent changed.
+        """
+        return (sum(arm.stateVersion for arm in self.arms),
+                sum(cube.stateVersion for cube in self.cubes), self.holdIdx.tobytes())
+
+    def reset(self):
+        """ Reset all the arms and cubes to the init state."""
+        initAngles = (gv.gMotoAngle1, gv.gMotoAngle2, gv.gMotoAngle3, gv.gMotoAngle4,
+                      gv.gMotoAngle5, gv.gMotoAngle6)
+        self.holdIdx[:] = NO_CUBE
+        for i, arm in enumerate(self.arms):
+            self.clearTrajectory(i)
+            arm.holding_cube = False
+            arm.setJointAngles(initAngles)
+        for cube in self.cubes: cube.reset()
+        self.cubeIndex.update(np.arange(self.cubeNum), self.cubeState[:, :3])
+        self.armServo.reset()
+        self.armArrived[:] = False
+        self.collisionBudget[:] = -np.inf
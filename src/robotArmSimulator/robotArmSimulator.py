@@ -14,14 +14,16 @@
 #-----------------------------------------------------------------------------
 
 import time
-import math
+import argparse
 import wx
 import robotArmGlobal as gv
-import robotArmAgents as agents
+import robotArmCanvas as canvas
+import robotArmEngine as engine
 import robotArmDataMgr as dataMgr
+import armWorkspace as workspace
 
 FRAME_SIZE = (1100, 950)
-PERIODIC_INT = 300 # 300 ms for periodic update
+PERIODIC_INT = 300 # 300 ms for periodic UI update (the simulation runs in the sim loop thread)
 HELP_MSG="""
 If there is any bug, please contact:
  - Author:      Yuancheng Liu 
@@ -37,13 +39,21 @@ class RobotArmFrame(wx.Frame):
     def __init__(self):
         wx.Frame.__init__(self, None, title=gv.UI_TITLE, size=FRAME_SIZE)
         self._buildMenuBar()
-        # Init the robot arm and cube object for locating them in to the canvas.
-        gv.iRobotArmObj = agents.RobotArm()
-        gv.iCubeObj =agents.Cube(gv.gCubePosX, gv.gCubePosY, gv.gCubePosZ)  
+        # Init the simulation engine with the robot arms and cubes for locating 
+        # them in to the canvas, the iRobotArmObj is the arm selected in the UI.
+        gv.iSimEngine = engine.SimulationEngine()
+        gv.iRobotArmObj = gv.iSimEngine.robotArm
+        gv.iCubeObj = gv.iSimEngine.cube
+        self.armIdx = 0
+        # Load (or build at the 1st run) the arm workspace reachability map.
+        gv.iWorkspaceMap = workspace.WorkspaceMap.loadOrBuild(
+            gv.gWorkspaceDir, (gv.gArmBaseLen, gv.gArmShoulderLen, gv.gArmElbowLen, gv.gArmWristLen),
+            jointLimits=gv.gArmJointLimits[:4], wristAngle=workspace.LEVEL_WRIST)
         panel = wx.Panel(self)
         mainSizer = wx.BoxSizer(wx.HORIZONTAL)
         # Create OpenGL canvas
-        self.canvas = agents.GLCanvas(panel, gv.iRobotArmObj, gv.iCubeObj)
+        self.canvas = canvas.GLCanvas(panel, gv.iSimEngine.scene)
+        gv.iRenderStats = self.canvas.frameStats
         control_panel = self._buildControlPanel(panel)
         # Add to main sizer
         mainSizer.Add(self.canvas, 1, wx.EXPAND)
@@ -51,7 +61,9 @@ class RobotArmFrame(wx.Frame):
         panel.SetSizer(mainSizer)
         self.UpdatePositionInfo()
         self.statusbar = self.CreateStatusBar(1)
-        self.statusbar.SetStatusText('Test mode: %s' %str(gv.gTestMD))
+        speed = gv.iSimEngine.getSpeed()
+        self.statusbar.SetStatusText('Test mode: %s, simulation speed: %s' 
+                                     %(str(gv.gTestMD), 'max' if speed == 0 else 'x%s' %str(speed)))
         # Init the periodic control parameters
         self.updateLock = False 
         self.lastPeriodicTime = time.time()
@@ -59,6 +71,9 @@ class RobotArmFrame(wx.Frame):
         self.Bind(wx.EVT_TIMER, self.periodic)
         self.timer.Start(PERIODIC_INT)
         self.Centre()
+        # Start the fixed time step simulation loop.
+        self.displayVersion = None
+        gv.iSimEngine.start()
         # If test mode is enable, start the data manager thread.
         if gv.gTestMD:
             gv.iDataManager = dataMgr.robotArmDataMgr()
@@ -100,6 +115,16 @@ class RobotArmFrame(wx.Frame):
         self.checkBox.Bind(wx.EVT_CHECKBOX, self.OnCheckBox)
         control_sizer.Add(self.checkBox, 0, wx.ALL, 10)
         self.checkBox.SetValue(gv.gTestMD)
+        # Show the render frame time statistics over the scene.
+        self.hudCheckBox = wx.CheckBox(control_panel, label="Show the render stats HUD.")
+        self.hudCheckBox.Bind(wx.EVT_CHECKBOX, self.OnHUDCheckBox)
+        control_sizer.Add(self.hudCheckBox, 0, wx.LEFT|wx.RIGHT|wx.BOTTOM, 10)
+        # Select the arm to control if there are multiple arms in the work cell.
+        if gv.iSimEngine.getArmNum() > 1:
+            self.armChoice = wx.Choice(control_panel, choices=["Arm %s" % i for i in range(gv.iSimEngine.getArmNum())])
+            self.armChoice.SetSelection(0)
+            self.armChoice.Bind(wx.EVT_CHOICE, self.OnArmSelect)
+            control_sizer.Add(self.armChoice, 0, wx.EXPAND|wx.LEFT|wx.RIGHT, 10)
         # Joint 1 (Base)
         control_sizer.Add(wx.StaticText(control_panel, label="Base Rotation (θ1)"), 0, wx.LEFT|wx.TOP, 10)
         self.slider1 = wx.Slider(control_panel, value=int(gv.gMotoAngle1), 
@@ -173,76 +198,31 @@ class RobotArmFrame(wx.Frame):
         #if (not self.updateLock) and now - self.lastPeriodicTime >= 1:
         #print("periodic(): main frame update at %s" % str(now))
         self.lastPeriodicTime = now
-        # update the arm control movement.
-        if not gv.gTestMD: self.updateArmMovement()
-        self.updateCubePos()
-        self.canvas.Refresh()
+        # sample the latest simulation state to the UI.
+        self.updateStateDisplay()
+        # Repaint only when the arms, cubes, gripper or camera changed.
+        self.canvas.RefreshIfChanged()
 
     #-----------------------------------------------------------------------------
-    def updateArmMovement(self):
-        """ Control the robot arm to move to the expect position. """
-        if gv.iDataManager is None: return 
-        reqList = gv.iDataManager.getArmAngleRequest() # request motor angle list.
-        crtList = gv.iRobotArmObj.getJointAngles()  # current motor angle list.
-        if reqList == crtList: 
-            gv.gDebugPrint("The arm is at the request position.", logType=gv.LOG_INFO)
-            return
-        # move the motor1
-        if gv.iRobotArmObj.theta1 < reqList[0]:
-            gv.iRobotArmObj.theta1 += gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta1 > reqList[0]:
-                gv.iRobotArmObj.theta1 = reqList[0]
-        elif gv.iRobotArmObj.theta1 > reqList[0]:
-            gv.iRobotArmObj.theta1 -= gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta1 < reqList[0]:
-                gv.iRobotArmObj.theta1 = reqList[0]
-        # move the motor2
-        if gv.iRobotArmObj.theta2 < reqList[1]:
-            gv.iRobotArmObj.theta2 += gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta2 > reqList[1]:
-                gv.iRobotArmObj.theta2 = reqList[1]
-        elif gv.iRobotArmObj.theta2 > reqList[1]:
-            gv.iRobotArmObj.theta2 -= gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta2 < reqList[1]:
-                gv.iRobotArmObj.theta2 = reqList[1]
-        # move the motor3
-        if gv.iRobotArmObj.theta3 < reqList[2]:
-            gv.iRobotArmObj.theta3 += gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta3 > reqList[2]:
-                gv.iRobotArmObj.theta3 = reqList[2]
-        elif gv.iRobotArmObj.theta3 > reqList[2]:
-            gv.iRobotArmObj.theta3 -= gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta3 < reqList[2]:
-                gv.iRobotArmObj.theta3 = reqList[2]
-        # move the motor4
-        if gv.iRobotArmObj.theta4 < reqList[3]:
-            gv.iRobotArmObj.theta4 += gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta4 > reqList[3]:
-                gv.iRobotArmObj.theta4 = reqList[3]
-        elif gv.iRobotArmObj.theta4 > reqList[3]:
-            gv.iRobotArmObj.theta4 -= gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta4 < reqList[3]:
-                gv.iRobotArmObj.theta4 = reqList[3]
-        # move the motor5
-        if gv.iRobotArmObj.theta5 < reqList[4]:
-            gv.iRobotArmObj.theta5 += gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta5 > reqList[4]:
-                gv.iRobotArmObj.theta5 = reqList[4]
-        elif gv.iRobotArmObj.theta5 > reqList[4]:
-            gv.iRobotArmObj.theta5 -= gv.gMotorDegSpeed
-            if gv.iRobotArmObj.theta5 < reqList[4]:
-                gv.iRobotArmObj.theta5 = reqList[4]
-        # move the gripper
-        if gv.iRobotArmObj.gripper_open < reqList[5]:
-            gv.iRobotArmObj.gripper_open += gv.gMotorDegSpeed
-            if gv.iRobotArmObj.gripper_open > reqList[5]:
-                gv.iRobotArmObj.gripper_open = reqList[5]
-        elif gv.iRobotArmObj.gripper_open > reqList[5]:
-            gv.iRobotArmObj.gripper_open -= gv.gMotorDegSpeed
-            if gv.iRobotArmObj.gripper_open < reqList[5]:
-                gv.iRobotArmObj.gripper_open = reqList[5]
-        # Change the slider position and the position display.
+    def getDisplayCube(self):
+        """ Get the cube held by the selected arm, the 1st cube if not holding."""
+        heldCube = gv.iSimEngine.getHeldCube(armId=self.armIdx)
+        return gv.iCubeObj if heldCube is None else heldCube
+
+    def updateStateDisplay(self):
+        """ Change the slider position and the position display if the state changed."""
+        version = (self.armIdx, gv.iRobotArmObj.stateVersion, self.getDisplayCube().stateVersion, 
+                   gv.iRobotArmObj.holding_cube, gv.iSimEngine.getStatus())
+        if self.displayVersion == version: return
+        self.displayVersion = version
+        self.grab_btn.Enable(not gv.iRobotArmObj.holding_cube)
+        self.release_btn.Enable(gv.iRobotArmObj.holding_cube)
+        self.status_text.SetLabel("Status: %s" %gv.iSimEngine.getStatus())
+        if not gv.gTestMD: self.syncSliders()
         self.UpdatePositionInfo()
+
+    def syncSliders(self):
+        """ Set the sliders position to the selected arm joints."""
         self.slider1.SetValue(int(gv.iRobotArmObj.theta1))
         self.slider2.SetValue(int(gv.iRobotArmObj.theta2))
         self.slider3.SetValue(int(gv.iRobotArmObj.theta3))
@@ -266,27 +246,31 @@ class RobotArmFrame(wx.Frame):
         self.gripper_slider.Enable(gv.gTestMD)
         #self.grab_btn.Enable(gv.gTestMD)
 
+    #-----------------------------------------------------------------------------
+    def OnHUDCheckBox(self, event):
+        """ Show or hide the render statistics HUD."""
+        self.canvas.showHUD = self.hudCheckBox.IsChecked()
+        self.canvas.Refresh()
+
+    #-----------------------------------------------------------------------------
+    def OnArmSelect(self, event):
+        """ Change the arm controlled by the UI."""
+        self.armIdx = self.armChoice.GetSelection()
+        gv.iRobotArmObj = gv.iSimEngine.scene.arms[self.armIdx]
+        self.syncSliders()
+        self.updateStateDisplay()
+
     #-----------------------------------------------------------------------------
     def OnSlider(self, event):
         """ Handle the robot arm movement when use change the slider under local control mode."""
-        gv.iRobotArmObj.theta1 = self.slider1.GetValue()
-        gv.iRobotArmObj.theta2 = self.slider2.GetValue()
-        gv.iRobotArmObj.theta3 = self.slider3.GetValue()
-        gv.iRobotArmObj.theta4 = self.slider4.GetValue()
-        gv.iRobotArmObj.theta5 = self.slider5.GetValue()
-        self.updateCubePos()
-        self.UpdatePositionInfo()
+        applied = gv.iSimEngine.setJointAngles((self.slider1.GetValue(), self.slider2.GetValue(),
+                                                self.slider3.GetValue(), self.slider4.GetValue(),
+                                                self.slider5.GetValue(), gv.iRobotArmObj.gripper_open),
+                                               armId=self.armIdx)
+        if not applied: self.syncSliders()   # the pose is rejected by the collision check.
+        self.updateStateDisplay()
         self.canvas.Refresh()
     
-    #-----------------------------------------------------------------------------
-    def updateCubePos(self):
-        """Update cube position if holding. """
-        if gv.iRobotArmObj.holding_cube:
-            positions = gv.iRobotArmObj.forwardKinematics()
-            gripper_pos = positions[-1]
-            gv.iCubeObj.setPosition(gripper_pos[0], gripper_pos[1], gripper_pos[2]-0.3)
-        self.canvas.updateCubeZ()
-
     #-----------------------------------------------------------------------------
     def OnGripperSlider(self, event):
         gv.iRobotArmObj.gripper_open = self.gripper_slider.GetValue()
@@ -294,35 +278,14 @@ class RobotArmFrame(wx.Frame):
     
     #-----------------------------------------------------------------------------
     def OnGrabCube(self, event):
-        positions = gv.iRobotArmObj.forwardKinematics()
-        gripper_pos = positions[-1]
-        cube_pos = gv.iCubeObj.getPosition()
-        # Calculate distance between gripper and cube
-        distance = math.sqrt(
-            (gripper_pos[0] - cube_pos[0])**2 +
-            (gripper_pos[1] - cube_pos[1])**2 +
-            (gripper_pos[2] - cube_pos[2])**2
-        )
-        # Check if gripper is close enough and closed enough
-        if distance < 1 and gv.iRobotArmObj.gripper_open < 30:
-            gv.iRobotArmObj.holding_cube = True
-            gv.iCubeObj.setPosition(gripper_pos[0], gripper_pos[1], gripper_pos[2]-0.3)
-            self.grab_btn.Enable(False)
-            self.release_btn.Enable(True)
-            self.status_text.SetLabel("Status: Holding cube")
-            self.canvas.Refresh()
-        else:
-            if distance >= 0.4:
-                self.status_text.SetLabel("Status: Too far from cube!")
-            else:
-                self.status_text.SetLabel("Status: Close gripper more!")
+        gv.iSimEngine.grabCube(armId=self.armIdx)
+        self.updateStateDisplay()
+        self.canvas.Refresh()
     
     #-----------------------------------------------------------------------------
     def OnReleaseCube(self, event):
-        gv.iRobotArmObj.holding_cube = False
-        self.grab_btn.Enable(True)
-        self.release_btn.Enable(False)
-        self.status_text.SetLabel("Status: Cube released")
+        gv.iSimEngine.releaseCube(armId=self.armIdx)
+        self.updateStateDisplay()
         self.canvas.Refresh()
     
     #-----------------------------------------------------------------------------
@@ -330,7 +293,7 @@ class RobotArmFrame(wx.Frame):
         positions = gv.iRobotArmObj.forwardKinematics()
         end_pos = positions[-1]
         self.pos_text.SetLabel("X: %.2f\nY: %.2f\nZ: %.2f" %(end_pos[0], end_pos[1], end_pos[2]))
-        cube_pos = gv.iCubeObj.getPosition()
+        cube_pos = self.getDisplayCube().getPosition()
         self.cube_text.SetLabel("X: %.2f\nY: %.2f\nZ: %.2f" %(cube_pos[0], cube_pos[1], cube_pos[2]))
     
     #-----------------------------------------------------------------------------
@@ -341,12 +304,9 @@ class RobotArmFrame(wx.Frame):
         self.slider4.SetValue(gv.gMotoAngle4)
         self.slider5.SetValue(gv.gMotoAngle5)
         self.gripper_slider.SetValue(gv.gMotoAngle6)
-        gv.iRobotArmObj.holding_cube = False
-        gv.iCubeObj.reset()
-        self.grab_btn.Enable(True)
-        self.release_btn.Enable(False)
-        self.status_text.SetLabel("Status: Reset complete")
-        self.OnSlider(None)
+        gv.iSimEngine.reset()
+        self.updateStateDisplay()
+        self.canvas.Refresh()
 
     #-----------------------------------------------------------------------------
     def onHelp(self, event):
@@ -365,7 +325,21 @@ class RobotArmFrame(wx.Frame):
 #-----------------------------------------------------------------------------
 #-----------------------------------------------------------------------------
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='3D robot arm simulator.')
+    parser.add_argument('--speed', type=float, default=gv.gSimSpeed,
+                        help='simulation time scale, 0 to run as fast as possible.')
+    parser.add_argument('--record', default=None, help='record the simulation state to the file.')
+    parser.add_argument('--replay', default=None, help='replay the recorded state file.')
+    parser.add_argument('--seek', type=float, default=None, help='replay start simulation time.')
+    args = parser.parse_args()
+    gv.gSimSpeed = args.speed
     app = wx.App(False)
     gv.iMainFrame = RobotArmFrame()
+    if args.replay:
+        gv.iSimEngine.startReplay(args.replay, startTime=args.seek)
+    elif args.record:
+        gv.iSimEngine.startRecord(args.record)
     gv.iMainFrame.Show()
     app.MainLoop()
+    gv.iSimEngine.stop()
+    gv.iSimEngine.stopRecord()
@@ -0,0 +1,50 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        robotArmWorkspace.py
+#
+# Purpose:     This module is the tool to sample the joint space of the robot
+#              arm (link lengths and joint limits from robotArmGlobal) and build
+#              the workspace reachability map file used by the simulator and the
+#              controller's reachability check.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/02/21
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import os
+import time
+import argparse
+
+import robotArmGlobal as gv
+import armWorkspace as workspace
+
+#-----------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description='Build the robot arm workspace reachability map.')
+    parser.add_argument('--res', type=float, default=workspace.DEF_RES, help='voxel resolution.')
+    parser.add_argument('--step', type=float, default=workspace.DEF_STEP,
+                        help='joint space sampling step in degrees.')
+    parser.add_argument('--out', default=gv.gWorkspaceDir, help='map file storage folder.')
+    parser.add_argument('--wrist', default=str(workspace.LEVEL_WRIST),
+                        help="fixed wrist link angle in degrees, 'free' to sample the wrist joint.")
+    args = parser.parse_args()
+    wristAngle = None if args.wrist.lower() == 'free' else float(args.wrist)
+    linkLens = (gv.gArmBaseLen, gv.gArmShoulderLen, gv.gArmElbowLen, gv.gArmWristLen)
+    jointLimits = gv.gArmJointLimits[:4]
+    startT = time.time()
+    wsMap = workspace.WorkspaceMap.build(linkLens, jointLimits=jointLimits, resolution=args.res,
+                                         stepDeg=args.step, wristAngle=wristAngle)
+    filePath = os.path.join(args.out, workspace.getMapName(linkLens, jointLimits, args.res,
+                                                           wristAngle=wristAngle, stepDeg=args.step) + '.npy')
+    wsMap.save(filePath)
+    gv.gDebugPrint("Workspace map %s built in %.2f sec, grid shape: %s, ground reach radius: %.2f"
+                   % (filePath, time.time() - startT, str(wsMap.shape), wsMap.getMaxReach(0.0)),
+                   logType=gv.LOG_INFO)
+
+#-----------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
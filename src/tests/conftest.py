@@ -0,0 +1,22 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        conftest.py
+#
+# Purpose:     pytest config of the robot arm simulator unit tests, add the lib
+#              and the simulator source folders to the import path (the same as
+#              the modules' robotArmGlobal does when the program is started).
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import os
+import sys
+
+TOP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ('lib', 'robotArmSimulator'):
+    sys.path.insert(0, os.path.join(TOP_DIR, folder))
@@ -0,0 +1,106 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_angleCalculation.py
+#
+# Purpose:     Test the closed-form level wrist IK solver of the controller.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import angleCalculation as ik
+
+Z_TARGET = -2.0     # controller target height relative to the shoulder.
+LIMITS = ((-90, 90), (-180, 180), (-90, 90))
+
+def _forward(t1, t2, t3, linkLens=ik.LINK_LENGTHS):
+    L1, L2, L3 = linkLens
+    return (np.cos(t1)*L1 + np.cos(t1 + t2)*L2 + np.cos(t1 + t2 + t3)*L3,
+            np.sin(t1)*L1 + np.sin(t1 + t2)*L2 + np.sin(t1 + t2 + t3)*L3)
+
+#-----------------------------------------------------------------------------
+@pytest.mark.parametrize('distance, z', [(1.5, 1.0), (2.0, 0.0), (1.2, -1.5), (0.8, -2.0)])
+def test_planar_ik_branches_reach_target(distance, z):
+    solution = ik.solve_planar_ik(distance, z)
+    assert solution['reachable']
+    for branch in ('elbow_up', 'elbow_down'):
+        t1, t2, t3 = solution[branch]
+        assert np.allclose(_forward(t1, t2, t3), (distance, z), atol=1e-9)
+        # Level wrist: the link angles sum to the wrist angle 0.
+        assert abs(t1 + t2 + t3) < 1e-9
+
+def test_solve_reachable_target():
+    result = ik.solve_robot_arm(1.5, 0.5, z_target=Z_TARGET)
+    assert result['reachable'] and result['method'] == 'analytic'
+    assert max(result['distance_error'], result['z_error']) < ik.SOLVE_TOL
+
+def test_solve_unreachable_gives_nearest_pose():
+    # The default cube position (2, 1) is out of the level wrist reach.
+    result = ik.solve_robot_arm(2.0, 1.0, z_target=Z_TARGET)
+    assert not result['reachable'] and result['method'] == 'nearest'
+    # The gripper misses by the wrist target's distance to the reachable annulus.
+    L1, L2, L3 = ik.LINK_LENGTHS
+    wristDist = np.hypot(np.hypot(2.0, 1.0) - L3, Z_TARGET)
+    assert result['position_error'] == pytest.approx(wristDist - (L1 + L2), abs=1e-9)
+
+def test_branch_selection_follows_guess_and_limits():
+    solution = ik.solve_planar_ik(1.2, -1.5)
+    for branch in ('elbow_up', 'elbow_down'):
+        result = ik.solve_robot_arm(1.2, 0.0, initial_guess=solution[branch], z_target=-1.5)
+        assert np.allclose((result['theta1_rad'], result['theta2_rad'], result['theta3_rad']),
+                           solution[branch])
+    # Only the elbow down branch of the target is inside the limits, it is
+    # selected even if the guess is the elbow up branch.
+    solution = ik.solve_planar_ik(1.5, -1.0)
+    result = ik.solve_robot_arm(1.5, 0.0, initial_guess=solution['elbow_up'], z_target=-1.0,
+                                joint_limits=LIMITS)
+    assert result['reachable']
+    assert np.allclose((result['theta1_rad'], result['theta2_rad'], result['theta3_rad']),
+                       solution['elbow_down'])
+
+def test_no_branch_in_limits():
+    result = ik.solve_robot_arm(1.0, 0.5, z_target=Z_TARGET, joint_limits=LIMITS)
+    assert not result['reachable'] and result['method'] == 'limits'
+    assert np.isnan(result['theta1_deg'])
+
+def test_batch_matches_single_solver():
+    rng = np.random.default_rng(1)
+    x, y = rng.uniform(-2.5, 2.5, 200), rng.uniform(-2.5, 2.5, 200)
+    batch = ik.solve_robot_arm_batch(x, y, z_target=Z_TARGET, joint_limits=LIMITS)
+    for i in range(len(x)):
+        single = ik.solve_robot_arm(x[i], y[i], z_target=Z_TARGET, joint_limits=LIMITS)
+        if not single['reachable']:
+            assert not batch['converged'][i]
+            continue
+        assert batch['converged'][i]
+        for key in ('theta1_rad', 'theta2_rad', 'theta3_rad'):
+            assert batch[key][i] == pytest.approx(single[key], abs=1e-9)
+
+def test_cache_reuses_quantized_result():
+    cache = ik.IKCache(joint_limits=LIMITS)
+    first = cache.solve(1.5, 0.5, z_target=Z_TARGET)
+    second = cache.solve(1.5 + ik.CACHE_STEP / 10, 0.5, z_target=Z_TARGET)
+    assert first is second
+    assert cache.stats()['hits'] == 1
+
+def test_cache_result_follows_key():
+    # Two guesses near the branch tie pick different branches but share the
+    # cache key, both must get the result of the rounded guess of the key.
+    solution = ik.solve_planar_ik(1.5, 1.0)
+    up, down = np.asarray(solution['elbow_up']), np.asarray(solution['elbow_down'])
+    middle = np.round((up + down) / 2, 3)
+    guesses = [tuple(middle + k*4e-4*np.sign(up - down)) for k in (1, -1)]
+    branches = {np.sign(ik.solve_robot_arm(1.5, 0.0, initial_guess=g, z_target=1.0)['theta2_rad'])
+                for g in guesses}
+    assert len(branches) == 2
+    expected = ik.solve_robot_arm(1.5, 0.0, initial_guess=tuple(middle), z_target=1.0)
+    for guess in guesses:
+        cache = ik.IKCache(step=0.5)
+        assert cache.solve(1.5, 0.0, initial_guess=guess, z_target=1.0)['theta2_rad'] == expected['theta2_rad']
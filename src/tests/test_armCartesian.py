@@ -0,0 +1,81 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_armCartesian.py
+#
+# Purpose:     Test the Cartesian straight line move: the batched IK waypoints 
+#              follow the line with the fixed wrist angle, the unreachable or
+#              jumping paths are rejected.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import angleCalculation
+import armCartesian as cartesian
+import armKinematics as kinematics
+
+LINK_LENS = (2.0, 1.5, 1.0, 0.5)
+SEED = np.array([30.0, 30.0, -60.0, -60.0, 0.0, 50.0])
+
+def _toolPos(joints):
+    return kinematics.forwardKinematicsBatch(joints, LINK_LENS)[:, -1]
+
+#-----------------------------------------------------------------------------
+def test_sample_line_path_spacing():
+    points = cartesian.sampleLinePath((0, 0, 0), (1.0, 0.5, -0.25))
+    steps = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    assert np.all(steps <= cartesian.PATH_STEP + 1e-12)
+    assert np.allclose(points[[0, -1]], [(0, 0, 0), (1.0, 0.5, -0.25)])
+    # A zero length move still has the start and the goal waypoints.
+    assert len(cartesian.sampleLinePath((1, 1, 1), (1, 1, 1))) == 2
+
+def test_linear_path_follows_line():
+    startPos = _toolPos(SEED)[0]
+    goalPos = startPos + np.array([0.3, -0.4, 0.2])
+    wristAngle = cartesian.getWristAngle(SEED)
+    joints, failIdx, _ = cartesian.planLinearPath(startPos, goalPos, LINK_LENS, SEED, wristAngle=wristAngle)
+    assert joints is not None and failIdx == -1
+    assert np.allclose(joints[0], SEED[:4])
+    assert np.allclose(_toolPos(joints), cartesian.sampleLinePath(startPos, goalPos), atol=1e-9)
+    assert np.allclose(joints[:, 1:4].sum(axis=1), wristAngle)
+    assert np.abs(np.diff(joints, axis=0)).max() <= cartesian.MAX_JOINT_JUMP
+
+def test_ik_branch_follows_seed():
+    points = _toolPos(SEED)
+    joints, reachable = cartesian.solveIKBatch(points, LINK_LENS, SEED, wristAngle=cartesian.getWristAngle(SEED))
+    assert reachable.all() and np.allclose(joints[0], SEED[:4])
+    # The other elbow branch of the same tool position.
+    solution = angleCalculation.solve_planar_ik(np.hypot(*points[0, :2]), points[0, 2] - LINK_LENS[0],
+                                                LINK_LENS[1:], wrist_angle=np.radians(cartesian.getWristAngle(SEED)))
+    branches = np.degrees([solution['elbow_up'], solution['elbow_down']])
+    other = branches[np.argmax(np.abs(branches - SEED[1:4]).sum(axis=1))]
+    flipped = np.concatenate(([SEED[0]], other))
+    assert np.allclose(_toolPos(flipped), points)
+    joints, _ = cartesian.solveIKBatch(points, LINK_LENS, flipped, wristAngle=cartesian.getWristAngle(SEED))
+    assert np.allclose(joints[0], flipped)
+
+def test_unreachable_path_rejected():
+    startPos = _toolPos(SEED)[0]
+    joints, failIdx, msg = cartesian.planLinearPath(startPos, (5.0, 0.0, 2.0), LINK_LENS, SEED,
+                                                    wristAngle=cartesian.getWristAngle(SEED))
+    assert joints is None and failIdx > 0
+    assert 'out of reach' in msg
+
+def test_scene_rejects_start_joint_jump():
+    robotArmEngine = pytest.importorskip('robotArmEngine')
+    simEngine = robotArmEngine.SimulationEngine(speed=0)
+    sc, dt = simEngine.scene, simEngine.simLoop.clock.dt
+    start = np.array([30.0, 30.0, -60.0, 30.0, 0.0, 50.0])
+    goal = _toolPos(start)[0] + sc.armState[0, -3:] + np.array([0.05, 0.0, 0.05])
+    planned, msg = sc.planLinearMove(0, goal, dt, startJoints=start, checkCollision=False)
+    assert planned, msg
+    # The 10 degrees wrist change is a joint jump to the 1st waypoint.
+    planned, msg = sc.planLinearMove(0, goal, dt, wristAngle=10.0, startJoints=start, checkCollision=False)
+    assert not planned and 'waypoint 0' in msg
@@ -0,0 +1,84 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_armCollision.py
+#
+# Purpose:     Test the capsule collision primitives against the dense sampling
+#              and the arm pose self/ground/obstacle collision flags.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import armCollision as collision
+
+LINK_LENS = (2.0, 1.5, 1.0, 0.5)
+SAMPLE_NUM = 400
+
+def _samples(p, q, num=SAMPLE_NUM):
+    return p + (q - p) * np.linspace(0.0, 1.0, num)[:, None]
+
+#-----------------------------------------------------------------------------
+def test_segment_distance_matches_sampling():
+    rng = np.random.default_rng(3)
+    p1, q1, p2, q2 = rng.uniform(-2, 2, (4, 100, 3))
+    # Add the parallel and the degenerated (point) segments.
+    q2[:10] = p2[:10] + (q1[:10] - p1[:10]) * 0.5
+    q1[10:15] = p1[10:15]
+    distances = collision.segmentDistance(p1, q1, p2, q2)
+    for i in range(len(p1)):
+        a, b = _samples(p1[i], q1[i]), _samples(p2[i], q2[i])
+        brute = np.linalg.norm(a[:, None] - b[None], axis=-1).min()
+        # The sampled distance is an upper bound close to the exact one.
+        assert distances[i] <= brute + 1e-9
+        assert distances[i] >= brute - 4.0 / SAMPLE_NUM
+
+def test_segment_hit_box_matches_sampling():
+    rng = np.random.default_rng(4)
+    p, q = rng.uniform(-2, 2, (2, 300, 3))
+    q[:20, 2] = p[:20, 2]   # segments parallel to the z slabs.
+    boxMin, boxMax = np.array([-0.5, -0.5, -0.5]), np.array([0.5, 0.8, 0.3])
+    hits = collision.segmentHitBox(p, q, boxMin, boxMax)
+    for i in range(len(p)):
+        points = _samples(p[i], q[i], 2000)
+        inside = np.all((points >= boxMin) & (points <= boxMax), axis=1).any()
+        # A sampled inside point is always a hit, a hit without the sampled
+        # inside point only clips the box corner.
+        if inside: assert hits[i]
+        if hits[i] and not inside:
+            assert collision.pointSegmentDistance(p[i], q[i], np.clip(points, boxMin, boxMax)).min() < 0.01
+
+@pytest.mark.parametrize('joints, flag', [
+    ([0, 0, 0, 0, 0], collision.COLL_NONE),
+    ([0, -60, 0, 0, 0], collision.COLL_GROUND),
+    ([0, 0, 180, 0, 0], collision.COLL_SELF),
+])
+def test_pose_collision_flags(joints, flag):
+    flags = collision.checkCollisionBatch([joints], LINK_LENS)
+    assert flags[0] == flag
+
+def test_obstacle_and_base_position():
+    box = [[1.0, -0.3, 1.7, 1.4, 0.3, 2.3]]     # around the shoulder link.
+    flags = collision.checkCollisionBatch([[0, 0, 0, 0, 0], [180, 0, 0, 0, 0]], LINK_LENS, boxes=box)
+    assert flags.tolist() == [collision.COLL_OBSTACLE, collision.COLL_NONE]
+    # The box is in the arm frame after the base moved away.
+    flags = collision.checkCollisionBatch([[0, 0, 0, 0, 0]], LINK_LENS, basePos=(5.0, 0.0, 0.0), boxes=box)
+    assert flags[0] == collision.COLL_NONE
+    assert collision.getCollisionName(collision.COLL_SELF | collision.COLL_OBSTACLE) == 'self, obstacle'
+
+def test_batch_chunks_and_clearance(monkeypatch):
+    rng = np.random.default_rng(5)
+    joints = rng.uniform(-180, 180, (1000, 5))
+    box = [[1.0, -0.3, 1.7, 1.4, 0.3, 2.3]]
+    flags, margin = collision.checkCollisionBatch(joints, LINK_LENS, boxes=box, clearance=True)
+    monkeypatch.setattr(collision, 'CHUNK_SZ', 64)
+    chunkFlags, chunkMargin = collision.checkCollisionBatch(joints, LINK_LENS, boxes=box, clearance=True)
+    assert np.array_equal(flags, chunkFlags) and np.array_equal(margin, chunkMargin)
+    # The clearance is a lower bound: a positive clearance pose never collides.
+    assert np.all(flags[margin > 0] == collision.COLL_NONE)
@@ -0,0 +1,53 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_armKinematics.py
+#
+# Purpose:     Test the batch forward kinematics against the per pose chain of
+#              the joint rotations.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import math
+import numpy as np
+
+import armKinematics as kinematics
+
+LINK_LENS = (2.0, 1.5, 1.0, 0.5)
+
+def _chainPose(angles, linkLens=LINK_LENS):
+    """ Walk the joint chain of one pose in the arm plane and rotate it by theta1."""
+    base, pitch = math.radians(angles[0]), 0.0
+    r, z = 0.0, linkLens[0]
+    plane = [(0.0, 0.0), (r, z)]
+    for angle, length in zip(angles[1:4], linkLens[1:]):
+        pitch += math.radians(angle)
+        r, z = r + length * math.cos(pitch), z + length * math.sin(pitch)
+        plane.append((r, z))
+    return np.array([(math.cos(base) * r, math.sin(base) * r, z) for r, z in plane])
+
+#-----------------------------------------------------------------------------
+def test_batch_matches_chain():
+    angles = np.random.default_rng(0).uniform(-180, 180, (50, 5))
+    posArr = kinematics.forwardKinematicsBatch(angles, LINK_LENS)
+    assert posArr.shape == (50, kinematics.JOINT_NUM, 3)
+    for i in range(len(angles)):
+        assert np.allclose(posArr[i], _chainPose(angles[i]), atol=1e-12)
+
+def test_single_pose_and_out_buffer():
+    out = np.empty((1, kinematics.JOINT_NUM, 3))
+    result = kinematics.forwardKinematicsBatch([0, 0, 0, 0, 0], LINK_LENS, out=out)
+    assert result is out
+    assert np.allclose(out[0, -1], (3.0, 0.0, 2.0))
+
+def test_per_pose_link_lengths():
+    angles = np.random.default_rng(1).uniform(-90, 90, (20, 4))
+    lens = np.random.default_rng(2).uniform(0.5, 2.0, (4, 20))
+    posArr = kinematics.forwardKinematicsBatch(angles, tuple(lens))
+    for i in range(len(angles)):
+        assert np.allclose(posArr[i], _chainPose(angles[i], lens[:, i]), atol=1e-12)
@@ -0,0 +1,68 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_armPlanner.py
+#
+# Purpose:     Test the RRT-Connect joint space planner finds the collision free
+#              path around the obstacle and the result is repeatable per seed.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import armPlanner as planner
+
+LINK_LENS = (2.0, 1.5, 1.0, 0.5)
+WALL = [[1.6, -0.3, 0.0, 2.4, 0.3, 2.6]]  # wall in front of the arm.
+START = np.array([-60.0, 10.0, -30.0, 0.0, 0.0])
+GOAL = np.array([60.0, 10.0, -30.0, 0.0, 0.0])
+
+def _plan(seed):
+    motionPlanner = planner.MotionPlanner(LINK_LENS, boxes=WALL, seed=seed)
+    return motionPlanner, motionPlanner.plan(START, GOAL)
+
+#-----------------------------------------------------------------------------
+def test_direct_path_blocked():
+    motionPlanner = planner.MotionPlanner(LINK_LENS, boxes=WALL, seed=0)
+    assert motionPlanner.checkPoses(np.vstack((START, GOAL))).all()
+    assert not motionPlanner.checkEdges(START, GOAL)[0]
+
+def test_plan_around_obstacle():
+    motionPlanner, (path, msg) = _plan(1)
+    assert path is not None, msg
+    assert np.array_equal(path[0], START) and np.array_equal(path[-1], GOAL)
+    assert np.abs(np.diff(path, axis=0)).max() <= motionPlanner.stepSize / 2 + 1e-9
+    assert np.all((path >= motionPlanner.posMin) & (path <= motionPlanner.posMax))
+    # All the edges are collision free with the real link radius at a finer resolution.
+    assert motionPlanner.checkEdges(path[:-1], path[1:], inflate=False,
+                                    resolution=motionPlanner.resolution / 4).all()
+
+def test_plan_deterministic_per_seed():
+    _, (pathA, _) = _plan(7)
+    _, (pathB, _) = _plan(7)
+    assert pathA is not None and np.array_equal(pathA, pathB)
+
+def test_start_in_collision():
+    motionPlanner = planner.MotionPlanner(LINK_LENS, boxes=WALL, seed=0)
+    path, msg = motionPlanner.plan([0.0, 10.0, -30.0, 0.0, 0.0], GOAL)
+    assert path is None and 'start' in msg
+
+def test_plan_motion_request_moves_gripper():
+    request = {'start': np.append(START, 20.0), 'goal': np.append(GOAL, 80.0),
+               'linkLens': LINK_LENS, 'boxes': WALL, 'seed': 3}
+    path, msg, planTime = planner.planMotion(request)
+    assert path is not None, msg
+    assert path.shape[1] == 6 and planTime >= 0
+    assert path[0, 5] == pytest.approx(20.0) and path[-1, 5] == pytest.approx(80.0)
+    assert np.all(np.diff(path[:, 5]) >= 0)
+
+def test_densify_path():
+    path = planner.densifyPath(np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 3.0]]), 2.0)
+    assert np.abs(np.diff(path, axis=0)).max() <= 2.0 + 1e-9
+    assert np.array_equal(path[[0, -1]], [[0.0, 0.0], [10.0, 3.0]])
@@ -0,0 +1,70 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_armTrajectory.py
+#
+# Purpose:     Test the synchronized joint trajectories keep the joint max 
+#              velocity and acceleration and end at the goal.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import armTrajectory as trajectory
+
+MAX_VEL = np.array([60.0, 45.0, 45.0, 90.0, 90.0, 30.0])
+MAX_ACC = np.array([120.0, 90.0, 90.0, 180.0, 180.0, 60.0])
+DT = 0.001
+RATIO_TOL = 1e-6
+
+def _limitRatios(positions, dt=DT):
+    """ Return the max (velocity, acceleration) / limit ratio of the samples."""
+    vel = np.diff(positions, axis=0) / dt
+    acc = np.diff(vel, axis=0) / dt
+    return (np.abs(vel / MAX_VEL).max(), np.abs(acc / MAX_ACC).max())
+
+#-----------------------------------------------------------------------------
+@pytest.mark.parametrize('profile', trajectory.PROFILES)
+@pytest.mark.parametrize('goal', [[90, -30, 45, 10, 0, 20], [5, 0, 0, 0, 0, 0], [0.2, 0.1, 0, 0, 0, 0]])
+def test_joint_trajectory_limits(profile, goal):
+    start = np.zeros(6)
+    traj = trajectory.JointTrajectory(start, goal, MAX_VEL, MAX_ACC, profile=profile, dt=DT)
+    velRatio, accRatio = _limitRatios(traj.positions)
+    assert velRatio <= 1.0 + RATIO_TOL
+    assert accRatio <= 1.0 + RATIO_TOL
+    # The slowest joint uses its limit, so the duration is not padded.
+    assert max(velRatio, accRatio) > 0.9
+    assert np.array_equal(traj.sample(traj.duration), np.asarray(goal, dtype=np.float64))
+    assert np.array_equal(traj.sample(0.0), start)
+
+def test_trapezoid_timing():
+    # Long move: accelerate to the max velocity, cruise and decelerate.
+    duration, blend = trajectory.getTrapezoidTiming(np.array([120.0]), np.array([60.0]), np.array([120.0]))
+    assert duration == pytest.approx(120.0 / 60.0 + 60.0 / 120.0)
+    assert 0.0 < blend < 0.5
+
+def test_sample_interpolates_between_samples():
+    traj = trajectory.JointTrajectory([0.0], [10.0], [5.0], [10.0], dt=0.01)
+    t = 0.505
+    assert traj.sample(t)[0] == pytest.approx(
+        (traj.positions[50, 0] + traj.positions[51, 0]) / 2)
+
+def test_path_trajectory_velocity_limit():
+    # Evenly sampled quarter circle path of 2 joints.
+    angle = np.linspace(0.0, np.pi / 2, 40)
+    waypoints = np.column_stack((30 * np.cos(angle), 30 * np.sin(angle)))
+    traj = trajectory.PathTrajectory(waypoints, MAX_VEL[:2], MAX_ACC[:2], dt=DT)
+    vel = np.abs(np.diff(traj.positions, axis=0) / DT)
+    assert (vel / MAX_VEL[:2]).max() <= 1.0 + RATIO_TOL
+    assert np.array_equal(traj.positions[0], waypoints[0])
+    assert np.array_equal(traj.positions[-1], waypoints[-1])
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        trajectory.JointTrajectory([0.0], [1.0], [1.0], [1.0], profile='cubic')
@@ -0,0 +1,91 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_armWorkspace.py
+#
+# Purpose:     Test the workspace reachability map of the free and the level
+#              wrist arm against the forward kinematics.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import armKinematics as kinematics
+import armWorkspace as workspace
+
+LINK_LENS = (2.0, 1.5, 1.0, 0.5)
+RES = 0.1
+
+@pytest.fixture(scope='module')
+def levelMap():
+    return workspace.WorkspaceMap.build(LINK_LENS, resolution=RES, wristAngle=workspace.LEVEL_WRIST)
+
+@pytest.fixture(scope='module')
+def freeMap():
+    return workspace.WorkspaceMap.build(LINK_LENS, resolution=RES)
+
+#-----------------------------------------------------------------------------
+def test_ground_reach(freeMap):
+    # The gripper reaches the ground at sqrt(3^2 - 2^2) from the base.
+    assert freeMap.getMaxReach(0.0) == pytest.approx(np.sqrt(5.0), abs=2 * RES)
+    assert not freeMap.isReachable(2.6, 0.0, 0.0)
+    assert freeMap.isReachable(1.5, 0.5, 0.0)
+
+def test_sampled_poses_reachable(freeMap):
+    rng = np.random.default_rng(2)
+    limits = np.asarray(workspace.DEF_LIMITS, dtype=np.float64)
+    angles = rng.uniform(limits[:, 0], limits[:, 1], (2000, 4))
+    points = kinematics.forwardKinematicsBatch(angles, LINK_LENS)[:, -1]
+    # The neighbor voxels of a pose between the joint samples are reached.
+    idx = np.rint((points - freeMap.origin) / RES).astype(np.int64)
+    grid = np.asarray(freeMap.grid)
+    for i, j, k in idx:
+        assert grid[max(i - 1, 0):i + 2, max(j - 1, 0):j + 2, max(k - 1, 0):k + 2].any()
+
+def test_level_wrist_ground_reach(levelMap, freeMap):
+    # Level gripper on the ground: the wrist joint is 2.0 below the shoulder,
+    # so its radius is at most sqrt(2.5^2 - 2^2) = 1.5, plus the 0.5 wrist link.
+    assert levelMap.getMaxReach(0.0) == pytest.approx(2.0, abs=2 * RES)
+    assert levelMap.getMaxReach(0.0) < freeMap.getMaxReach(0.0)
+    assert not levelMap.isReachable(2.3, 0.0, 0.0)
+    assert freeMap.isReachable(2.2, 0.0, 0.0, tolerance=RES)
+
+def test_level_wrist_poses_reachable(levelMap):
+    rng = np.random.default_rng(2)
+    limits = np.asarray(workspace.DEF_LIMITS, dtype=np.float64)
+    angles = rng.uniform(limits[:, 0], limits[:, 1], (2000, 4))
+    angles[:, 3] = workspace.LEVEL_WRIST - angles[:, 1] - angles[:, 2]
+    angles = angles[(angles[:, 3] >= limits[3, 0]) & (angles[:, 3] <= limits[3, 1])]
+    points = kinematics.forwardKinematicsBatch(angles, LINK_LENS)[:, -1]
+    assert len(points) > 100
+    assert all(levelMap.isReachable(*point, tolerance=RES) for point in points)
+
+def test_map_save_load(freeMap, levelMap, tmp_path):
+    filePath = str(tmp_path / 'ws_test.npy')
+    freeMap.save(filePath)
+    loaded = workspace.WorkspaceMap.load(filePath)
+    assert loaded.metaDict == freeMap.metaDict
+    points = np.random.default_rng(3).uniform(-3.0, 3.0, (500, 3)) + (0.0, 0.0, 2.0)
+    assert np.array_equal(loaded.query(points), freeMap.query(points))
+    # The level wrist map is stored under its own name.
+    assert workspace.getMapName(LINK_LENS, workspace.DEF_LIMITS, RES, wristAngle=0.0) != \
+        workspace.getMapName(LINK_LENS, workspace.DEF_LIMITS, RES)
+    levelMap.save(str(tmp_path / 'ws_level.npy'))
+    assert workspace.WorkspaceMap.load(str(tmp_path / 'ws_level.npy')).metaDict['wristAngle'] == \
+        workspace.LEVEL_WRIST
+
+def test_load_or_build_per_step(tmp_path):
+    folder = str(tmp_path)
+    coarse = workspace.WorkspaceMap.loadOrBuild(folder, LINK_LENS, resolution=0.3, stepDeg=6.0)
+    fine = workspace.WorkspaceMap.loadOrBuild(folder, LINK_LENS, resolution=0.3, stepDeg=3.0)
+    # The map built with another sampling step is not loaded as the cached one.
+    assert fine.filePath != coarse.filePath
+    assert fine.metaDict['stepDeg'] == 3.0
+    assert workspace.WorkspaceMap.loadOrBuild(folder, LINK_LENS, resolution=0.3,
+                                              stepDeg=6.0).filePath == coarse.filePath
@@ -0,0 +1,54 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_pngEncoder.py
+#
+# Purpose:     Test the PNG encoder of the offscreen rendered frames by decoding
+#              the file chunks back to the image.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import zlib
+import struct
+import numpy as np
+import pytest
+
+import pngEncoder
+
+def _readChunks(data):
+    """ Split the PNG bytes to the [(tag, data)] chunks and check the CRCs."""
+    assert data[:8] == pngEncoder.PNG_SIGNATURE
+    chunks, pos = [], 8
+    while pos < len(data):
+        length, = struct.unpack_from('>I', data, pos)
+        tag, body = data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]
+        crc, = struct.unpack_from('>I', data, pos + 8 + length)
+        assert crc == zlib.crc32(tag + body) & 0xffffffff
+        chunks.append((tag, body))
+        pos += length + 12
+    return chunks
+
+#-----------------------------------------------------------------------------
+@pytest.mark.parametrize('height, width', [(1, 1), (48, 64), (31, 17)])
+def test_png_round_trip(height, width):
+    rgb = np.random.default_rng(height).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    chunks = _readChunks(pngEncoder.encodePNG(rgb))
+    assert [tag for tag, _ in chunks] == [b'IHDR', b'IDAT', b'IEND']
+    assert struct.unpack('>IIBBBBB', chunks[0][1]) == (width, height, 8, 2, 0, 0, 0)
+    raw = np.frombuffer(zlib.decompress(chunks[1][1]), dtype=np.uint8).reshape(height, width * 3 + 1)
+    # Filter type none on every scanline.
+    assert not raw[:, 0].any()
+    assert np.array_equal(raw[:, 1:].reshape(height, width, 3), rgb)
+
+def test_png_compression_level():
+    rgb = np.zeros((120, 160, 3), dtype=np.uint8)
+    rgb[40:80, 50:110] = (200, 30, 30)
+    fast, small = pngEncoder.encodePNG(rgb, level=1), pngEncoder.encodePNG(rgb, level=9)
+    assert len(small) <= len(fast) < rgb.nbytes
+    # A non contiguous view (e.g. the flipped GL frame) is encoded the same.
+    assert pngEncoder.encodePNG(rgb[::-1]) == pngEncoder.encodePNG(np.ascontiguousarray(rgb[::-1]))
@@ -0,0 +1,96 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_robotArmRecorder.py
+#
+# Purpose:     Test the binary state record and the replay round trip of the
+#              simulation engine.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import robotArmGlobal as gv
+import robotArmEngine as engine
+import robotArmRecorder as recorder
+
+@pytest.fixture(autouse=True)
+def ctrlMode(monkeypatch):
+    """ The arms follow their targets (the local test mode freezes them)."""
+    monkeypatch.setattr(gv, 'gTestMD', False)
+
+@pytest.fixture
+def simEngine():
+    """ Engine with the arm in the middle of a joint move."""
+    simEngine = engine.SimulationEngine(rate=1000, speed=0)
+    simEngine.runSteps(200)
+    simEngine.setArmTarget([40.0, 20.0, -30.0, 10.0, 0.0, 80.0])
+    simEngine.runSteps(500)
+    yield simEngine
+    simEngine.stop()
+
+#-----------------------------------------------------------------------------
+def test_record_replay_round_trip(simEngine, tmp_path):
+    filePath = str(tmp_path / 'run.rec')
+    simEngine.startRecord(filePath)
+    joints, cubes = [], []
+    for _ in range(300):
+        simEngine.runSteps(1)
+        joints.append(simEngine.scene.armState[:, :6].copy())
+        cubes.append(simEngine.scene.cubeState[:, :3].copy())
+    simEngine.stopRecord()
+    replayer = recorder.StateReplayer(filePath)
+    assert replayer.count == 300
+    assert np.array_equal(replayer.frames['joints'], np.array(joints))
+    assert np.array_equal(replayer.frames['cube'], np.array(cubes))
+    assert np.all(np.diff(replayer.frames['simTime']) > 0)
+    # Replay the record into a new engine and seek the frames.
+    replayEngine = engine.SimulationEngine(rate=1000, speed=0)
+    replayEngine.startReplay(filePath)
+    replayEngine.runSteps(150)
+    idx = replayer.getIndex(replayEngine.replayer.replayTime)
+    assert np.array_equal(replayEngine.scene.armState[:, :6], joints[idx])
+    replayEngine.replayer.seek(replayer.frames['simTime'][10])
+    replayEngine.runSteps(1)
+    assert np.array_equal(replayEngine.scene.armState[:, :6], joints[11])
+    replayEngine.stop()
+
+def test_recorder_grows_and_trims(tmp_path):
+    filePath = str(tmp_path / 'grow.rec')
+    stateRecorder = recorder.StateRecorder(filePath, armNum=2, cubeNum=3, dt=0.001, capacity=4)
+    rng = np.random.default_rng(6)
+    frames = [(i * 0.001, rng.normal(size=(2, 6)), rng.normal(size=(2, 6)), rng.normal(size=(3, 3)),
+               (i % 3 - 1, -1)) for i in range(1, 11)]
+    for frame in frames: stateRecorder.record(*frame)
+    stateRecorder.close()
+    assert stateRecorder.capacity == 10
+    replayer = recorder.StateReplayer(filePath)
+    assert (replayer.count, replayer.armNum, replayer.cubeNum, replayer.dt) == (10, 2, 3, 0.001)
+    for frame, (simTime, joints, targets, cubePos, holdIdx) in zip(replayer.frames, frames):
+        assert frame['simTime'] == simTime
+        assert np.array_equal(frame['joints'], joints) and np.array_equal(frame['targets'], targets)
+        assert np.array_equal(frame['cube'], cubePos) and tuple(frame['holdIdx']) == holdIdx
+    assert replayer.getIndex(0.0055) == 4
+
+def test_record_file_header(tmp_path):
+    filePath = str(tmp_path / 'bad.rec')
+    with open(filePath, 'wb') as fh:
+        fh.write(b'\0' * recorder.HEADER_SZ)
+    with pytest.raises(ValueError):
+        recorder.StateReplayer(filePath)
+
+def test_record_many_cubes(tmp_path):
+    # The frame size and the held cube index do not wrap with a large scene.
+    filePath = str(tmp_path / 'many.rec')
+    cubeNum = 40000
+    stateRecorder = recorder.StateRecorder(filePath, armNum=1, cubeNum=cubeNum, capacity=1)
+    stateRecorder.record(0.001, np.zeros((1, 6)), np.zeros((1, 6)), np.zeros((cubeNum, 3)), (cubeNum - 1,))
+    stateRecorder.close()
+    replayer = recorder.StateReplayer(filePath)
+    assert replayer.cubeNum == cubeNum and replayer.frames[0]['holdIdx'][0] == cubeNum - 1
@@ -0,0 +1,78 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_simEngine.py
+#
+# Purpose:     Test the headless simulation engine state snapshot, restore and
+#              the forked engine stays bit-equal to the original one.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import robotArmGlobal as gv
+import robotArmEngine as engine
+
+FORK_STEPS = 3000
+
+@pytest.fixture(autouse=True)
+def ctrlMode(monkeypatch):
+    """ The arms follow their targets (the local test mode freezes them)."""
+    monkeypatch.setattr(gv, 'gTestMD', False)
+
+@pytest.fixture
+def simEngine():
+    """ Engine with the arm in the middle of a joint move."""
+    simEngine = engine.SimulationEngine(rate=1000, speed=0)
+    simEngine.runSteps(200)
+    simEngine.setArmTarget([40.0, 20.0, -30.0, 10.0, 0.0, 80.0])
+    simEngine.runSteps(500)
+    yield simEngine
+    simEngine.stop()
+
+#-----------------------------------------------------------------------------
+def test_fork_stays_bit_equal(simEngine):
+    blob = simEngine.snapshot()
+    fork = engine.SimulationEngine.fromSnapshot(blob, rate=1000, speed=0)
+    assert fork.snapshot() == blob
+    startJoints = simEngine.scene.armState[0, :6].copy()
+    for _ in range(3):
+        simEngine.runSteps(FORK_STEPS // 3)
+        fork.runSteps(FORK_STEPS // 3)
+        assert fork.snapshot() == simEngine.snapshot()
+    assert not np.array_equal(simEngine.scene.armState[0, :6], startJoints)
+    fork.stop()
+
+def test_fork_linear_move(simEngine):
+    simEngine.runSteps(5000)
+    gripperPos = simEngine.scene.getGripperPositions()[0]
+    assert simEngine.moveLinear(np.asarray(gripperPos) + (0.0, -0.3, -0.2)), simEngine.getStatus()
+    simEngine.runSteps(300)
+    fork = engine.SimulationEngine.fromSnapshot(simEngine.snapshot(), rate=1000, speed=0)
+    simEngine.runSteps(FORK_STEPS)
+    fork.runSteps(FORK_STEPS)
+    assert fork.snapshot() == simEngine.snapshot()
+    fork.stop()
+
+def test_restore_resets_state(simEngine):
+    blob = simEngine.snapshot()
+    simEngine.setArmTarget([-40.0, 0.0, 0.0, 0.0, 0.0, 10.0])
+    simEngine.runSteps(1000)
+    assert simEngine.snapshot() != blob
+    simEngine.restore(blob)
+    assert simEngine.snapshot() == blob
+
+def test_restore_rejects_other_scene(simEngine):
+    blob = simEngine.snapshot()
+    other = engine.SimulationEngine(rate=1000, speed=0, cubePosList=[(1.0, 1.0, 0.15), (2.0, 2.0, 0.15)])
+    with pytest.raises(ValueError):
+        other.restore(blob)
+    with pytest.raises(ValueError):
+        simEngine.restore(b'XXXX' + blob[4:])
+    other.stop()
@@ -0,0 +1,66 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------------
+# Name:        test_spatialHash.py
+#
+# Purpose:     Test the spatial hash radius and nearest queries match the brute
+#              force search, also after the points moved.
+#
+# Author:      Yuancheng Liu
+#
+# Created:     2026/03/28
+# Version:     v_0.0.1
+# Copyright:   Copyright (c) 2026 LiuYuancheng
+# License:     MIT License
+#-----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import spatialHash
+
+POINT_NUM = 500
+QUERY_NUM = 200
+
+def _bruteRadius(positions, point, radius):
+    return set(np.flatnonzero(np.linalg.norm(positions - point, axis=1) <= radius).tolist())
+
+def _bruteNearest(positions, point, radius, excludeSet=()):
+    distances = np.linalg.norm(positions - point, axis=1)
+    distances[list(excludeSet)] = np.inf
+    idx = int(np.argmin(distances))
+    return (idx, distances[idx]) if distances[idx] <= radius else (-1, float('inf'))
+
+def _checkQueries(index, positions, rng):
+    for point, radius in zip(rng.uniform(-6, 6, (QUERY_NUM, 3)), rng.uniform(0.1, 3.0, QUERY_NUM)):
+        assert set(index.queryRadius(positions, point, radius).tolist()) == \
+            _bruteRadius(positions, point, radius)
+        excludeSet = set(rng.choice(POINT_NUM, 10).tolist())
+        idx, dist = index.nearest(positions, point, radius, excludeSet=excludeSet)
+        bruteIdx, bruteDist = _bruteNearest(positions, point, radius, excludeSet)
+        assert dist == pytest.approx(bruteDist)
+        if bruteIdx >= 0: assert idx == bruteIdx
+
+#-----------------------------------------------------------------------------
+@pytest.mark.parametrize('cellSize', [0.3, 1.0, 4.0])
+def test_queries_match_brute_force(cellSize):
+    rng = np.random.default_rng(7)
+    positions = rng.uniform(-5, 5, (POINT_NUM, 3))
+    index = spatialHash.SpatialHash(cellSize, positions)
+    _checkQueries(index, positions, rng)
+
+def test_update_moved_points():
+    rng = np.random.default_rng(8)
+    positions = rng.uniform(-5, 5, (POINT_NUM, 3))
+    index = spatialHash.SpatialHash(1.0, positions)
+    for _ in range(5):
+        moved = rng.choice(POINT_NUM, 50, replace=False)
+        positions[moved] += rng.normal(0.0, 1.0, (50, 3))
+        index.update(moved, positions[moved])
+        _checkQueries(index, positions, rng)
+    # The incremental update gives the same buckets as the rebuild.
+    rebuilt = spatialHash.SpatialHash(1.0, positions)
+    assert index.buckets == rebuilt.buckets
+
+def test_invalid_cell_size():
+    with pytest.raises(ValueError):
+        spatialHash.SpatialHash(0.0)